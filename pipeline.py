@@ -0,0 +1,629 @@
+"""Scoring pipeline for the Eredivisie midfielder tables.
+
+Pure numpy/pandas (no Streamlit), so the same code runs inside the app and
+from the command line:
+
+    python pipeline.py transform data/eredivisie_midfielders_clustered.csv scored.csv
+    python pipeline.py update base_raw.csv new_rows.csv scored.csv
+    python pipeline.py cluster profiles.csv new_players.csv assigned.csv
+    python pipeline.py archetypes data/eredivisie_midfielders_scored.csv out.csv
+"""
+import argparse
+import itertools
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# ---------------------------
+# RAW STAT -> 0-100 TRANSFORMATION
+# ---------------------------
+# Columns copied through unchanged (data/transformation_formula.txt)
+TRANSFORM_KEEP_COLUMNS = ['Player', 'Age', 'Pos', 'Squad', 'Nation', 'std_MP', 'std_Min', 'Cluster']
+TRANSFORM_CHUNK_ROWS = 50_000
+# Score given to every row of a constant column
+CONSTANT_COLUMN_SCORE = 50
+
+
+class ColumnStats:
+    """Streaming per-column count, mean, variance, min and max.
+
+    Chunks are merged with the parallel (Chan et al.) update, so the result
+    equals a single pass over the concatenated data.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.count = np.zeros(k)
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.min = np.full(k, np.inf)
+        self.max = np.full(k, -np.inf)
+
+    def update(self, values: np.ndarray) -> None:
+        """Fold an (n_rows, n_columns) float block into the running statistics."""
+        valid = ~np.isnan(values)
+        n = valid.sum(axis=0).astype(np.float64)
+        if not n.any():
+            return
+        with np.errstate(invalid='ignore', divide='ignore'):
+            chunk_mean = np.where(n > 0, np.nansum(values, axis=0) / n, 0.0)
+            chunk_m2 = np.nansum((values - chunk_mean) ** 2, axis=0)
+            total = self.count + n
+            delta = chunk_mean - self.mean
+            self.mean = np.where(total > 0, self.mean + delta * n / total, 0.0)
+            self.m2 = np.where(total > 0, self.m2 + chunk_m2 + delta ** 2 * self.count * n / total, 0.0)
+        self.count = total
+        self.min = np.fmin(self.min, np.where(n > 0, np.nanmin(np.where(valid, values, np.inf), axis=0), np.inf))
+        self.max = np.fmax(self.max, np.where(n > 0, np.nanmax(np.where(valid, values, -np.inf), axis=0), -np.inf))
+
+    @property
+    def std(self) -> np.ndarray:
+        """Sample standard deviation (ddof=1), as used for the z-scores."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.sqrt(self.m2 / (self.count - 1))
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({'count': self.count, 'mean': self.mean, 'std': self.std,
+                             'min': self.min, 'max': self.max}, index=self.columns)
+
+
+def _iter_chunks(paths, chunksize: int):
+    for path in paths:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def _numeric_block(chunk: pd.DataFrame, columns) -> np.ndarray:
+    return chunk[columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def collect_column_stats(paths, chunksize: int = TRANSFORM_CHUNK_ROWS,
+                         keep_columns=TRANSFORM_KEEP_COLUMNS) -> ColumnStats:
+    """Pass 1: statistics of every numeric, non-kept column across all ``paths``."""
+    stats = None
+    for chunk in _iter_chunks(paths, chunksize):
+        if stats is None:
+            columns = [c for c in chunk.columns
+                       if c not in keep_columns and pd.api.types.is_numeric_dtype(chunk[c])]
+            stats = ColumnStats(columns)
+        stats.update(_numeric_block(chunk, stats.columns))
+    return stats if stats is not None else ColumnStats([])
+
+
+def transform_chunk(chunk: pd.DataFrame, stats: ColumnStats) -> pd.DataFrame:
+    """Pass 2: map one chunk's columns onto 0-100 with the global min/max.
+
+    Min-max scaling is affine-invariant, so scaling the raw values gives the
+    same result as scaling their z-scores; only min and max are needed.
+    """
+    out = chunk.copy()
+    scaled = scale_to_score(_numeric_block(chunk, stats.columns), stats.min, stats.max)
+    for i, col in enumerate(stats.columns):
+        out[col] = pd.array(scaled[:, i], dtype='Int64')
+    return out
+
+
+def scale_to_score(values: np.ndarray, col_min: np.ndarray, col_max: np.ndarray) -> np.ndarray:
+    """Rounded 0-100 scores for a float block, given per-column min and max."""
+    span = col_max - col_min
+    constant = ~(span > 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scaled = np.round((values - col_min) / np.where(constant, 1.0, span) * 100)
+    scaled[:, constant] = np.where(np.isnan(values[:, constant]), np.nan, CONSTANT_COLUMN_SCORE)
+    return scaled
+
+
+def run_transform(paths, output_path: str, chunksize: int = TRANSFORM_CHUNK_ROWS) -> ColumnStats:
+    """Two streaming passes over ``paths``; writes the 0-100 table to ``output_path``.
+
+    Memory use is bounded by ``chunksize`` rows, whatever the total input size.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    stats = collect_column_stats(paths, chunksize)
+    tmp_path = f"{output_path}.tmp"
+    header = True
+    with open(tmp_path, 'w', newline='', encoding='utf-8') as fh:
+        for chunk in _iter_chunks(paths, chunksize):
+            transform_chunk(chunk, stats).to_csv(fh, index=False, header=header)
+            header = False
+    os.replace(tmp_path, output_path)
+    return stats
+
+
+# ---------------------------
+# INCREMENTAL RESCORING
+# ---------------------------
+class IncrementalScorer:
+    """0-100 scoring state that absorbs new players without a full rebuild.
+
+    Keeps the raw (pre-scaling) values and each column's min/max. New rows whose
+    values fall inside a column's current range are scored directly; a column is
+    rescored for every row only when the new rows move its min or max.
+    """
+
+    def __init__(self, raw: pd.DataFrame, keep_columns=TRANSFORM_KEEP_COLUMNS):
+        self.columns = [c for c in raw.columns
+                        if c not in keep_columns and pd.api.types.is_numeric_dtype(raw[c])]
+        self.raw = raw.reset_index(drop=True)
+        self.values = _numeric_block(self.raw, self.columns)
+        with np.errstate(invalid='ignore'):
+            self.min = np.nanmin(np.where(np.isnan(self.values), np.inf, self.values), axis=0)
+            self.max = np.nanmax(np.where(np.isnan(self.values), -np.inf, self.values), axis=0)
+        self.scores = scale_to_score(self.values, self.min, self.max)
+
+    def add_rows(self, new_raw: pd.DataFrame) -> list:
+        """Append ``new_raw`` and return the columns that had to be rescored."""
+        new_values = _numeric_block(new_raw.reindex(columns=self.raw.columns), self.columns)
+        new_min = np.fmin(self.min, np.nanmin(np.where(np.isnan(new_values), np.inf, new_values), axis=0))
+        new_max = np.fmax(self.max, np.nanmax(np.where(np.isnan(new_values), -np.inf, new_values), axis=0))
+        changed = (new_min != self.min) | (new_max != self.max)
+
+        self.raw = pd.concat([self.raw, new_raw.reindex(columns=self.raw.columns)], ignore_index=True)
+        self.values = np.vstack([self.values, new_values])
+        self.min, self.max = new_min, new_max
+        new_scores = scale_to_score(new_values, self.min, self.max)
+        self.scores = np.vstack([self.scores, new_scores])
+        if changed.any():
+            self.scores[:, changed] = scale_to_score(self.values[:, changed], self.min[changed], self.max[changed])
+        return [c for c, flag in zip(self.columns, changed) if flag]
+
+    def scored_frame(self) -> pd.DataFrame:
+        """The current 0-100 table (kept columns copied, metric columns as Int64)."""
+        out = self.raw.copy()
+        for i, col in enumerate(self.columns):
+            out[col] = pd.array(self.scores[:, i], dtype='Int64')
+        return out
+
+
+# ---------------------------
+# ARCHETYPE SCORING
+# ---------------------------
+# Weights from data/archetype_methodology.txt. They apply to each metric's 0-100
+# percentile within the scored table (the methodology's "percentile tabanlı
+# skorlama"), not to the min-max score. A negative weight w stands for the
+# "(100 - metric) x |w|" terms, i.e. |w| * 100 - |w| * metric.
+# Mezzala uses the CAM formula and ShadowStriker the Box Crasher formula
+# (the app's names for methodology archetypes 7 and 8).
+ARCHETYPE_WEIGHTS = {
+    'Anchor': {
+        'def_Tkl+Int': 0.25, 'def_Def 3rd': 0.20, 'misc_Recov': 0.15,
+        'def_Blocks': 0.15, 'def_TklW': 0.15, 'def_Att 3rd': -0.10,
+    },
+    'DLP': {
+        'pass_Cmp%': 0.20, 'pass_PrgDist': 0.20, 'pass_PrgP': 0.20,
+        'passt_Sw': 0.15, 'def_Def 3rd': 0.10, 'pass_1/3': 0.15,
+    },
+    'BallWinner': {
+        'def_Tkl+Int': 0.30, 'def_TklW': 0.20, 'misc_Recov': 0.20,
+        'misc_Fls': 0.15, 'def_Int': 0.15,
+    },
+    'BoxToBox': {
+        'std_PrgR': 0.25, 'misc_Recov': 0.15, 'poss_PrgDist': 0.15, 'def_Mid 3rd': 0.15,
+        'def_Tkl+Int': 0.10, 'poss_1/3': 0.10, 'pass_PrgP': 0.10,
+    },
+    'APM': {
+        'pass_KP': 0.25, 'std_xAG': 0.20, 'gca_PassLive': 0.20,
+        'pass_PPA': 0.15, 'pass_1/3': 0.10, 'std_Ast': 0.10,
+    },
+    'Mezzala': {
+        'poss_1/3': 0.20, 'poss_CPA': 0.20,
+        'gca_PassLive': 0.25 / 3, 'gca_TO': 0.25 / 3, 'gca_Sh': 0.25 / 3,
+        'std_xAG': 0.15, 'pass_PPA': 0.10, 'def_Def 3rd': -0.10,
+    },
+    'ShadowStriker': {
+        'std_xG': 0.30, 'shoot_Sh': 0.25, 'std_Gls': 0.20,
+        'poss_CPA': 0.15, 'gca_Sh': 0.10,
+    },
+}
+ARCHETYPES = list(ARCHETYPE_WEIGHTS)
+# A second archetype is named when its score is within this many points of the first
+SECONDARY_ARCHETYPE_MAX_GAP = 5
+
+
+def build_archetype_coefficients(weights: dict = ARCHETYPE_WEIGHTS):
+    """Turn the weight table into (metrics, W, b) so that scores = X @ W + b.
+
+    W has one row per metric and one column per archetype.
+    """
+    metrics = list(dict.fromkeys(m for terms in weights.values() for m in terms))
+    row = {m: i for i, m in enumerate(metrics)}
+    coef = np.zeros((len(metrics), len(weights)))
+    intercept = np.zeros(len(weights))
+    for j, terms in enumerate(weights.values()):
+        for metric, weight in terms.items():
+            coef[row[metric], j] = weight
+            if weight < 0:
+                intercept[j] += -weight * 100.0
+    return metrics, coef, intercept
+
+
+ARCHETYPE_METRICS, ARCHETYPE_COEF, ARCHETYPE_INTERCEPT = build_archetype_coefficients()
+
+
+def score_archetypes(frame: pd.DataFrame) -> pd.DataFrame:
+    """All archetype scores plus the primary/secondary assignment for every row.
+
+    ``frame`` must hold the metric columns used in ARCHETYPE_WEIGHTS (raw or
+    0-100: each is converted to its percentile across the rows of ``frame``).
+    Returns a frame (same index) with one ``<Archetype>_Score`` column per
+    archetype and Archetype, Primary_Archetype, Secondary_Archetype,
+    Archetype_Score and Secondary_Archetype_Score.
+    """
+    missing = [m for m in ARCHETYPE_METRICS if m not in frame.columns]
+    if missing:
+        raise KeyError(f"Missing metric columns for archetype scoring: {missing}")
+
+    metrics = frame[ARCHETYPE_METRICS].apply(pd.to_numeric, errors='coerce')
+    values = (metrics.rank(pct=True) * 100).to_numpy(dtype=np.float64, na_value=np.nan)
+    scores = np.rint(np.clip(values @ ARCHETYPE_COEF + ARCHETYPE_INTERCEPT, 0.0, 100.0))
+    return assign_archetypes(scores, frame.index)
+
+
+def assign_archetypes(scores: np.ndarray, index=None) -> pd.DataFrame:
+    """Score columns plus the primary/secondary assignment for an (n, 7) score matrix."""
+    # Highest score first; ties keep the ARCHETYPES order
+    ranked = np.argsort(-np.nan_to_num(scores, nan=-np.inf), axis=1, kind='stable')
+    rows = np.arange(len(scores))
+    first, second = ranked[:, 0], ranked[:, 1]
+    top_score = scores[rows, first]
+    second_score = scores[rows, second]
+    has_secondary = (top_score - second_score) <= SECONDARY_ARCHETYPE_MAX_GAP
+
+    names = np.array(ARCHETYPES, dtype=object)
+    primary = names[first]
+    secondary = np.where(has_secondary, names[second], None)
+
+    out = pd.DataFrame(scores, columns=[f"{a}_Score" for a in ARCHETYPES], index=index)
+    out['Archetype'] = np.where(has_secondary, primary + '/' + names[second], primary)
+    out['Primary_Archetype'] = primary
+    out['Secondary_Archetype'] = secondary
+    out['Archetype_Score'] = top_score
+    out['Secondary_Archetype_Score'] = np.where(has_secondary, second_score, 0.0)
+    if np.isfinite(scores).all():
+        score_cols = [c for c in out.columns if c.endswith('_Score')]
+        out[score_cols] = out[score_cols].astype(np.int16)
+    return out
+
+
+def ensure_archetype_columns(frame: pd.DataFrame) -> pd.DataFrame:
+    """Add computed archetype columns to a table that has the metrics but no scores.
+
+    Tables that already carry every ``<Archetype>_Score`` column are returned
+    unchanged.
+    """
+    score_cols = [f"{a}_Score" for a in ARCHETYPES]
+    if all(c in frame.columns for c in score_cols):
+        return frame
+    if any(m not in frame.columns for m in ARCHETYPE_METRICS):
+        return frame
+    scored = score_archetypes(frame)
+    new_cols = [c for c in scored.columns if c not in frame.columns]
+    return pd.concat([frame, scored[new_cols]], axis=1)
+
+
+# ---------------------------
+# CLUSTERING
+# ---------------------------
+# Raw duplicates and derived ratings stay out of the clustering features
+CLUSTER_EXCLUDED_COLUMNS = {'Gls', 'Ast', 'Overall_Rating'}
+# Refit when new players sit this much further (mean squared distance) from
+# their centroid than the players the centroids were fitted on
+CLUSTER_DRIFT_THRESHOLD = 0.25
+CLUSTER_BATCH_SIZE = 256
+# Labelled table whose Cluster ids the app's profile names were written for
+CLUSTER_REFERENCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data',
+                                      'eredivisie_midfielders_scored.csv')
+
+
+def cluster_feature_columns(frame: pd.DataFrame) -> list:
+    """0-100 performance metrics used as clustering features."""
+    cols = []
+    for col in frame.columns:
+        if col in TRANSFORM_KEEP_COLUMNS or col in CLUSTER_EXCLUDED_COLUMNS or col.endswith('_Score'):
+            continue
+        s = frame[col]
+        if pd.api.types.is_numeric_dtype(s) and s.notna().any() and s.min() >= 0 and s.max() <= 100:
+            cols.append(col)
+    return cols
+
+
+class ClusteringEngine:
+    """Centroids over the 0-100 feature matrix with incremental assignment.
+
+    New players go to the nearest centroid (O(k*d) each). When a batch of new
+    players drifts too far from the centroids, they are folded in with a
+    mini-batch k-means update instead of a full refit.
+    """
+
+    def __init__(self, centroids: np.ndarray, labels, counts: np.ndarray, baseline: float):
+        self.centroids = np.asarray(centroids, dtype=np.float64)
+        self.labels = list(labels)          # cluster id of each centroid row
+        self.counts = np.asarray(counts, dtype=np.float64)
+        self.baseline = float(baseline)     # mean squared distance on the fitted data
+        self.refits = 0
+
+    @classmethod
+    def from_labels(cls, X: np.ndarray, labels: np.ndarray) -> 'ClusteringEngine':
+        """Centroids of an existing labelling (e.g. the offline Cluster column)."""
+        ids = sorted(pd.unique(labels))
+        centroids = np.vstack([X[labels == c].mean(axis=0) for c in ids])
+        counts = np.array([(labels == c).sum() for c in ids])
+        engine = cls(centroids, ids, counts, 0.0)
+        engine.baseline = engine.assign(X)[1].mean()
+        return engine
+
+    @classmethod
+    def fit(cls, X: np.ndarray, k: int = 3, n_iter: int = 100, seed: int = 0) -> 'ClusteringEngine':
+        """Plain k-means (k-means++ seeding, Lloyd iterations)."""
+        rng = np.random.default_rng(seed)
+        centroids = [X[rng.integers(len(X))]]
+        for _ in range(1, k):
+            d2 = ((X[:, None, :] - np.asarray(centroids)[None, :, :]) ** 2).sum(axis=2).min(axis=1)
+            centroids.append(X[rng.choice(len(X), p=d2 / d2.sum())] if d2.sum() > 0 else X[rng.integers(len(X))])
+        engine = cls(np.asarray(centroids), range(k), np.zeros(k), 0.0)
+        for _ in range(n_iter):
+            assigned = engine._nearest(X)[0]
+            moved = np.vstack([X[assigned == j].mean(axis=0) if (assigned == j).any() else engine.centroids[j]
+                               for j in range(k)])
+            converged = np.allclose(moved, engine.centroids)
+            engine.centroids = moved
+            if converged:
+                break
+        assigned, d2 = engine._nearest(X)
+        engine.counts = np.bincount(assigned, minlength=k).astype(np.float64)
+        engine.baseline = d2.mean()
+        return engine
+
+    def match_labels(self, reference: 'ClusteringEngine') -> None:
+        """Rename the clusters to the ``reference`` ids with the closest centroids.
+
+        Picks the one-to-one matching with the smallest total squared centroid
+        distance (the Hungarian assignment, solved exhaustively as k is tiny).
+        """
+        if len(self.labels) != len(reference.labels):
+            raise ValueError("Reference has a different number of clusters")
+        cost = ((self.centroids[:, None, :] - reference.centroids[None, :, :]) ** 2).sum(axis=2)
+        rows = range(len(self.labels))
+        best = min(itertools.permutations(rows), key=lambda perm: sum(cost[i, perm[i]] for i in rows))
+        self.labels = [reference.labels[j] for j in best]
+
+    def _nearest(self, X: np.ndarray):
+        d2 = ((X[:, None, :] - self.centroids[None, :, :]) ** 2).sum(axis=2)
+        nearest = d2.argmin(axis=1)
+        return nearest, d2[np.arange(len(X)), nearest]
+
+    def assign(self, X: np.ndarray):
+        """Cluster ids and squared distances to the nearest centroid."""
+        nearest, d2 = self._nearest(X)
+        return np.asarray(self.labels)[nearest], d2
+
+    def drift(self, X: np.ndarray) -> float:
+        """Relative increase of the mean squared distance over the fitted baseline."""
+        if not len(X) or self.baseline <= 0:
+            return 0.0
+        return self._nearest(X)[1].mean() / self.baseline - 1.0
+
+    def partial_fit(self, X: np.ndarray, batch_size: int = CLUSTER_BATCH_SIZE) -> None:
+        """Mini-batch k-means update (per-centroid learning rate 1/count)."""
+        for start in range(0, len(X), batch_size):
+            batch = X[start:start + batch_size]
+            nearest = self._nearest(batch)[0]
+            for row, j in zip(batch, nearest):
+                self.counts[j] += 1
+                self.centroids[j] += (row - self.centroids[j]) / self.counts[j]
+        self.refits += 1
+
+    def observe(self, X: np.ndarray, threshold: float = CLUSTER_DRIFT_THRESHOLD):
+        """Assign new players; refit on drift. Returns (cluster ids, refitted)."""
+        refit = self.drift(X) > threshold
+        if refit:
+            self.partial_fit(X)
+        return self.assign(X)[0], refit
+
+
+def _feature_block(frame: pd.DataFrame, columns) -> np.ndarray:
+    X = frame[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    if np.isnan(X).any():
+        X = np.where(np.isnan(X), np.nanmean(X, axis=0), X)
+    return np.nan_to_num(X)
+
+
+def ensure_cluster_column(frame: pd.DataFrame, reference=None) -> pd.DataFrame:
+    """Give every player a Cluster id.
+
+    Players that already have one keep it; the rest are assigned to the
+    nearest centroid of the labelled players. A table with no labels at all
+    is clustered with k-means and its clusters take the ids of the closest
+    ``reference`` clusters (a labelled table or its CSV path), so an id keeps
+    naming the same profile. Without a reference such a table is rejected,
+    since fresh k-means ids are arbitrary.
+    """
+    has_labels = 'Cluster' in frame.columns and frame['Cluster'].notna().any()
+    if has_labels and frame['Cluster'].notna().all():
+        return frame
+    if not has_labels and reference is None:
+        raise ValueError("Table has no Cluster labels; pass a labelled reference table to name its clusters")
+    columns = cluster_feature_columns(frame)
+    if not columns or not len(frame):
+        return frame
+    frame = frame.copy()
+    if not has_labels:
+        if isinstance(reference, (str, os.PathLike)):
+            reference = pd.read_csv(reference)
+        reference = reference[reference['Cluster'].notna()]
+        columns = [c for c in columns if c in reference.columns]
+        known = ClusteringEngine.from_labels(_feature_block(reference, columns),
+                                             reference['Cluster'].to_numpy(dtype=np.int64))
+        X = _feature_block(frame, columns)
+        if len(X) < len(known.labels):
+            frame['Cluster'] = known.assign(X)[0]  # too few rows to fit: nearest reference centroid
+            return frame
+        engine = ClusteringEngine.fit(X, k=len(known.labels))
+        engine.match_labels(known)
+        frame['Cluster'] = engine.assign(X)[0]
+        return frame
+    X = _feature_block(frame, columns)
+    known = frame['Cluster'].notna().to_numpy()
+    engine = ClusteringEngine.from_labels(X[known], frame['Cluster'].to_numpy()[known])
+    labels = frame['Cluster'].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+    labels[~known] = engine.observe(X[~known])[0]
+    frame['Cluster'] = labels.astype(np.int64)
+    return frame
+
+
+def cluster_profile_stats(frame: pd.DataFrame) -> dict:
+    """Data-driven numbers for each Cluster's profile (counts, averages, top teams)."""
+    averages = {
+        'avg_age': 'Age', 'avg_minutes': 'std_Min', 'avg_goals': 'std_Gls', 'avg_assists': 'std_Ast',
+        'avg_xG': 'std_xG', 'avg_shots': 'shoot_Sh', 'avg_pass_success': 'pass_Cmp%',
+        'avg_playing_time': 'pt_Min%', 'avg_tackles': 'def_Tkl', 'avg_interceptions': 'def_Int',
+        'avg_recoveries': 'misc_Recov',
+    }
+    available = {k: c for k, c in averages.items() if c in frame.columns}
+    grouped = frame.groupby('Cluster', observed=True)
+    means = grouped[list(available.values())].mean()
+    sizes = grouped.size()
+    stats = {}
+    for cid in sizes.index:
+        entry = {'total_players': int(sizes[cid])}
+        entry.update({k: float(means.at[cid, c]) for k, c in available.items()})
+        if 'Squad' in frame.columns:
+            squads = frame.loc[frame['Cluster'] == cid, 'Squad'].astype(str)
+            entry['top_teams'] = squads.value_counts().index[:5].tolist()
+        stats[int(cid)] = entry
+    return stats
+
+
+# ---------------------------
+# COLUMNAR COPIES
+# ---------------------------
+# Typed storage schema for the Parquet copies of the data/ tables
+CATEGORICAL_COLUMNS = ['Squad', 'Pos', 'Nation', 'Primary_Archetype', 'Secondary_Archetype', 'Archetype']
+# Numeric columns that keep their original values/dtype (not 0-100 scores)
+RAW_NUMERIC_COLUMNS = {'Age', 'std_MP', 'std_Min', 'Gls', 'Ast', 'Cluster'}
+COLUMNAR_FINGERPRINT_KEY = b'source_fingerprint'
+# Bump when apply_column_schema() or the ensure_* load steps change what gets written
+COLUMNAR_SCHEMA_VERSION = '2'
+COLUMNAR_SCHEMA_KEY = b'schema_version'
+# dtypes of the frame before apply_column_schema(), restored on read
+COLUMNAR_DTYPES_KEY = b'column_dtypes'
+
+
+def apply_column_schema(frame: pd.DataFrame) -> pd.DataFrame:
+    """Categoricals for the label columns, int16 for integral 0-100 score columns.
+
+    Storage only: read_columnar() hands back the dtypes the CSV load had.
+    """
+    for col in frame.columns:
+        s = frame[col]
+        if col in CATEGORICAL_COLUMNS:
+            frame[col] = s.astype('category')
+        elif col not in RAW_NUMERIC_COLUMNS and pd.api.types.is_numeric_dtype(s) and not s.isna().any():
+            vals = s.to_numpy()
+            if vals.size and vals.min() >= 0 and vals.max() <= 100 and np.array_equal(vals, np.round(vals)):
+                frame[col] = s.astype(np.int16)
+    return frame
+
+
+def get_columnar_path(csv_path: str) -> str:
+    return os.path.splitext(csv_path)[0] + '.parquet'
+
+
+def read_columnar(path: str, fingerprint: str):
+    """Return the Parquet copy if it was built from this CSV version and schema, else None.
+
+    Columns come back with the dtypes the frame had when it was written, so
+    groupbys and score arithmetic behave exactly as on the CSV load.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+        if metadata.get(COLUMNAR_FINGERPRINT_KEY, b'').decode() != fingerprint:
+            return None  # stale copy: CSV changed since it was written
+        if metadata.get(COLUMNAR_SCHEMA_KEY, b'').decode() != COLUMNAR_SCHEMA_VERSION:
+            return None  # written by an older/newer loader with a different column schema
+        dtypes = json.loads(metadata[COLUMNAR_DTYPES_KEY])
+        return pq.read_table(path).to_pandas().astype(dtypes)
+    except (OSError, KeyError, ValueError, pa.ArrowException):
+        return None
+
+
+def write_columnar(frame: pd.DataFrame, path: str, fingerprint: str) -> None:
+    """Write a typed Parquet copy of frame; the frame itself is left untouched."""
+    dtypes = {col: str(dtype) for col, dtype in frame.dtypes.items()}
+    table = pa.Table.from_pandas(apply_column_schema(frame.copy()), preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[COLUMNAR_FINGERPRINT_KEY] = fingerprint.encode()
+    metadata[COLUMNAR_SCHEMA_KEY] = COLUMNAR_SCHEMA_VERSION.encode()
+    metadata[COLUMNAR_DTYPES_KEY] = json.dumps(dtypes).encode()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        pq.write_table(table.replace_schema_metadata(metadata), tmp_path)
+        os.replace(tmp_path, path)  # atomic: concurrent readers never see a partial file
+    except OSError:
+        # Read-only deployments simply keep parsing the CSV
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+# ---------------------------
+# COMMAND LINE
+# ---------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Eredivisie midfielder scoring pipeline")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_tr = sub.add_parser('transform', help="Scale raw/z-score exports to the 0-100 table")
+    p_tr.add_argument('inputs', nargs='+', help="One or more CSV exports (e.g. one per season)")
+    p_tr.add_argument('output')
+    p_tr.add_argument('--chunksize', type=int, default=TRANSFORM_CHUNK_ROWS)
+    p_tr.add_argument('--stats', help="Optional CSV path for the per-column statistics")
+
+    p_up = sub.add_parser('update', help="Add new raw rows to a raw table and rescore only what changed")
+    p_up.add_argument('base')
+    p_up.add_argument('new_rows')
+    p_up.add_argument('output')
+
+    p_cl = sub.add_parser('cluster', help="Assign Cluster ids to new players using a labelled base table")
+    p_cl.add_argument('base')
+    p_cl.add_argument('new_rows')
+    p_cl.add_argument('output')
+
+    p_arch = sub.add_parser('archetypes', help="Compute archetype scores for a 0-100 scored table")
+    p_arch.add_argument('input')
+    p_arch.add_argument('output')
+
+    args = parser.parse_args(argv)
+    if args.command == 'transform':
+        stats = run_transform(args.inputs, args.output, args.chunksize)
+        if args.stats:
+            stats.to_frame().to_csv(args.stats, index_label='column')
+    elif args.command == 'update':
+        scorer = IncrementalScorer(pd.read_csv(args.base))
+        rescored = scorer.add_rows(pd.read_csv(args.new_rows))
+        scorer.scored_frame().to_csv(args.output, index=False)
+        print(f"Rescored {len(rescored)} of {len(scorer.columns)} columns: {', '.join(rescored) or '-'}")
+    elif args.command == 'cluster':
+        base = pd.read_csv(args.base)
+        new_rows = pd.read_csv(args.new_rows)
+        columns = cluster_feature_columns(base)
+        engine = ClusteringEngine.from_labels(_feature_block(base, columns), base['Cluster'].to_numpy())
+        labels, refit = engine.observe(_feature_block(new_rows.reindex(columns=columns), columns))
+        new_rows['Cluster'] = labels
+        new_rows.to_csv(args.output, index=False)
+        print(f"Assigned {len(new_rows)} players; drift refit: {'yes' if refit else 'no'}")
+    elif args.command == 'archetypes':
+        frame = pd.read_csv(args.input)
+        scored = score_archetypes(frame)
+        keep = [c for c in frame.columns if c not in scored.columns]
+        pd.concat([frame[keep], scored], axis=1).to_csv(args.output, index=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,12 +5,21 @@ import numpy as np
 import plotly.graph_objects as go
 from io import BytesIO
 from fpdf import FPDF
-from sklearn.preprocessing import MinMaxScaler
 import os
+import re
+import time
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from string import Template
+import tempfile
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from PIL import Image
 import matplotlib as mpl
+from pipeline import ensure_archetype_columns, ensure_cluster_column, cluster_profile_stats, CLUSTER_REFERENCE_PATH
+from pipeline import CATEGORICAL_COLUMNS, RAW_NUMERIC_COLUMNS, get_columnar_path, read_columnar, write_columnar
 
 # Clean and Simple Professional Styling
 st.markdown("""
@@ -267,15 +276,1111 @@ st.markdown("""
 # STEP 0: FIXED DATA FILE
 # ---------------------------
 
+DATA_FILE_NAME = 'eredivisie_midfielders_final_profiles.csv'
 # Dosya yolu düzeltmesi - hem local hem de cloud için çalışır
-if os.path.exists('data/eredivisie_midfielders_final_profiles.csv'):
-    df = pd.read_csv('data/eredivisie_midfielders_final_profiles.csv')
-elif os.path.exists('notebooks/../data/eredivisie_midfielders_final_profiles.csv'):
-    df = pd.read_csv('notebooks/../data/eredivisie_midfielders_final_profiles.csv')
-else:
+DATA_FILE_CANDIDATES = [
+    os.path.join('data', DATA_FILE_NAME),
+    os.path.join('notebooks', '..', 'data', DATA_FILE_NAME),
+]
+
+@st.cache_resource
+def get_loader_stats() -> dict:
+    """Process-wide loader counters, shared by every session."""
+    return {
+        "lock": threading.Lock(),
+        "requests": 0,        # every rerun of every session asks for the data
+        "loads": 0,           # actual table reads (cache misses)
+        "load_seconds": 0.0,  # total time spent reading
+        "last_load_seconds": 0.0,
+        "last_source": None,  # 'parquet' or 'csv'
+    }
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _hash_data_file(path: str, mtime_ns: int, size: int) -> str:
+    """SHA-256 of the file contents; only recomputed when mtime/size change."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def get_data_fingerprint(path: str) -> str:
+    """Cheap per-rerun fingerprint: a stat() call plus a cached content hash."""
+    stat = os.stat(path)
+    return _hash_data_file(path, stat.st_mtime_ns, stat.st_size)
+
+def read_data_table(csv_path: str, fingerprint: str):
+    """Read a data/ table, preferring its Parquet copy and building it when missing.
+
+    Returns (frame, source) where source is 'parquet' or 'csv'.
+    """
+    columnar_path = get_columnar_path(csv_path)
+    frame = read_columnar(columnar_path, fingerprint)
+    if frame is not None:
+        return frame, 'parquet'
+    frame = pd.read_csv(csv_path)
+    frame = frame.dropna(how='all').reset_index(drop=True)  # Clean empty rows
+    frame = ensure_archetype_columns(frame)  # tables without archetype scores get them computed
+    # Players without a Cluster go to the nearest centroid; ids follow the reference profiles
+    frame = ensure_cluster_column(frame, reference=CLUSTER_REFERENCE_PATH)
+    write_columnar(frame, columnar_path, fingerprint)
+    return frame, 'csv'
+
+@st.cache_resource(max_entries=4, show_spinner="Loading player data...")
+def load_player_data(path: str, fingerprint: str) -> pd.DataFrame:
+    """Load the profiles table once per file version and share it across sessions.
+
+    The returned frame is shared and must be treated as read-only; callers get
+    their own shallow copy through get_player_data().
+    """
+    started = time.perf_counter()
+    frame, source = read_data_table(path, fingerprint)
+    elapsed = time.perf_counter() - started
+    stats = get_loader_stats()
+    with stats["lock"]:
+        stats["loads"] += 1
+        stats["load_seconds"] += elapsed
+        stats["last_load_seconds"] = elapsed
+        stats["last_source"] = source
+    return frame
+
+def get_player_data():
+    """Return (session frame, dataset fingerprint) or (None, None) if the CSV is missing."""
+    path = next((p for p in DATA_FILE_CANDIDATES if os.path.exists(p)), None)
+    if path is None:
+        return None, None
+    fingerprint = get_data_fingerprint(path)
+    stats = get_loader_stats()
+    with stats["lock"]:
+        stats["requests"] += 1
+    # Shallow copy: new columns added by this session never leak into the shared frame
+    return load_player_data(path, fingerprint).copy(deep=False), fingerprint
+
+df, data_version = get_player_data()
+if df is None:
     st.error("CSV file not found!")
     st.stop()
-df = df.dropna(how='all')  # Clean empty rows
+
+# ---------------------------
+# DATASET SCHEMA
+# ---------------------------
+IDENTIFIER_COLUMNS = {'Player'}
+# Numeric codes that behave like labels, not measurements
+LABEL_NUMERIC_COLUMNS = {'Cluster', 'Minutes_Bin'}
+PER90_PATTERN = re.compile(r'(_p90|_per90|/90)$', re.IGNORECASE)
+# Headline archetype fit values and Age: bounded, but not similarity features
+SIMILARITY_EXCLUDED_COLUMNS = {'Age', 'Archetype_Score', 'Secondary_Archetype_Score'}
+
+class DatasetSchema:
+    """Column roles for one dataset version, inferred once at load.
+
+    Roles: 'identifier', 'categorical', 'score' (0-100), 'raw' (counts, age),
+    'per90', 'archetype_score' and 'other' (numeric, outside 0-100).
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self.roles = {}
+        self.numeric_columns = []
+        self.bounded_columns = set()  # numeric columns whose values all lie in [0, 100]
+        for col in frame.columns:
+            s = frame[col]
+            numeric = pd.api.types.is_numeric_dtype(s)
+            if numeric:
+                self.numeric_columns.append(col)
+                vals = s.to_numpy(dtype=np.float64, na_value=np.nan)
+                if not np.isnan(vals).all() and np.nanmin(vals) >= 0 and np.nanmax(vals) <= 100:
+                    self.bounded_columns.add(col)
+            self.roles[col] = self._infer_role(col, numeric)
+        # Similarity features: every bounded measurement except the excluded ones
+        self.similarity_metrics = [
+            c for c in self.numeric_columns
+            if c in self.bounded_columns and c not in SIMILARITY_EXCLUDED_COLUMNS
+            and self.roles[c] in ('score', 'raw', 'per90', 'archetype_score')
+        ]
+
+    def _infer_role(self, col: str, numeric: bool) -> str:
+        if col in IDENTIFIER_COLUMNS:
+            return 'identifier'
+        if col in CATEGORICAL_COLUMNS or col in LABEL_NUMERIC_COLUMNS or not numeric:
+            return 'categorical'
+        if col.endswith('_Score'):
+            return 'archetype_score'
+        if col in RAW_NUMERIC_COLUMNS:
+            return 'raw'
+        if PER90_PATTERN.search(col):
+            return 'per90'
+        return 'score' if col in self.bounded_columns else 'other'
+
+    def role(self, col: str):
+        return self.roles.get(col)
+
+    def columns(self, *roles) -> list:
+        """Columns having any of ``roles``, in frame order."""
+        return [c for c, r in self.roles.items() if r in roles]
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_dataset_schema(fingerprint: str, _frame: pd.DataFrame) -> DatasetSchema:
+    """One shared DatasetSchema per dataset version."""
+    return DatasetSchema(_frame)
+
+schema = get_dataset_schema(data_version, df)
+
+# ---------------------------
+# PLAYER INDEX
+# ---------------------------
+def make_player_id(name: str, squad: str = '') -> int:
+    """Stable 63-bit player ID derived from name and squad (same across dataset versions).
+
+    The squad is part of the key so two players sharing a name stay distinct.
+    """
+    key = f"{name}\x1f{squad}".encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'big') >> 1
+
+class PlayerIndex:
+    """Player IDs and a name -> row position map for the loaded ``df``."""
+
+    def __init__(self, frame: pd.DataFrame):
+        names = frame['Player'].tolist()
+        squads = frame['Squad'].astype(str).tolist() if 'Squad' in frame.columns else [''] * len(names)
+        self.ids = np.array([make_player_id(n, s) for n, s in zip(names, squads)], dtype=np.int64)
+        self.positions = {}
+        for pos, name in enumerate(names):
+            self.positions.setdefault(name, pos)  # first row wins, like .iloc[0] on a mask
+        self.positions_by_id = {int(self.ids[pos]): pos for pos in self.positions.values()}
+
+    def position(self, name):
+        """Row position of ``name`` or None."""
+        return self.positions.get(name)
+
+    def id_of(self, name):
+        """Player ID of the row ``name`` resolves to, or None."""
+        pos = self.positions.get(name)
+        return int(self.ids[pos]) if pos is not None else None
+
+    def positions_of(self, names) -> np.ndarray:
+        """Row positions of the known ``names`` in frame order (same rows as ``isin``)."""
+        hits = [self.positions[n] for n in names if n in self.positions]
+        return np.unique(np.asarray(hits, dtype=np.intp))
+
+    def lookup(self, frame: pd.DataFrame, name) -> pd.DataFrame:
+        """One-row frame for ``name`` (empty if unknown); ``frame`` must be the loaded df."""
+        pos = self.positions.get(name)
+        return frame.iloc[[pos]] if pos is not None else frame.iloc[[]]
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_player_index(fingerprint: str, _frame: pd.DataFrame) -> PlayerIndex:
+    """One shared PlayerIndex per dataset version."""
+    return PlayerIndex(_frame)
+
+player_index = get_player_index(data_version, df)
+
+# ---------------------------
+# FILTER INDEX
+# ---------------------------
+FILTER_SET_COLUMNS = ('Pos', 'Squad', 'Cluster')
+FILTER_MEMO_SIZE = 64
+
+class FilterIndex:
+    """Precomputed structures for the sidebar filters of one dataset version.
+
+    Each value of Pos/Squad/Cluster owns a packed bitset (np.packbits, one bit
+    per row); Age is kept as a sorted array plus the row order, so a range is
+    two binary searches. Predicates combine with bitwise AND and the result is
+    a sorted array of row positions into ``df``.
+    """
+
+    def __init__(self, frame: pd.DataFrame, memo_size: int = FILTER_MEMO_SIZE):
+        self.n_rows = len(frame)
+        self.all_bits = np.packbits(np.ones(self.n_rows, dtype=bool))
+        self.empty_bits = np.zeros_like(self.all_bits)
+        self.value_bits = {}
+        for col in FILTER_SET_COLUMNS:
+            codes, uniques = pd.factorize(frame[col])
+            self.value_bits[col] = {value: np.packbits(codes == code) for code, value in enumerate(uniques)}
+        ages = frame['Age'].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.age_order = np.argsort(ages, kind='stable')
+        self.age_sorted = ages[self.age_order]
+        self.names = frame['Player'].to_numpy(dtype=object)
+        self.memo_size = memo_size
+        self._memos = OrderedDict()
+        self._lock = threading.Lock()
+
+    def set_bits(self, col: str, values) -> np.ndarray:
+        """Rows whose ``col`` is any of ``values`` (like ``isin``)."""
+        bits = self.empty_bits.copy()
+        lookup = self.value_bits[col]
+        for value in values:
+            hit = lookup.get(value)
+            if hit is not None:
+                np.bitwise_or(bits, hit, out=bits)
+        return bits
+
+    def age_bits(self, low, high) -> np.ndarray:
+        """Rows with low <= Age <= high (NaN ages never match)."""
+        start = np.searchsorted(self.age_sorted, low, side='left')
+        stop = np.searchsorted(self.age_sorted, high, side='right')
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self.age_order[start:stop]] = True
+        return np.packbits(mask)
+
+    def to_positions(self, bits: np.ndarray) -> np.ndarray:
+        return np.flatnonzero(np.unpackbits(bits, count=self.n_rows))
+
+    def search_bits(self, query: str) -> np.ndarray:
+        """Rows whose name contains ``query`` (case-insensitive, like ``str.contains``)."""
+        names = pd.Series(self.names, dtype=object)
+        return np.packbits(names.str.contains(query, case=False, na=False).to_numpy(dtype=bool))
+
+    def _memo(self, key, compute) -> np.ndarray:
+        """Bitset for ``key`` from the LRU memo, computing it on a miss."""
+        with self._lock:
+            bits = self._memos.get(key)
+            if bits is not None:
+                self._memos.move_to_end(key)
+                return bits
+        bits = compute()
+        bits.flags.writeable = False
+        with self._lock:
+            self._memos[key] = bits
+            while len(self._memos) > self.memo_size:
+                self._memos.popitem(last=False)
+        return bits
+
+    def positions(self, age_range, pos_values, squad_values, cluster_values, query: str = '') -> np.ndarray:
+        """Row positions passing every filter.
+
+        Each predicate is memoized by its widget value, and so is the AND of the
+        non-age predicates: dragging the age slider only costs two binary searches
+        and one AND against the cached rest.
+        """
+        set_keys = [(col, frozenset(values)) for col, values in
+                    zip(FILTER_SET_COLUMNS, (pos_values, squad_values, cluster_values))]
+
+        def rest_bits():
+            bits = self.all_bits
+            for col, values in set_keys:
+                bits = np.bitwise_and(bits, self._memo((col, values), lambda: self.set_bits(col, values)))
+            if query:
+                bits = np.bitwise_and(bits, self._memo(('search', query), lambda: self.search_bits(query)))
+            return bits
+
+        rest = self._memo(('rest', *set_keys, query), rest_bits)
+        low, high = age_range
+        age = self._memo(('age', low, high), lambda: self.age_bits(low, high))
+        return self.to_positions(np.bitwise_and(rest, age))
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_filter_index(fingerprint: str, _frame: pd.DataFrame) -> FilterIndex:
+    """One shared FilterIndex per dataset version."""
+    return FilterIndex(_frame)
+
+filter_index = get_filter_index(data_version, df)
+
+# ---------------------------
+# SHARED METRIC MATRIX
+# ---------------------------
+METRIC_CACHE_DIRS = [os.path.join('data', '.cache'), os.path.join(tempfile.gettempdir(), 'eredivisie-mf-cache')]
+
+class MetricMatrix:
+    """Read-only float64 copy of every numeric column, shared by all sessions.
+
+    Stored column-major so each column is one contiguous block; ``offsets`` maps
+    column name -> column offset. Rows follow the positional order of ``df``.
+    """
+
+    def __init__(self, values: np.ndarray, columns: list):
+        self.values = values
+        self.columns = list(columns)
+        self.offsets = {col: i for i, col in enumerate(self.columns)}
+
+    def __contains__(self, name) -> bool:
+        return name in self.offsets
+
+    def column(self, name: str) -> np.ndarray:
+        """Zero-copy view of a single column."""
+        return self.values[:, self.offsets[name]]
+
+    def block(self, names, rows=None, dtype=None) -> np.ndarray:
+        """Columns ``names`` (optionally only ``rows``) as an (n_rows, n_names) array.
+
+        Adjacent columns come back as a view; anything else gathers just the
+        requested cells. Pass ``dtype`` to get a private copy the caller may modify.
+        """
+        idx = [self.offsets[n] for n in names]
+        start = idx[0] if idx else 0
+        if idx == list(range(start, start + len(idx))):
+            out = self.values[:, start:start + len(idx)]
+        else:
+            out = self.values[:, idx]
+        if rows is not None:
+            out = out[rows]
+        return out if dtype is None else out.astype(dtype)
+
+def _write_metric_file(path: str, frame: pd.DataFrame, columns: list) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    out = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float64,
+                                    shape=(len(frame), len(columns)), fortran_order=True)
+    for i, col in enumerate(columns):
+        out[:, i] = frame[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    out.flush()
+    del out
+    os.replace(tmp_path, path)
+
+def _remove_stale_metric_files(cache_dir: str, fingerprint: str) -> None:
+    """Delete matrices written for older data versions; the current one is kept."""
+    prefix = f"metrics-{fingerprint[:16]}-"
+    for name in os.listdir(cache_dir):
+        if name.startswith('metrics-') and name.endswith('.npy') and not name.startswith(prefix):
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass  # still mapped elsewhere (Windows) or already gone
+
+def _open_metric_memmap(frame: pd.DataFrame, columns: list, fingerprint: str) -> np.ndarray:
+    """Materialize ``columns`` into a float64 .npy file once and memory-map it read-only.
+
+    float64 keeps fractional inputs of derived metrics and leaderboards exact.
+    The file name covers the data version and the ordered column list; writing
+    a new version removes the previous versions' files, and a file that no
+    longer opens (truncated, corrupt) is rebuilt.
+    """
+    columns_hash = hashlib.blake2b('\x1f'.join(columns).encode(), digest_size=8).hexdigest()
+    file_name = f"metrics-{fingerprint[:16]}-{columns_hash}-{len(frame)}x{len(columns)}.npy"
+    for cache_dir in METRIC_CACHE_DIRS:
+        path = os.path.join(cache_dir, file_name)
+        try:
+            if not os.path.exists(path):
+                os.makedirs(cache_dir, exist_ok=True)
+                _write_metric_file(path, frame, columns)
+                _remove_stale_metric_files(cache_dir, fingerprint)
+            try:
+                return np.load(path, mmap_mode='r')
+            except (ValueError, OSError):
+                os.remove(path)
+                _write_metric_file(path, frame, columns)
+                return np.load(path, mmap_mode='r')
+        except (ValueError, OSError):
+            continue
+    # No writable location at all: keep a single in-memory copy instead
+    values = np.asfortranarray(frame[columns].to_numpy(dtype=np.float64, na_value=np.nan))
+    values.flags.writeable = False
+    return values
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_metric_matrix(fingerprint: str, _frame: pd.DataFrame, _schema: DatasetSchema) -> MetricMatrix:
+    """One shared MetricMatrix per dataset version."""
+    columns = _schema.numeric_columns
+    return MetricMatrix(_open_metric_memmap(_frame, columns, fingerprint), columns)
+
+metric_matrix = get_metric_matrix(data_version, df, schema)
+
+# ---------------------------
+# SCALED FEATURE CACHE
+# ---------------------------
+SCALED_SUBSET_CACHE_SIZE = 32
+
+class ScaledFeatureCache:
+    """Min-max scaled metric blocks, computed once per (metrics, row subset).
+
+    Scaling matches ``MinMaxScaler().fit_transform`` (NaN-aware min/max, constant
+    columns map to 0). Full-dataset blocks are kept for the lifetime of the
+    dataset version; filter-driven subsets live in a small LRU. Returned arrays
+    are read-only and must not be modified by callers.
+    """
+
+    def __init__(self, matrix: MetricMatrix, max_subsets: int = SCALED_SUBSET_CACHE_SIZE):
+        self.matrix = matrix
+        self.max_subsets = max_subsets
+        self._full = {}
+        self._subsets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _scale(self, names, rows) -> np.ndarray:
+        values = self.matrix.block(names, rows=rows, dtype=np.float64)
+        data_min = np.nanmin(values, axis=0)
+        data_range = np.nanmax(values, axis=0) - data_min
+        data_range[data_range == 0.0] = 1.0
+        scale = 1.0 / data_range
+        values *= scale
+        values += -data_min * scale
+        values.flags.writeable = False
+        return values
+
+    def get(self, names, rows=None) -> np.ndarray:
+        """Scaled (n_rows, n_names) block for ``names``; ``rows`` are df positions."""
+        names = tuple(names)
+        if rows is None:
+            with self._lock:
+                cached = self._full.get(names)
+            if cached is None:
+                cached = self._scale(names, None)
+                with self._lock:
+                    cached = self._full.setdefault(names, cached)
+            return cached
+
+        rows = np.asarray(rows, dtype=np.intp)
+        key = (names, hashlib.blake2b(rows.tobytes(), digest_size=16).digest())
+        with self._lock:
+            cached = self._subsets.get(key)
+            if cached is not None:
+                self._subsets.move_to_end(key)
+                return cached
+        cached = self._scale(names, rows)
+        with self._lock:
+            self._subsets[key] = cached
+            self._subsets.move_to_end(key)
+            while len(self._subsets) > self.max_subsets:
+                self._subsets.popitem(last=False)
+        return cached
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_scaled_feature_cache(fingerprint: str, _matrix: MetricMatrix) -> ScaledFeatureCache:
+    """One shared ScaledFeatureCache per dataset version."""
+    return ScaledFeatureCache(_matrix)
+
+scaled_features = get_scaled_feature_cache(data_version, metric_matrix)
+
+# ---------------------------
+# PROFILE RATINGS
+# ---------------------------
+# Metric sets behind each profile's rating (tab3 ranking and tab4 cards)
+CLUSTER_RATING_METRICS = {
+    0: ['std_Gls','std_Ast','std_xG','std_xAG','pass_KP','shoot_Sh','gca_PassLive'],      # Super Stars: goals + assists + creativity + shots
+    1: ['std_Min','pass_Cmp%','pt_Min%','misc_Won','std_MP'],                           # Developing: playing time + basic passing + duels
+    2: ['def_Tkl','def_TklW','def_Int','def_Blocks','misc_Recov','misc_TklW','poss_PrgDist'] # Hard Workers: defense + ball recovery + physical power
+}
+
+def compute_profile_scores(frame: pd.DataFrame, rows=None) -> np.ndarray:
+    """Equal-weight mean of each player's own profile metrics, min-max scaled (0-1).
+
+    Scaling is over ``rows`` (df positions; None = every player), so passing the
+    filtered rows gives the filter-relative score used in tab3. Players whose
+    profile has no metric set (or no available metric) get NaN.
+    """
+    positions = np.arange(len(frame)) if rows is None else np.asarray(rows, dtype=np.intp)
+    clusters = frame['Cluster'].to_numpy()[positions]
+    scores = np.full(len(positions), np.nan)
+    for cid, metrics in CLUSTER_RATING_METRICS.items():
+        members = clusters == cid
+        available = [m for m in metrics if m in metric_matrix]
+        if available and members.any():
+            scores[members] = scaled_features.get(available, rows=rows)[members].mean(axis=1)
+    return scores
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_profile_ratings(fingerprint: str, _frame: pd.DataFrame) -> pd.DataFrame:
+    """Overall rating (0-100) of every player plus its provenance, one table per dataset version.
+
+    Rows line up with df. Rating_Metrics names the metric set the rating was
+    averaged over; players without one get a rating of 0 and no metrics.
+    """
+    ratings = np.nan_to_num(compute_profile_scores(_frame) * 100, nan=0.0)
+    clusters = _frame['Cluster'].to_numpy()
+    provenance = [', '.join(m for m in CLUSTER_RATING_METRICS.get(c, []) if m in metric_matrix) for c in clusters]
+    table = pd.DataFrame({'Profile_Rating': ratings, 'Rating_Metrics': provenance}, index=_frame.index)
+    table.attrs['scaling'] = 'min-max over all players'
+    return table
+
+profile_ratings = get_profile_ratings(data_version, df)
+
+# ---------------------------
+# GROUPED RANKINGS
+# ---------------------------
+TOP_PLAYERS_MEMO_SIZE = 32
+PROFILE_TOP_K = 5
+ARCHETYPE_TOP_K = 3
+
+def grouped_top_k(groups, scores, k: int) -> dict:
+    """Offsets of the ``k`` highest ``scores`` within each group, from one sort.
+
+    Sorting by (group, -score) with a stable sort lines every group up best
+    first; each group's top-k is then the head of its run. Ties keep row order
+    and NaN scores come last, like ``nlargest`` / ``sort_values(...).head``.
+    Missing group values are skipped.
+    """
+    codes, uniques = pd.factorize(np.asarray(groups), use_na_sentinel=True)
+    order = np.lexsort((-np.asarray(scores, dtype=np.float64), codes))
+    sorted_codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]) if len(order) else np.empty(0, dtype=np.intp)
+    ends = np.r_[starts[1:], len(order)]
+    return {uniques[sorted_codes[s]]: order[s:min(e, s + k)]
+            for s, e in zip(starts, ends) if sorted_codes[s] >= 0}
+
+class TopPlayersCache:
+    """Tab3 rankings (top players per profile and per archetype) for each filter state.
+
+    Keyed by the filtered row positions, so returning to a filter combination
+    (or re-opening the tab) reuses the previous rankings.
+    """
+
+    def __init__(self, frame: pd.DataFrame, max_entries: int = TOP_PLAYERS_MEMO_SIZE):
+        self.frame = frame
+        self.max_entries = max_entries
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+        self.archetype_score = 'Archetype_Score' if 'Archetype_Score' in frame.columns else 'std_Min'
+
+    def _rank(self, positions: np.ndarray) -> dict:
+        profile_scores = compute_profile_scores(self.frame, rows=positions)
+        profiles = grouped_top_k(self.frame['Cluster'].to_numpy()[positions], profile_scores, PROFILE_TOP_K)
+        archetypes = {}
+        if 'Primary_Archetype' in self.frame.columns:
+            arch_scores = self.frame[self.archetype_score].to_numpy(dtype=np.float64, na_value=np.nan)[positions]
+            archetypes = grouped_top_k(self.frame['Primary_Archetype'].to_numpy()[positions], arch_scores, ARCHETYPE_TOP_K)
+        return {
+            # top rows as df positions, with the matching filter-relative profile scores
+            'profiles': {cid: (positions[top], profile_scores[top]) for cid, top in profiles.items()},
+            'archetypes': {arch: positions[top] for arch, top in archetypes.items()},
+        }
+
+    def get(self, positions) -> dict:
+        positions = np.asarray(positions, dtype=np.intp)
+        key = hashlib.blake2b(positions.tobytes(), digest_size=16).digest()
+        with self._lock:
+            cached = self._memo.get(key)
+            if cached is not None:
+                self._memo.move_to_end(key)
+                return cached
+        cached = self._rank(positions)
+        with self._lock:
+            self._memo[key] = cached
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+        return cached
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_top_players_cache(fingerprint: str, _frame: pd.DataFrame) -> TopPlayersCache:
+    """One shared TopPlayersCache per dataset version."""
+    return TopPlayersCache(_frame)
+
+top_players_cache = get_top_players_cache(data_version, df)
+
+# ---------------------------
+# DERIVED METRICS
+# ---------------------------
+def _nonzero(s, fallback=0.1):
+    """``s`` with zeros replaced by ``fallback`` (avoids division by zero in ratios)."""
+    return np.where(s == 0, fallback, s)
+
+def _def_actions(m):
+    return m['def_Def 3rd'] + m['def_Mid 3rd'] + m['def_Att 3rd']
+
+# Composite and per-90 columns built from the raw metrics. 'formula' takes a column
+# mapping (arrays or a frame) and works on whole columns; NaN results become 0
+# unless 'fillna' is False. 'integer' marks sums of counts, kept as int64.
+DERIVED_METRICS = {
+    'key_passes_per90': {
+        'requires': ['pass_KP', 'std_Min'],
+        'formula': lambda m: m['pass_KP'] / (m['std_Min'] / 90),
+    },
+    'key_pass_efficiency': {
+        'requires': ['pass_KP', 'pass_PrgP'],
+        'formula': lambda m: m['pass_KP'] / m['pass_PrgP'] * 100,
+    },
+    'maestro_score': {
+        'requires': ['pass_KP', 'pass_PPA', 'std_xAG', 'pass_Cmp%'],
+        # Maestro = (KP * 2) + PPA + (xAG * 3) - ((100 - Cmp%) / 10)
+        'formula': lambda m: (m['pass_KP'] * 2) + m['pass_PPA'] + (m['std_xAG'] * 3) - ((100 - m['pass_Cmp%']) / 10),
+    },
+    'vertical_playmaker': {
+        'requires': ['pass_PrgP', 'pass_1/3', 'pass_PPA'],
+        'formula': lambda m: m['pass_PrgP'] + (m['pass_1/3'] * 2) + (m['pass_PPA'] * 5),
+        'integer': True,
+    },
+    'press_resistant': {
+        'requires': ['pass_Cmp%', 'poss_Dis'],
+        'formula': lambda m: m['pass_Cmp%'] / (m['poss_Dis'] + 1),
+    },
+    'visionary_score': {
+        'requires': ['passt_Sw', 'passt_TB'],
+        'formula': lambda m: m['passt_Sw'] + (m['passt_TB'] * 3),
+        'integer': True,
+    },
+    'defensive_efficiency': {
+        'requires': ['def_Tkl', 'def_Int', 'std_Min'],
+        'formula': lambda m: (m['def_Tkl'] + m['def_Int']) / (m['std_Min'] / 90),
+    },
+    'recovery_rate': {
+        'requires': ['misc_Recov', 'std_Min'],
+        'formula': lambda m: m['misc_Recov'] / (m['std_Min'] / 90),
+    },
+    'defensive_intelligence': {
+        'requires': ['def_Int', 'def_Tkl'],
+        'formula': lambda m: m['def_Int'] / m['def_Tkl'],
+    },
+    'total_def_actions': {
+        'requires': ['def_Def 3rd', 'def_Mid 3rd', 'def_Att 3rd'],
+        'formula': _def_actions,
+        'integer': True,
+    },
+    'high_press_pct': {
+        'requires': ['def_Att 3rd', 'def_Def 3rd', 'def_Mid 3rd'],
+        'formula': lambda m: m['def_Att 3rd'] / _def_actions(m) * 100,
+    },
+    'clinical_ratio': {
+        'requires': ['std_Gls', 'std_xG'],
+        'formula': lambda m: m['std_Gls'] / _nonzero(m['std_xG']),
+        'fillna': False,
+    },
+    'penalty_area_threat': {
+        'requires': ['pass_PPA', 'poss_CPA', 'std_PrgR'],
+        'formula': lambda m: m['pass_PPA'] + m['poss_CPA'] + m['std_PrgR'],
+        'integer': True,
+    },
+    'one_man_army': {
+        'requires': ['gca_TO', 'gca_Fld', 'poss_CPA'],
+        'formula': lambda m: (m['gca_TO'] * 10) + (m['gca_Fld'] * 5) + m['poss_CPA'],
+        'integer': True,
+    },
+    'set_piece_maestro': {
+        'requires': ['gca_PassDead', 'passt_Crs'],
+        'formula': lambda m: (m['gca_PassDead'] * 10) + m['passt_Crs'],
+        'integer': True,
+    },
+    'playmaking_ratio': {
+        'requires': ['std_Ast', 'std_xAG'],
+        'formula': lambda m: m['std_Ast'] / _nonzero(m['std_xAG']),
+        'fillna': False,
+    },
+    'progressive_carrier': {
+        'requires': ['poss_PrgC', 'poss_1/3', 'poss_CPA'],
+        'formula': lambda m: m['poss_PrgC'] + (m['poss_1/3'] * 2) + (m['poss_CPA'] * 5),
+        'integer': True,
+    },
+    'press_breaker': {
+        'requires': ['poss_Carries', 'poss_Dis'],
+        'formula': lambda m: m['poss_Carries'] / (m['poss_Dis'] + 1),
+    },
+    'end_product_dribbler': {
+        'requires': ['gca_TO', 'poss_Carries'],
+        'formula': lambda m: (m['gca_TO'] * 100) / m['poss_Carries'],
+    },
+    'dribble_impact': {
+        'requires': ['poss_PrgC', 'gca_TO'],
+        'formula': lambda m: m['poss_PrgC'] + (m['gca_TO'] * 10),
+        'integer': True,
+    },
+    'Goals_Assists': {
+        'requires': ['std_Gls', 'std_Ast'],
+        'formula': lambda m: m['std_Gls'] + m['std_Ast'],
+        'integer': True,
+    },
+}
+MINUTES_BIN_LABELS = ['Very Low', 'Low', 'Medium', 'High', 'Very High']
+
+def build_derived_metrics(frame: pd.DataFrame, matrix: MetricMatrix, ids: np.ndarray) -> pd.DataFrame:
+    """Every available DERIVED_METRICS column plus Minutes_Bin, indexed by player ID."""
+    needed = sorted({c for d in DERIVED_METRICS.values() for c in d['requires'] if c in matrix})
+    cols = dict(zip(needed, matrix.block(needed, dtype=np.float64).T)) if needed else {}
+    table = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for name, metric in DERIVED_METRICS.items():
+            if not all(c in cols for c in metric['requires']):
+                continue
+            values = np.asarray(metric['formula'](cols), dtype=np.float64)
+            if metric.get('fillna', True):
+                values = np.where(np.isnan(values), 0.0, values)
+            if metric.get('integer') and np.array_equal(values, np.round(values)):
+                values = values.astype(np.int64)
+            table[name] = values
+    if 'std_Min' in frame.columns:
+        # Bins over the original minutes column so edges match pd.cut on df
+        table['Minutes_Bin'] = pd.cut(frame['std_Min'], bins=5, labels=MINUTES_BIN_LABELS).array
+    return pd.DataFrame(table, index=pd.Index(ids, name='player_id'))
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_derived_metrics(fingerprint: str, _frame: pd.DataFrame, _matrix: MetricMatrix, _players: PlayerIndex) -> pd.DataFrame:
+    """Derived metrics of one dataset version, shared by all sessions (read-only).
+
+    Rows follow df order and are keyed by player ID, so joining on ID lines
+    them up with df without a lookup.
+    """
+    return build_derived_metrics(_frame, _matrix, _players.ids)
+
+derived_metrics = get_derived_metrics(data_version, df, metric_matrix, player_index)
+
+def derived_column(name: str) -> pd.Series:
+    """Derived column ``name`` as a read-only Series on df's index (numeric values are not copied)."""
+    column = derived_metrics[name]
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # Categorical codes can't be frozen; Minutes_Bin is small, so hand out a copy
+        return pd.Series(column.array.copy(), index=df.index, name=name)
+    values = column.to_numpy().view()
+    values.flags.writeable = False  # writes raise instead of changing the shared table
+    return pd.Series(values, index=df.index, name=name, copy=False)
+
+# ---------------------------
+# LEAGUE LEADERBOARDS
+# ---------------------------
+LEADERBOARD_SIZE = 5
+
+# Tab5 boards; each ranks the DERIVED_METRICS column of the same name. 'requires'
+# lists the raw columns the board needs and 'qualify' is a vectorized rule over
+# them. 'columns' are the extra (label, source, format) cells shown next to the
+# score (source: a df or derived column); an optional 4th item scales the value.
+# Values are rounded to the precision of their format.
+LEADERBOARDS = {
+    'key_passes_per90': {
+        'requires': ['pass_KP', 'std_Min'],
+        'label': 'Key Passes per 90', 'format': '%.2f',
+        'missing': "Key passes or minutes data not found",
+    },
+    'key_pass_efficiency': {
+        'requires': ['pass_KP', 'pass_PrgP'],
+        'qualify': lambda m: m['pass_PrgP'] >= 10,  # Minimum 10 progressive passes
+        'label': 'Efficiency %', 'format': '%.1f%%',
+        'columns': [('Key Passes', 'pass_KP', '%.1f'), ('Progressive Passes', 'pass_PrgP', '%.1f')],
+        'missing': "Key passes or progressive passes data not found",
+        'empty': "No players with 10+ progressive passes found",
+    },
+    'maestro_score': {
+        'requires': ['pass_KP', 'pass_PPA', 'std_xAG', 'pass_Cmp%'],
+        'label': 'Maestro Score', 'format': '%.1f',
+        'columns': [('Key Passes', 'pass_KP', '%.1f'), ('Penalty Passes', 'pass_PPA', '%.1f'),
+                    ('xAG', 'std_xAG', '%.1f'), ('Pass %', 'pass_Cmp%', '%.1f%%', 100)],
+        'missing': "Maestro calculation data not found",
+    },
+    'vertical_playmaker': {
+        'requires': ['pass_PrgP', 'pass_1/3', 'pass_PPA'],
+        'label': 'Vertical Score', 'format': '%d',
+        'columns': [('Progressive Passes', 'pass_PrgP', '%.1f'), ('Final Third', 'pass_1/3', '%.1f'),
+                    ('Penalty Passes', 'pass_PPA', '%.1f')],
+        'missing': "Vertical playmaker data not found",
+    },
+    'press_resistant': {
+        'requires': ['pass_Cmp%', 'poss_Dis'],
+        'qualify': lambda m: m['poss_Dis'] >= 5,
+        'label': 'Reliability Ratio', 'format': '%.2f',
+        'columns': [('Pass %', 'pass_Cmp%', '%.1f%%', 100), ('Dispossessions', 'poss_Dis', '%.1f')],
+        'missing': "Pass accuracy or dispossessions data not found",
+        'empty': "No qualified passers found",
+    },
+    'visionary_score': {
+        'requires': ['passt_Sw', 'passt_TB'],
+        'label': 'Vision Score', 'format': '%d',
+        'columns': [('Switches', 'passt_Sw', '%.1f'), ('Through Balls', 'passt_TB', '%.1f')],
+        'missing': "Switch or through ball data not found",
+    },
+    'defensive_efficiency': {
+        'requires': ['def_Tkl', 'def_Int', 'std_Min'],
+        'label': 'Tackles+Int per 90', 'format': '%.2f',
+        'missing': "Defensive or minutes data not found",
+    },
+    'recovery_rate': {
+        'requires': ['misc_Recov', 'std_Min'],
+        'label': 'Recoveries per 90', 'format': '%.2f',
+        'missing': "Recovery or minutes data not found",
+    },
+    'defensive_intelligence': {
+        'requires': ['def_Int', 'def_Tkl'],
+        'qualify': lambda m: (m['def_Tkl'] >= 5) & (m['def_Int'] >= 3),
+        'label': 'Intelligence Ratio', 'format': '%.2f',
+        'columns': [('Interceptions', 'def_Int', '%.1f'), ('Tackles', 'def_Tkl', '%.1f')],
+        'missing': "Interceptions or tackles data not found",
+        'empty': "No qualified defenders found",
+    },
+    'high_press_pct': {
+        'requires': ['def_Att 3rd', 'def_Def 3rd', 'def_Mid 3rd'],
+        'qualify': lambda m: _def_actions(m) >= 10,
+        'label': 'High Press %', 'format': '%.1f%%', 'max_value': 100.0,
+        'columns': [('Attacking Third', 'def_Att 3rd', '%.1f'), ('Total Actions', 'total_def_actions', '%d')],
+        'missing': "Defensive third data not found",
+        'empty': "No qualified pressers found",
+    },
+    'clinical_ratio': {
+        'requires': ['std_Gls', 'std_xG', 'Gls'],
+        'qualify': lambda m: m['Gls'] >= 5,
+        'label': 'Goals/xG Ratio', 'format': '%.2f', 'score_last': True,
+        'columns': [('Goals', 'std_Gls', '%.1f'), ('xG', 'std_xG', '%.1f')],
+        'missing': "Goals or xG data not found",
+        'empty': "No players with 5+ goals found",
+    },
+    'penalty_area_threat': {
+        'requires': ['pass_PPA', 'poss_CPA', 'std_PrgR'],
+        'label': 'Threat Score', 'format': '%d',
+        'columns': [('Penalty Passes', 'pass_PPA', '%.1f'), ('Penalty Carries', 'poss_CPA', '%.1f'),
+                    ('Penalty Receives', 'std_PrgR', '%.1f')],
+        'missing': "Penalty area data not found",
+    },
+    'one_man_army': {
+        'requires': ['gca_TO', 'gca_Fld', 'poss_CPA'],
+        'label': 'Army Score', 'format': '%d',
+        'columns': [('Take-Ons', 'gca_TO', '%.1f'), ('Fouls Won', 'gca_Fld', '%.1f'),
+                    ('Penalty Carries', 'poss_CPA', '%.1f')],
+        'missing': "Individual skill data not found",
+    },
+    'set_piece_maestro': {
+        'requires': ['gca_PassDead', 'passt_Crs'],
+        'label': 'Maestro Score', 'format': '%d',
+        'columns': [('Dead Ball Assists', 'gca_PassDead', '%.1f'), ('Crosses', 'passt_Crs', '%.1f')],
+        'missing': "Set piece data not found",
+    },
+    'playmaking_ratio': {
+        'requires': ['std_Ast', 'std_xAG', 'Ast'],
+        'qualify': lambda m: m['Ast'] >= 5,
+        'label': 'Assists/xAG Ratio', 'format': '%.2f', 'score_last': True,
+        'columns': [('Assists', 'std_Ast', '%.1f'), ('xAG', 'std_xAG', '%.1f')],
+        'missing': "Assists or xAG data not found",
+        'empty': "No players with 5+ assists found",
+    },
+    'progressive_carrier': {
+        'requires': ['poss_PrgC', 'poss_1/3', 'poss_CPA'],
+        'label': 'Carrier Score', 'format': '%d',
+        'columns': [('Progressive Carries', 'poss_PrgC', '%.1f'), ('Final Third', 'poss_1/3', '%.1f'),
+                    ('Penalty Area', 'poss_CPA', '%.1f')],
+        'missing': "Ball carrying data not found",
+    },
+    'press_breaker': {
+        'requires': ['poss_Carries', 'poss_Dis'],
+        'qualify': lambda m: m['poss_Carries'] >= 20,
+        'label': 'Reliability Ratio', 'format': '%.2f',
+        'columns': [('Total Carries', 'poss_Carries', '%.1f'), ('Dispossessions', 'poss_Dis', '%.1f')],
+        'missing': "Carries or dispossessions data not found",
+        'empty': "No players with 20+ carries found",
+    },
+    'end_product_dribbler': {
+        'requires': ['gca_TO', 'poss_Carries'],
+        'qualify': lambda m: m['poss_Carries'] >= 20,
+        'label': 'End-Product %', 'format': '%.1f%%',
+        'columns': [('Take-Ons', 'gca_TO', '%.1f'), ('Total Carries', 'poss_Carries', '%.1f')],
+        'missing': "Take-ons or carries data not found",
+        'empty': "No players with 20+ carries found",
+    },
+    'dribble_impact': {
+        'requires': ['poss_PrgC', 'gca_TO'],
+        'label': 'Impact Score', 'format': '%d',
+        'columns': [('Progressive Carries', 'poss_PrgC', '%.1f'), ('Take-Ons', 'gca_TO', '%.1f')],
+        'missing': "Progressive carries or take-ons data not found",
+    },
+}
+
+def _format_digits(fmt: str) -> int:
+    """Decimals shown by a printf format ('%d' shows none)."""
+    match = re.search(r'%\.(\d+)f', fmt)
+    return int(match.group(1)) if match else 0
+
+def evaluate_leaderboards(matrix: MetricMatrix, derived: pd.DataFrame, boards=LEADERBOARDS,
+                          k: int = LEADERBOARD_SIZE) -> dict:
+    """Top-k row positions and scores of every board, computed in one pass.
+
+    The boards' derived columns form a single (boards x players) matrix; the k
+    best rows per board come from one batched argpartition, then only the rows
+    tied at or above each k-th score are sorted. Order matches ``nlargest(k)``
+    on the qualified rows: ties keep row order and NaN scores (kept only by
+    metrics with 'fillna': False) are dropped. Scores keep the derived column's
+    dtype. Boards with missing columns map to None.
+    """
+    needed = sorted({c for b in boards.values() for c in b['requires'] if c in matrix})
+    cols = dict(zip(needed, matrix.block(needed, dtype=np.float64).T)) if needed else {}
+    keys = [key for key, b in boards.items()
+            if key in derived.columns and all(c in cols for c in b['requires'])]
+    n = len(derived)
+    scores = np.empty((len(keys), n))
+    eligible = np.ones((len(keys), n), dtype=bool)
+    for i, key in enumerate(keys):
+        scores[i] = derived[key].to_numpy()
+        if boards[key].get('qualify') is not None:
+            eligible[i] = boards[key]['qualify'](cols)
+    eligible &= ~np.isnan(scores)  # nlargest skips NaN scores
+    ranked = np.where(eligible, scores, -np.inf)
+
+    result = dict.fromkeys(boards)
+    kth = min(k, n)
+    if not keys or not kth:
+        result.update((key, (np.empty(0, dtype=np.intp), np.empty(0))) for key in keys)
+        return result
+    candidates = np.argpartition(-ranked, kth - 1, axis=1)[:, :kth]
+    thresholds = np.take_along_axis(ranked, candidates, axis=1).min(axis=1)
+    for i, key in enumerate(keys):
+        rows = np.flatnonzero(eligible[i] & (ranked[i] >= thresholds[i]))
+        top = rows[np.argsort(-ranked[i, rows], kind='stable')[:k]]
+        result[key] = (top, derived[key].to_numpy()[top])
+    return result
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_leaderboards(fingerprint: str, _matrix: MetricMatrix, _derived: pd.DataFrame) -> dict:
+    """Tab5 leaderboards, evaluated once per dataset version."""
+    return evaluate_leaderboards(_matrix, _derived)
+
+leaderboards = get_leaderboards(data_version, metric_matrix, derived_metrics)
+
+def render_leaderboard(frame: pd.DataFrame, key: str) -> None:
+    """Top players table of one registered board (or its info message); ``frame`` is df."""
+    board = LEADERBOARDS[key]
+    entry = leaderboards.get(key)
+    if entry is None:
+        st.info(board['missing'])
+        return
+    top, values = entry
+    if not len(top):
+        st.info(board['empty'])
+        return
+    rows = frame.iloc[top]
+    leaders = rows[['Player', 'Squad']].rename(columns={'Squad': 'Team'})
+    label = board['label']
+    extras = []
+    for spec in board.get('columns', []):
+        name, source, fmt = spec[:3]
+        if source in rows.columns:
+            cells = rows[source]
+        else:
+            cells = pd.Series(derived_metrics[source].to_numpy()[top], index=rows.index)
+        if len(spec) > 3:
+            cells = cells * spec[3]
+        extras.append((name, cells.round(_format_digits(fmt)), fmt))
+    score = pd.Series(values, index=rows.index).round(_format_digits(board['format']))
+    if not board.get('score_last'):
+        leaders[label] = score
+    for name, cells, _ in extras:
+        leaders[name] = cells
+    if board.get('score_last'):
+        leaders[label] = score
+
+    column_config = {
+        "Player": st.column_config.TextColumn("Player", width="medium"),
+        "Team": st.column_config.TextColumn("Team", width="small"),
+        label: st.column_config.ProgressColumn(
+            label,
+            format=board['format'],
+            min_value=0,
+            max_value=board.get('max_value', float(leaders[label].max())),
+        ),
+    }
+    for name, _, fmt in extras:
+        column_config[name] = st.column_config.NumberColumn(name, format=fmt)
+    st.dataframe(leaders, use_container_width=True, hide_index=True, column_config=column_config)
+
+# ---------------------------
+# TREND CUBE
+# ---------------------------
+TREND_DIMENSIONS = ['Age', 'Minutes_Bin', 'Squad', 'Cluster', 'Archetype']
+TREND_METRICS = ['std_Gls', 'std_Ast', 'std_xG', 'std_xAG', 'pass_KP', 'pass_Cmp%', 'def_Tkl', 'def_Int', 'Age']
+
+class TrendCube:
+    """Per-cell counts, sums and sums of squares of the trend metrics.
+
+    Cells are the observed (Age, Minutes_Bin, Squad, Cluster, Archetype)
+    combinations; any grouping over those dimensions is a roll-up of the cells,
+    and single-dimension roll-ups are kept so tab6 slices cost nothing on rerun.
+    """
+
+    def __init__(self, frame: pd.DataFrame, matrix: MetricMatrix, derived: pd.DataFrame):
+        self.metrics = [m for m in TREND_METRICS if m in matrix]
+        # Minutes_Bin lives in the derived table, the other dimensions in df
+        keys = [pd.Series((derived if dim in derived.columns else frame)[dim].array, name=dim)
+                for dim in TREND_DIMENSIONS if dim in derived.columns or dim in frame.columns]
+        self.dimensions = [k.name for k in keys]
+        values = pd.DataFrame(matrix.block(self.metrics, dtype=np.float64), columns=self.metrics)
+        groups = values.groupby(keys, observed=True, dropna=False)
+        self.size = groups.size()
+        self.counts = groups.count()
+        self.sums = groups.sum()
+        self.squares = (values ** 2).groupby(keys, observed=True, dropna=False).sum()
+        self._rollups = {}
+        self._lock = threading.Lock()
+
+    def _rollup(self, by: tuple, observed: bool):
+        key = (by, observed)
+        with self._lock:
+            cached = self._rollups.get(key)
+        if cached is None:
+            level = list(by)
+            cached = tuple(part.groupby(level=level, observed=observed).sum()
+                           for part in (self.size, self.counts, self.sums, self.squares))
+            with self._lock:
+                cached = self._rollups.setdefault(key, cached)
+        return cached
+
+    def summary(self, by, metrics, stat: str = 'mean', observed: bool = True) -> pd.DataFrame:
+        """One row per ``by`` group: ``stat`` ('mean', 'var' or 'std') of ``metrics`` plus Player_Count.
+
+        Same numbers as ``df.groupby(by, observed=observed).agg(...)``; variances
+        are sample variances (ddof=1). ``observed=False`` keeps empty categories.
+        """
+        by = (by,) if isinstance(by, str) else tuple(by)
+        size, counts, sums, squares = self._rollup(by, observed)
+        n = counts[metrics]
+        mean = sums[metrics] / n
+        if stat == 'mean':
+            out = mean
+        else:
+            out = (squares[metrics] - sums[metrics] * mean) / (n - 1)
+            out = out.clip(lower=0)
+            if stat == 'std':
+                out = np.sqrt(out)
+        out = out.copy()
+        out['Player_Count'] = size
+        return out.reset_index()
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_trend_cube(fingerprint: str, _frame: pd.DataFrame, _matrix: MetricMatrix, _derived: pd.DataFrame) -> TrendCube:
+    """One shared TrendCube per dataset version."""
+    return TrendCube(_frame, _matrix, _derived)
+
+trend_cube = get_trend_cube(data_version, df, metric_matrix, derived_metrics)
+
+# ---------------------------
+# HISTOGRAM SERVICE
+# ---------------------------
+class HistogramCache:
+    """Bin edges, counts and summary stats per (metric, bins), computed once per dataset version.
+
+    Metrics come from the metric matrix or the derived table; NaN values are
+    left out. Tab7 draws the cached bars instead of shipping raw columns to
+    the browser for binning.
+    """
+
+    def __init__(self, matrix: MetricMatrix, derived: pd.DataFrame):
+        self.matrix = matrix
+        self.derived = derived
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _values(self, name: str) -> np.ndarray:
+        if name in self.matrix:
+            values = self.matrix.block([name], dtype=np.float64)[:, 0]
+        else:
+            values = self.derived[name].to_numpy(dtype=np.float64)
+        return values[~np.isnan(values)]
+
+    def get(self, name: str, bins: int = 20) -> dict:
+        """{'edges', 'counts', 'mean', 'std'} for ``name`` (std is the sample std, like pandas)."""
+        key = (name, bins)
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is None:
+            values = self._values(name)
+            counts, edges = np.histogram(values, bins=bins) if len(values) else (np.zeros(0, dtype=np.int64), np.zeros(0))
+            cached = {
+                'edges': edges,
+                'counts': counts,
+                'mean': float(values.mean()) if len(values) else np.nan,
+                'std': float(values.std(ddof=1)) if len(values) > 1 else np.nan,
+            }
+            with self._lock:
+                cached = self._entries.setdefault(key, cached)
+        return cached
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_histogram_cache(fingerprint: str, _matrix: MetricMatrix, _derived: pd.DataFrame) -> HistogramCache:
+    """One shared HistogramCache per dataset version."""
+    return HistogramCache(_matrix, _derived)
+
+histograms = get_histogram_cache(data_version, metric_matrix, derived_metrics)
+
+def histogram_trace(metric: str, bins: int = 20, **bar_kwargs) -> go.Bar:
+    """Precomputed histogram of ``metric`` as touching bars (one per bin)."""
+    hist = histograms.get(metric, bins)
+    edges = hist['edges']
+    return go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=hist['counts'],
+        width=np.diff(edges),
+        customdata=np.column_stack([edges[:-1], edges[1:]]) if len(edges) else None,
+        hovertemplate='%{customdata[0]:.4g} - %{customdata[1]:.4g}<br>%{y} players<extra></extra>',
+        **bar_kwargs
+    )
 
 # Matplotlib default font (avoid missing 'Inter' warnings)
 mpl.rcParams['font.family'] = 'DejaVu Sans'
@@ -412,114 +1517,142 @@ def get_score_color(score, archetype):
         return palette['high']
 
 # Similarity helpers
-def get_0_100_metric_columns(df_input: pd.DataFrame) -> list:
-    """Infer 0-100 scaled metric columns by value range, excluding id/meta fields."""
-    exclude_cols = {
-        'Player','Squad','Nation','Pos','Primary_Archetype','Secondary_Archetype',
-        'Secondary_Archetype_Score','Archetype_Score','Cluster','Minutes_Bin'
-    }
-    # Age may be <= 100 but we don't want it as a score feature
-    exclude_cols.add('Age')
-    metric_cols = []
-    for col in df_input.columns:
-        if col in exclude_cols:
-            continue
-        s = df_input[col]
-        if pd.api.types.is_numeric_dtype(s):
-            vals = s.dropna().values
-            if vals.size == 0:
-                continue
-            vmin = np.nanmin(vals)
-            vmax = np.nanmax(vals)
-            if vmin >= 0 and vmax <= 100:
-                metric_cols.append(col)
-    return metric_cols
+SIMILARITY_INDEX_K = 10
+SIMILAR_SUMMARY_COLUMNS = ['Player','Squad','Age','Primary_Archetype','Similarity_Score']
+
+def _pairwise_distances(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Euclidean distances between the rows of ``a`` and ``b`` (|a|^2 + |b|^2 - 2ab, no n*m*d temporary)."""
+    d2 = np.einsum('ij,ij->i', a, a)[:, None] + np.einsum('ij,ij->i', b, b)[None, :] - 2.0 * (a @ b.T)
+    np.maximum(d2, 0.0, out=d2)
+    return np.sqrt(d2, out=d2)
+
+def _smallest_k(dists: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of each row's ``k`` smallest distances, nearest first (ties by index)."""
+    part = np.sort(np.argpartition(dists, k - 1, axis=1)[:, :k], axis=1)
+    order = np.argsort(np.take_along_axis(dists, part, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(part, order, axis=1)
+
+class SimilarityIndex:
+    """Per-cluster neighbour table over the 0-100 metric columns.
+
+    Built once per dataset version: each cluster's metric block is imputed with
+    its column means, all within-cluster Euclidean distances are computed, and
+    the ``k`` nearest neighbours of every player (self excluded) are stored
+    together with the largest distance used to turn distances into a 0-100
+    Similarity_Score. Positions refer to rows of the loaded ``df``.
+    """
+
+    def __init__(self, frame: pd.DataFrame, matrix: MetricMatrix, schema: DatasetSchema,
+                 k: int = SIMILARITY_INDEX_K):
+        self.metrics = list(schema.similarity_metrics)
+        n = len(frame)
+        self.k = k
+        self.neighbours = np.full((n, k), -1, dtype=np.intp)
+        self.neighbour_dists = np.full((n, k), np.nan)
+        self.max_dists = np.zeros(n)
+        self.cluster_of = np.zeros(n, dtype=np.intp)
+        self.clusters = []  # (positions, imputed matrix) per cluster
+        if not self.metrics:
+            return
+        if 'Cluster' in frame.columns:
+            groups = [np.flatnonzero((frame['Cluster'] == c).to_numpy()) for c in pd.unique(frame['Cluster'].dropna())]
+        else:
+            groups = [np.arange(n)]
+        for gid, positions in enumerate(groups):
+            mat = matrix.block(self.metrics, rows=positions, dtype=np.float64)
+            if np.isnan(mat).any():
+                mat = np.where(np.isnan(mat), np.nanmean(mat, axis=0), mat)
+            mat.flags.writeable = False
+            self.clusters.append((positions, mat))
+            self.cluster_of[positions] = gid
+            dists = _pairwise_distances(mat, mat)
+            np.fill_diagonal(dists, np.inf)
+            max_d = np.where(np.isinf(dists), -np.inf, dists).max(axis=1)
+            self.max_dists[positions] = np.where(np.isfinite(max_d), max_d, 0.0)  # singleton clusters
+            kk = min(k, len(positions) - 1)
+            if kk > 0:
+                order = _smallest_k(dists, kk)
+                self.neighbours[positions, :kk] = positions[order]
+                self.neighbour_dists[positions, :kk] = np.take_along_axis(dists, order, axis=1)
+
+    def query(self, positions, top_k: int):
+        """Neighbours of every position in ``positions`` in one pass.
+
+        Returns ``(neighbours, scores)``, both shaped (len(positions), top_k);
+        slots beyond a small cluster's size hold -1 / NaN.
+        """
+        positions = np.asarray(positions, dtype=np.intp)
+        if top_k <= self.k:
+            nbrs = self.neighbours[positions, :top_k]
+            dists = self.neighbour_dists[positions, :top_k]
+        else:
+            # Deeper than the stored table: one distance matrix per cluster touched
+            nbrs = np.full((len(positions), top_k), -1, dtype=np.intp)
+            dists = np.full((len(positions), top_k), np.nan)
+            groups = self.cluster_of[positions]
+            for gid in np.unique(groups):
+                queries = np.flatnonzero(groups == gid)
+                cluster_pos, mat = self.clusters[gid]
+                q_rows = np.searchsorted(cluster_pos, positions[queries])
+                d = _pairwise_distances(mat[q_rows], mat)
+                d[np.arange(len(queries)), q_rows] = np.inf
+                kk = min(top_k, len(cluster_pos) - 1)
+                if kk <= 0:
+                    continue
+                order = _smallest_k(d, kk)
+                nbrs[queries, :order.shape[1]] = cluster_pos[order]
+                dists[queries, :order.shape[1]] = np.take_along_axis(d, order, axis=1)
+        max_d = self.max_dists[positions][:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = np.where(max_d == 0.0, 100.0, 100.0 - (dists / max_d) * 100.0)
+        return nbrs, np.where(nbrs >= 0, scores, np.nan)
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_similarity_index(fingerprint: str, _frame: pd.DataFrame, _matrix: MetricMatrix,
+                         _schema: DatasetSchema) -> SimilarityIndex:
+    """One shared SimilarityIndex per dataset version."""
+    return SimilarityIndex(_frame, _matrix, _schema)
+
+similarity_index = get_similarity_index(data_version, df, metric_matrix, schema)
+
+def query_similar_players(df_all: pd.DataFrame, players, top_k: int = 3, projection: str = 'summary') -> dict:
+    """Top_k most similar players (same Cluster) for every name in ``players``.
+    - One lookup/distance pass for the whole batch, one row gather from df_all
+    - projection='summary' keeps Player/Squad/Age/Primary_Archetype/Similarity_Score,
+      projection='all' keeps every column (Excel export)
+    - Returns {player: DataFrame}; unknown players map to an empty frame
+    - df_all must be the loaded df (its rows line up with metric_matrix)
+    """
+    if projection not in ('summary', 'all'):
+        raise ValueError(f"Unknown projection: {projection!r}")
+    empty = pd.DataFrame(columns=SIMILAR_SUMMARY_COLUMNS) if projection == 'summary' else pd.DataFrame()
+    players = list(players)
+    name_hits = np.array([player_index.positions.get(p, -1) for p in players], dtype=np.intp)
+    known = [i for i, pos in enumerate(name_hits) if pos >= 0]
+    results = {p: empty for p in players}
+    if not known or not similarity_index.metrics:
+        return results
+
+    nbrs, scores = similarity_index.query(name_hits[known], top_k)
+    valid = nbrs >= 0
+    gathered = df_all.iloc[nbrs[valid]].assign(Similarity_Score=scores[valid])
+    if projection == 'summary':
+        gathered = gathered[SIMILAR_SUMMARY_COLUMNS]
+    bounds = np.concatenate([[0], np.cumsum(valid.sum(axis=1))])
+    for j, i in enumerate(known):
+        if bounds[j + 1] > bounds[j]:
+            results[players[i]] = gathered.iloc[bounds[j]:bounds[j + 1]]
+    return results
 
 def find_similar_players(df_all: pd.DataFrame, selected_player: str, top_k: int = 3) -> pd.DataFrame:
     """Return top_k most similar players to selected_player within the same Cluster.
-    - Uses Euclidean distance over inferred 0-100 metric columns
-    - Converts distance to 0-100 Similarity_Score: 100 - (d/max_d)*100
-    """
-    if selected_player not in set(df_all['Player']):
-        return pd.DataFrame(columns=['Player','Squad','Age','Primary_Archetype','Similarity_Score'])
-
-    metrics = get_0_100_metric_columns(df_all)
-    if len(metrics) == 0:
-        return pd.DataFrame(columns=['Player','Squad','Age','Primary_Archetype','Similarity_Score'])
-
-    sel_row = df_all[df_all['Player'] == selected_player].iloc[0]
-    sel_cluster = sel_row.get('Cluster', None)
-    df_cluster = df_all[df_all['Cluster'] == sel_cluster].copy() if sel_cluster is not None else df_all.copy()
-
-    # Drop rows without any metric values; fill remaining NaNs by cluster-wise column mean
-    cluster_means = df_cluster[metrics].mean(numeric_only=True)
-    df_cluster[metrics] = df_cluster[metrics].fillna(cluster_means).infer_objects(copy=False)
-
-    sel_vec = sel_row[metrics].fillna(cluster_means).infer_objects(copy=False).values.astype(float)
-    # Compute distances
-    mat = df_cluster[metrics].values.astype(float)
-    diffs = mat - sel_vec
-    dists = np.linalg.norm(diffs, axis=1)
-    df_cluster = df_cluster.assign(_dist=dists)
-    # Exclude self
-    df_cluster = df_cluster[df_cluster['Player'] != selected_player]
-    if df_cluster.empty:
-        return pd.DataFrame(columns=['Player','Squad','Age','Primary_Archetype','Similarity_Score'])
-
-    max_d = float(df_cluster['_dist'].max())
-    if max_d == 0.0:
-        sim_scores = np.full(len(df_cluster), 100.0)
-    else:
-        sim_scores = 100.0 - (df_cluster['_dist'].values / max_d) * 100.0
-    df_cluster = df_cluster.assign(Similarity_Score=sim_scores)
-    df_sorted = df_cluster.sort_values('Similarity_Score', ascending=False)
-    top = df_sorted.head(top_k)
-    return top[['Player','Squad','Age','Primary_Archetype','Similarity_Score']]
+    Single-player form of query_similar_players (summary columns)."""
+    return query_similar_players(df_all, [selected_player], top_k)[selected_player]
 
 def find_similar_players_with_all_metrics(df_all: pd.DataFrame, selected_player: str, top_k: int = 3) -> pd.DataFrame:
     """Return top_k most similar players with ALL metrics for detailed Excel export.
-    - Uses Euclidean distance over inferred 0-100 metric columns
-    - Returns complete player data including all statistics
-    """
-    if selected_player not in set(df_all['Player']):
-        return pd.DataFrame()
-
-    metrics = get_0_100_metric_columns(df_all)
-    if len(metrics) == 0:
-        return pd.DataFrame()
-
-    sel_row = df_all[df_all['Player'] == selected_player].iloc[0]
-    sel_cluster = sel_row.get('Cluster', None)
-    df_cluster = df_all[df_all['Cluster'] == sel_cluster].copy() if sel_cluster is not None else df_all.copy()
-
-    # Drop rows without any metric values; fill remaining NaNs by cluster-wise column mean
-    cluster_means = df_cluster[metrics].mean(numeric_only=True)
-    df_cluster[metrics] = df_cluster[metrics].fillna(cluster_means).infer_objects(copy=False)
-
-    sel_vec = sel_row[metrics].fillna(cluster_means).infer_objects(copy=False).values.astype(float)
-    # Compute distances
-    mat = df_cluster[metrics].values.astype(float)
-    diffs = mat - sel_vec
-    dists = np.linalg.norm(diffs, axis=1)
-    df_cluster = df_cluster.assign(_dist=dists)
-    # Exclude self
-    df_cluster = df_cluster[df_cluster['Player'] != selected_player]
-    if df_cluster.empty:
-        return pd.DataFrame()
-
-    max_d = float(df_cluster['_dist'].max())
-    if max_d == 0.0:
-        sim_scores = np.full(len(df_cluster), 100.0)
-    else:
-        sim_scores = 100.0 - (df_cluster['_dist'].values / max_d) * 100.0
-    df_cluster = df_cluster.assign(Similarity_Score=sim_scores)
-    df_sorted = df_cluster.sort_values('Similarity_Score', ascending=False)
-    top = df_sorted.head(top_k)
-    
-    # Return all columns with Similarity_Score added
-    result = top.copy()
-    result = result.drop(columns=['_dist'])  # Remove internal distance column
-    return result
+    Single-player form of query_similar_players(projection='all')."""
+    return query_similar_players(df_all, [selected_player], top_k, projection='all')[selected_player]
 
 # ---------------------------
 # STEP 0.5: COLUMN DESCRIPTIONS (English)
@@ -604,8 +1737,6 @@ Offensive midfield, number 10 position, creative central roles are preferred.
 **SCOUT NOTE:**  
 Highest transfer value group. Players closely monitored by European clubs.""",
         "detailed_stats": {
-            "avg_goals": None, "avg_assists": None, "avg_xG": None, "avg_shots": None,
-            "avg_age": None, "avg_minutes": None, "top_teams": ["Ajax", "PSV", "Go Ahead Eagle", "NAC Breda", "Twente"],
             "key_strengths": ["Goals", "Assists", "Creativity", "Shots", "xG"], 
             "playing_style": "Attack-focused creative, ability to break opponent defense, effective in final pass"
         }
@@ -627,8 +1758,6 @@ Central midfield, rotation roles, substitute starting positions are preferred.
 **SCOUT NOTE:**  
 Names that can show great development within 2-3 years. Potential stars that can be acquired at low cost.""",
         "detailed_stats": {
-            "avg_pass_success": None, "avg_playing_time": None,             "avg_minutes": None, "avg_age": None,
-            "top_teams": ["Groningen", "Utrecht", "Sparta R'dam", "Feyenoord", "Ajax"], "total_players": 26,
             "key_strengths": ["Rotation Adaptability", "Basic Passing Ability", "Young Age"],
             "playing_style": "Still in development phase, has basic abilities, high growth potential for the future"
         }
@@ -650,15 +1779,361 @@ Defensive midfield, number 6-8, holding midfielder positions are preferred.
 **SCOUT NOTE:**  
 Backbone players of the team. Leader-type, reliable names giving 100% performance every match.""",
         "detailed_stats": {
-            "avg_tackles": None, "avg_interceptions": None, "avg_recoveries": None,
-            "avg_minutes": None, "avg_age": None, "total_players": 12,
-            "top_teams": ["Go Ahead Eagle", "NEC Nijmegen", "Zwolle", "Utrecht", "Heerenveen"],
             "key_strengths": ["Defense", "Ball Recovery", "Endurance"],
             "playing_style": "Destructive midfielder, cleanup specialist, team balance provider"
         }
     }
 }
 
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_cluster_profile_stats(fingerprint: str, _frame: pd.DataFrame) -> dict:
+    """Per-Cluster counts, averages and top teams for one dataset version."""
+    return cluster_profile_stats(_frame)
+
+# Counts, averages and top teams always come from the data, never from the literals above
+cluster_stats = get_cluster_profile_stats(data_version, df)
+
+# ---------------------------
+# PLAYER CARDS
+# ---------------------------
+CARD_MEMO_SIZE = 512
+# Tab3/tab4 card borders (profile 1 is green here, pink in get_profile_color)
+CARD_BORDER_COLORS = {0: '#1E88E5', 1: '#43A047', 2: '#FB8C00'}
+# Performance stats under a player card, by primary archetype: (label, column)
+CARD_ARCHETYPE_METRICS = {
+    'Anchor': [("Tkl+Int", 'def_Tkl+Int'), ("Blocks", 'def_Blocks'), ("Recoveries", 'misc_Recov')],
+    'DLP': [("Pass Success", 'pass_Cmp%'), ("Prog Distance", 'pass_PrgDist'), ("Prog Passes", 'pass_PrgP')],
+    'BallWinner': [("Tkl+Int", 'def_Tkl+Int'), ("Tkl Won", 'def_TklW'), ("Recoveries", 'misc_Recov')],
+    'BoxToBox': [("Prog Runs", 'std_PrgR'), ("Recoveries", 'misc_Recov'), ("Prog Distance", 'poss_PrgDist')],
+    'APM': [("Key Passes", 'pass_KP'), ("xAG", 'std_xAG'), ("GCA Pass", 'gca_PassLive')],
+    'Mezzala': [("Final 3rd", 'poss_1/3'), ("Pen Area", 'poss_CPA'), ("xAG", 'std_xAG')],
+    'ShadowStriker': [("xG", 'std_xG'), ("Shots", 'shoot_Sh'), ("Goals", 'std_Gls')],
+}
+CARD_DEFAULT_METRICS = [("Minutes", 'std_Min'), ("Pass Success", 'pass_Cmp%'), ("Matches", 'std_MP')]
+
+CARD_TEMPLATES = {
+    'header': Template("""
+<div class='player-card' style='border: 2px solid $border;
+            border-radius: 10px; padding: 1rem;
+            background: white; box-shadow: 0 2px 8px rgba(0,0,0,0.1);'>
+    <div style='text-align: center;'>
+        <div style='color: $border;
+                    font-size: 0.8rem; font-weight: 600;'>
+            $rank_label
+        </div>
+        <h4 style='margin: 0.3rem 0; color: #333; font-size: 1.1rem; background: linear-gradient(135deg, ${profile_color}15, ${profile_color}08); padding: 0.3rem 0.5rem; border-radius: 4px;'>
+            $player
+        </h4>
+        <p style='margin: 0; color: $team_color; font-size: 0.85rem; background: linear-gradient(135deg, ${profile_color}12, ${profile_color}05); padding: 0.2rem 0.5rem; border-radius: 4px; font-weight: 600;'>
+            $squad
+        </p>
+    </div>
+</div>
+"""),
+    'profile_info': Template("""
+<div style='display: grid; grid-template-columns: 1fr 1fr; gap: 0.5rem;
+            margin-top: 0.8rem; font-size: 0.85rem;'>
+    <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px;'>
+        <div style='color: #888; font-size: 0.7rem;'>Nation</div>
+        <div style='font-weight: 600; color: #333;'>$nation</div>
+    </div>
+    <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px;'>
+        <div style='color: #888; font-size: 0.7rem;'>Age</div>
+        <div style='font-weight: 600; color: #333;'>$age</div>
+    </div>
+    <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px; grid-column: span 2;'>
+        <div style='color: #888; font-size: 0.7rem;'>Profile</div>
+        <div style='font-weight: 600; color: $border; font-size: 0.75rem;'>
+            $profile_label
+        </div>
+    </div>
+    <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px; grid-column: span 2;'>
+        <div style='color: #888; font-size: 0.7rem;'>Overall Rating</div>
+        <div style='font-weight: 600; color: $rating_color;'>
+            $rating
+        </div>
+    </div>
+</div>
+"""),
+    'archetype': Template("""
+<div style='margin-top: 0.8rem; padding: 0.6rem;
+            background: linear-gradient(135deg, ${arch_color}15, ${arch_color}05);
+            border-radius: 5px; text-align: center; min-height: 120px;'>
+    <div style='color: #6b7280; font-size: 0.75rem; font-weight: 500; margin-bottom: 0.4rem; border-bottom: 1px solid #e5e7eb; padding-bottom: 0.2rem; display: inline-block;'>
+        Archetype
+    </div>
+    <div style='font-weight: 700; color: $arch_color;
+                font-size: 0.95rem;'>
+        $archetype
+    </div>
+    <div style='color: #666; font-size: 0.75rem; margin-top: 0.2rem;'>
+       Archetype Score: $archetype_score
+    </div>
+$secondary
+</div>
+"""),
+    'secondary': Template(
+        "<div style='color: #6b7280; font-size: 0.72rem; font-weight: 500; margin-top: 0.4rem;'>Secondary: "
+        "<span style='color: $color; font-weight: 700;'>$archetype</span>$score</div>"
+    ),
+    'metrics': Template("""
+<div style='margin-top: 0.8rem; padding: 0.6rem; background: #f9f9f9; border-radius: 5px;'>
+    <div style='display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 0.3rem; font-size: 0.75rem; text-align: center;'>
+$cells
+    </div>
+</div>
+"""),
+    'metric_cell': Template("""\
+        <div>
+            <div style='color: #888; font-size: 0.65rem;'>$label</div>
+            <div style='font-weight: 600; color: $color;'>$value</div>
+        </div>"""),
+    'archetype_info': Template("""
+<div style='display: grid; grid-template-columns: 1fr 1fr; gap: 0.5rem;
+            margin-top: 0.8rem; font-size: 0.85rem;'>
+    <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px;'>
+        <div style='color: #888; font-size: 0.7rem;'>Archetype</div>
+        <div style='font-weight: 600; color: $arch_color;'>$archetype</div>
+    </div>
+    <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px;'>
+        <div style='color: #888; font-size: 0.7rem;'>Age</div>
+        <div style='font-weight: 600; color: #333;'>$age_display</div>
+    </div>
+    <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px; grid-column: span 2;'>
+        <div style='color: #888; font-size: 0.7rem;'>Profile</div>
+        <div style='font-weight: 600; color: $profile_color;'>$profile_label</div>
+    </div>
+    <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px; grid-column: span 2;'>
+        <div style='color: #888; font-size: 0.7rem;'>$score_label</div>
+        <div style='font-weight: 600; color: $score_color;'>
+            $score
+        </div>
+    </div>
+</div>
+"""),
+    'similar_header': Template("""
+<div class='player-card' style='border: 2px solid $profile_color;
+            border-radius: 10px; padding: 1rem;
+            background: white; box-shadow: 0 2px 8px rgba(0,0,0,0.1);'>
+    <div style='text-align: center;'>
+        <div style='color: $profile_color; font-size: 0.8rem; font-weight: 700;'>$rank_label</div>
+        <h4 style='margin: 0.3rem 0; color: #111827; font-size: 1.05rem; background: linear-gradient(135deg, ${profile_color}15, ${profile_color}08); padding: 0.3rem 0.5rem; border-radius: 4px;'>
+            $player
+        </h4>
+        <p style='margin: 0; color: $team_color; font-size: 0.9rem; background: linear-gradient(135deg, ${profile_color}12, ${profile_color}05); padding: 0.2rem 0.5rem; border-radius: 4px; font-weight: 600;'>
+            $squad
+        </p>
+    </div>
+</div>
+"""),
+    'similar_info': Template("""
+<div style='display: grid; grid-template-columns: 1fr 1fr; gap: 0.5rem;
+            margin-top: 0.8rem; font-size: 0.85rem;'>
+    <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px;'>
+        <div style='color: #888; font-size: 0.7rem;'>Age</div>
+        <div style='font-weight: 600; color: #111827;'>$age_display</div>
+    </div>
+    <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px;'>
+        <div style='color: #888; font-size: 0.7rem;'>Archetype</div>
+        <div style='font-weight: 700; color: $arch_color;'>$archetype</div>
+    </div>
+    <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px; grid-column: span 2;'>
+        <div style='color: #888; font-size: 0.7rem;'>Similarity Score</div>
+        <div style='font-weight: 800; color: $rating_color;'>$rating</div>
+    </div>
+</div>
+"""),
+}
+# Card type -> markdown blocks, one st.markdown call each
+CARD_LAYOUTS = {
+    'profile': ('header', 'profile_info', 'archetype', 'metrics'),
+    'archetype': ('header', 'archetype_info'),
+    'similar': ('similar_header', 'similar_info'),
+}
+
+class PlayerCardRenderer:
+    """HTML player cards for tab3/tab4, rendered from CARD_TEMPLATES.
+
+    Per-player fields (colors, labels, archetype stats) are built once per row;
+    rendered cards are kept in an LRU keyed by (card type, player ID, rank label,
+    value). One renderer per dataset version, so the version is part of the key.
+    """
+
+    def __init__(self, frame: pd.DataFrame, ids: np.ndarray, max_entries: int = CARD_MEMO_SIZE):
+        self.frame = frame
+        self.ids = ids
+        self.max_entries = max_entries
+        self.score_col = 'Archetype_Score' if 'Archetype_Score' in frame.columns else None
+        self._fields = {}
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _build_fields(self, pos: int) -> dict:
+        player = self.frame.iloc[pos]
+        cluster_id = player.get('Cluster', None)
+        try:
+            cluster_int = int(cluster_id) if cluster_id is not None and not pd.isna(cluster_id) else None
+        except Exception:
+            cluster_int = None
+        profile_name = cluster_profiles.get(cluster_int, {}).get('name', 'N/A') if cluster_int is not None else 'N/A'
+        age = player.get('Age', np.nan)
+        primary = player.get('Primary_Archetype', 'N/A')
+        archetype = str(primary).strip()
+
+        secondary_arch = player.get('Secondary_Archetype', None)
+        secondary = ""
+        if isinstance(secondary_arch, str) and len(secondary_arch.strip()) > 0 and secondary_arch != 'N/A':
+            secondary_score = player.get('Secondary_Archetype_Score', None)
+            try:
+                sec_score_txt = f", {float(secondary_score):.0f}" if secondary_score is not None and not pd.isna(secondary_score) else ""
+            except Exception:
+                sec_score_txt = ""
+            secondary = CARD_TEMPLATES['secondary'].substitute(
+                color=get_archetype_color(secondary_arch), archetype=secondary_arch, score=sec_score_txt)
+
+        cells = []
+        for label, col in CARD_ARCHETYPE_METRICS.get(archetype, CARD_DEFAULT_METRICS):
+            value = player[col]
+            cells.append(CARD_TEMPLATES['metric_cell'].substitute(
+                label=label, color=get_score_color(value, archetype), value=f"{value:.0f}"))
+
+        score_val = float(player.get(self.score_col, 0)) if self.score_col else float(player.get('std_Min', 0))
+        return {
+            'player': player['Player'],
+            'squad': player.get('Squad', 'N/A'),
+            'team_color': get_team_color(player.get('Squad', 'N/A')),
+            'nation': player.get('Nation', 'N/A'),
+            'age': f"{age:.0f}",
+            'age_display': 'N/A' if pd.isna(age) else f"{float(age):.0f}",
+            'border': CARD_BORDER_COLORS.get(cluster_int, CARD_BORDER_COLORS[0]),
+            'profile_color': get_profile_color(cluster_int),
+            'profile_label': f"{'' if cluster_int is None else cluster_int}: {profile_name}",
+            'archetype': primary,
+            'arch_color': get_archetype_color(primary),
+            'archetype_score': f"{player.get('Archetype_Score', 0):.0f}",
+            'secondary': secondary,
+            'cells': "\n".join(cells),
+            'score_label': 'Archetype Score' if self.score_col else 'Minutes',
+            'score_color': get_rating_color(score_val if self.score_col else min(score_val / 20, 100)),
+            'score': f"{score_val:.1f}",
+        }
+
+    def _player_fields(self, pos: int) -> dict:
+        fields = self._fields.get(pos)
+        if fields is None:
+            fields = self._fields.setdefault(pos, self._build_fields(pos))
+        return fields
+
+    def render(self, card_type: str, pos: int, rank_label: str, value=None) -> tuple:
+        """HTML blocks of one card for the player at df position ``pos``.
+        ``value`` is the card's rating (profile) or similarity score (similar)."""
+        key = (card_type, int(self.ids[pos]), rank_label, value)
+        with self._lock:
+            cached = self._memo.get(key)
+            if cached is not None:
+                self._memo.move_to_end(key)
+                return cached
+        fields = dict(self._player_fields(pos), rank_label=rank_label)
+        if card_type == 'archetype':
+            fields['border'] = fields['profile_color']  # archetype cards use the profile palette
+        if value is not None:
+            fields.update(rating=f"{value:.1f}", rating_color=get_rating_color(value))
+        cached = tuple(CARD_TEMPLATES[block].substitute(fields) for block in CARD_LAYOUTS[card_type])
+        with self._lock:
+            self._memo[key] = cached
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+        return cached
+
+    def show(self, card_type: str, pos: int, rank_label: str, value=None) -> None:
+        """Render a card into the current container."""
+        for block in self.render(card_type, pos, rank_label, value):
+            st.markdown(block, unsafe_allow_html=True)
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_card_renderer(fingerprint: str, _frame: pd.DataFrame, _players: PlayerIndex) -> PlayerCardRenderer:
+    """One shared PlayerCardRenderer per dataset version."""
+    return PlayerCardRenderer(_frame, _players.ids)
+
+card_renderer = get_card_renderer(data_version, df, player_index)
+
+INFO_CARD_GAP_PX = 16
+
+def render_info_card_grid(cards, card_height: int, per_row: int = 3) -> None:
+    """Mount a batch of HTML info cards as one component (one iframe) instead of one each.
+    - Rows of ``per_row`` cards; a short last row stretches like st.columns(len(row)) did
+    - Every card keeps its own ``card_height`` viewport with scrolling
+    - One call per layout slot: tab4 puts each category's cards beside that category's
+      radar, and an iframe cannot span several st.columns, so groups are not merged
+    """
+    cards = [c for c in cards if c is not None]
+    if not cards:
+        return
+    rows = -(-len(cards) // per_row)
+    cells = "".join(f"<div class='info-card-cell'>{card}</div>" for card in cards)
+    doc = f"""
+    <style>
+        body {{ margin: 0; }}
+        .info-card-grid {{ display: flex; flex-wrap: wrap; gap: {INFO_CARD_GAP_PX}px; }}
+        .info-card-cell {{
+            flex: 1 1 calc((100% - {(per_row - 1) * INFO_CARD_GAP_PX}px) / {per_row});
+            min-width: 0; height: {card_height}px; overflow-y: auto;
+        }}
+    </style>
+    <div class='info-card-grid'>{cells}</div>
+    """
+    components.html(doc, height=rows * card_height + (rows - 1) * INFO_CARD_GAP_PX, scrolling=True)
+
+# ---------------------------
+# FIGURE CACHE
+# ---------------------------
+FIGURE_CACHE_SIZE = 256
+
+class FigureCache:
+    """Plotly figures stored as JSON, keyed by (chart type, player IDs, metric set, extras).
+
+    One cache per dataset version, so the version is part of every key. A hit
+    skips the pandas work and trace building: the figure is read back from JSON
+    without re-validation (it was validated when it was first built).
+    """
+
+    def __init__(self, players: PlayerIndex, max_entries: int = FIGURE_CACHE_SIZE):
+        self.players = players
+        self.max_entries = max_entries
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, kind: str, players=(), metrics=(), *extra) -> tuple:
+        """Cache key; player order matters (it picks trace colors)."""
+        return (kind, tuple(self.players.id_of(p) for p in players), tuple(metrics), extra)
+
+    def get(self, key: tuple):
+        """Cached figure for ``key`` or None."""
+        with self._lock:
+            payload = self._memo.get(key)
+            if payload is None:
+                return None
+            self._memo.move_to_end(key)
+        return go.Figure(json.loads(payload), _validate=False)
+
+    def put(self, key: tuple, fig: go.Figure) -> go.Figure:
+        """Store ``fig`` under ``key`` and return it."""
+        payload = fig.to_json()
+        with self._lock:
+            self._memo[key] = payload
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+        return fig
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_figure_cache(fingerprint: str, _players: PlayerIndex) -> FigureCache:
+    """One shared FigureCache per dataset version."""
+    return FigureCache(_players)
+
+figure_cache = get_figure_cache(data_version, player_index)
+
 # ---------------------------
 # STEP 1: PAGE HEADER INFO
 # ---------------------------
@@ -738,19 +2213,33 @@ with st.sidebar:
     if st.button("Reset All Filters", type="primary", use_container_width=True):
         st.rerun()
 
-# Apply filters
-df_filtered = df[
-    (df["Age"] >= age_filter[0]) &
-    (df["Age"] <= age_filter[1]) &
-    (df["Pos"].isin(pos_filter)) &
-    (df["Squad"].isin(squad_filter)) &
-    (df["Cluster"].isin(cluster_filter))
-]
-
-if player_search:
-    df_filtered = df_filtered[df_filtered["Player"].str.contains(player_search, case=False, na=False)]
+    st.markdown("---")
 
-# Create 7 main navigation tabs
+    # Data cache statistics (shared by all sessions on this server)
+    with st.expander("Data Cache Stats", expanded=False):
+        loader_stats = get_loader_stats()
+        with loader_stats["lock"]:
+            total_requests = loader_stats["requests"]
+            total_loads = loader_stats["loads"]
+            total_load_seconds = loader_stats["load_seconds"]
+            last_load_seconds = loader_stats["last_load_seconds"]
+            last_source = loader_stats["last_source"]
+        cache_hits = max(total_requests - total_loads, 0)
+        avg_load_ms = (total_load_seconds / total_loads * 1000) if total_loads else 0.0
+        st.markdown(f"""
+**Dataset version:** `{data_version[:12]}`  
+**Table loads:** {total_loads}  
+**Cache hits:** {cache_hits} of {total_requests} requests  
+**Last load:** {last_load_seconds * 1000:.1f} ms ({last_source})  
+**Load time saved:** ~{cache_hits * avg_load_ms / 1000:.2f} s
+""")
+
+# Apply filters (row positions from the shared bitmap index)
+filtered_positions = filter_index.positions(age_filter, pos_filter, squad_filter, cluster_filter, player_search)
+df_filtered = df.iloc[filtered_positions]
+
+# Create 7 main navigation tabs. They track the selected tab (switching reruns the
+# app) and each body only runs while its tab is open.
 tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
     "Overview", 
     "Player Profiles", 
@@ -759,11 +2248,12 @@ tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
     "League Leaders", 
     "Trend Analysis", 
     "Distribution Analysis"
-])
+], key="main_tab", on_change="rerun")
 
 with tab1:
-    # Clean Header Section
-    st.markdown("""
+    if tab1.open:
+        # Clean Header Section
+        st.markdown("""
         <div style='text-align: center; padding: 2rem 1rem; background: #f8f9fa; 
                     border-radius: 8px; margin-bottom: 2rem; border: 1px solid #e9ecef;'>
             <h1 style='color: #2563eb; font-size: 2rem; margin: 0; font-weight: 700;'>
@@ -788,11 +2278,11 @@ with tab1:
         </div>
     """, unsafe_allow_html=True)
 
-    # Project Overview & Scoring System - Side by Side Cards
-    col_info1, col_info2 = st.columns(2, gap="large")
+        # Project Overview & Scoring System - Side by Side Cards
+        col_info1, col_info2 = st.columns(2, gap="large")
 
-    with col_info1:
-        st.markdown("""
+        with col_info1:
+            st.markdown("""
             <div style='background: #ffffff; border-radius: 8px; padding: 1.5rem; height: 100%;
                         border: 1px solid #e9ecef; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
                 <h3 style='color: #2563eb; margin: 0 0 1rem 0; font-size: 1.1rem; font-weight: 600;'>
@@ -806,8 +2296,8 @@ with tab1:
             </div>
         """, unsafe_allow_html=True)
 
-    with col_info2:
-        st.markdown("""
+        with col_info2:
+            st.markdown("""
             <div style='background: #ffffff; border-radius: 8px; padding: 1.5rem; height: 100%;
                         border: 1px solid #e9ecef; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
                 <h3 style='color: #2563eb; margin: 0 0 1rem 0; font-size: 1.1rem; font-weight: 600;'>
@@ -822,36 +2312,36 @@ with tab1:
             </div>
         """, unsafe_allow_html=True)
 
-    st.markdown("<div style='margin: 1.5rem 0;'></div>", unsafe_allow_html=True)
+        st.markdown("<div style='margin: 1.5rem 0;'></div>", unsafe_allow_html=True)
 
-    # Clean Stats Cards
-    col1, col2, col3, col4 = st.columns(4, gap="medium")
-    with col1:
-        st.markdown("""
+        # Clean Stats Cards
+        col1, col2, col3, col4 = st.columns(4, gap="medium")
+        with col1:
+            st.markdown("""
             <div style='background: #ffffff; padding: 1.5rem 1rem; border-radius: 8px; text-align: center; 
                         border: 1px solid #e9ecef; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
                 <h2 style='color: #2563eb; margin: 0; font-size: 2rem; font-weight: 700;'>49</h2>
                 <p style='color: #6c757d; margin: 0.5rem 0 0 0; font-size: 0.9rem; font-weight: 500;'>TOTAL PLAYERS</p>
             </div>
         """, unsafe_allow_html=True)
-    with col2:
-        st.markdown("""
+        with col2:
+            st.markdown("""
             <div style='background: #ffffff; padding: 1.5rem 1rem; border-radius: 8px; text-align: center; 
                         border: 1px solid #e9ecef; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
                 <h2 style='color: #2563eb; margin: 0; font-size: 2rem; font-weight: 700;'>3</h2>
                 <p style='color: #6c757d; margin: 0.5rem 0 0 0; font-size: 0.9rem; font-weight: 500;'>PLAYER PROFILES</p>
             </div>
         """, unsafe_allow_html=True)
-    with col3:
-        st.markdown("""
+        with col3:
+            st.markdown("""
             <div style='background: #ffffff; padding: 1.5rem 1rem; border-radius: 8px; text-align: center; 
                         border: 1px solid #e9ecef; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
                 <h2 style='color: #2563eb; margin: 0; font-size: 2rem; font-weight: 700;'>18-24</h2>
                 <p style='color: #6c757d; margin: 0.5rem 0 0 0; font-size: 0.9rem; font-weight: 500;'>AGE RANGE</p>
             </div>
         """, unsafe_allow_html=True)
-    with col4:
-        st.markdown("""
+        with col4:
+            st.markdown("""
             <div style='background: #ffffff; padding: 1.5rem 1rem; border-radius: 8px; text-align: center; 
                         border: 1px solid #e9ecef; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
                 <h2 style='color: #2563eb; margin: 0; font-size: 2rem; font-weight: 700;'>18</h2>
@@ -859,10 +2349,10 @@ with tab1:
             </div>
         """, unsafe_allow_html=True)
 
-    st.divider()
+        st.divider()
     
-    # General Overview Info
-    st.info("""
+        # General Overview Info
+        st.info("""
     **🔍 What's in Other Tabs:**
     - **👥 Player Profiles**: Detailed player archetype analysis and filtered player list (use filters in top-left corner for filtered players section)
     - **🏆 Top Players**: Best performers by each profile type
@@ -873,11 +2363,12 @@ with tab1:
     """)
 
 with tab2:
-    st.markdown("### Player Profile Types")
-    st.markdown("Understand the three distinct player profiles in our analysis")
+    if tab2.open:
+        st.markdown("### Player Profile Types")
+        st.markdown("Understand the three distinct player profiles in our analysis")
     
-    # Profile Summary Info Cards
-    st.markdown("""
+        # Profile Summary Info Cards
+        st.markdown("""
         <div style='margin: 2rem 0 1.5rem 0;'>
             <h2 style='font-size: 1.5rem; font-weight: 600; text-align: center; color: #2563eb;'>
                 Player Profile Summary
@@ -888,57 +2379,57 @@ with tab2:
         </div>
     """, unsafe_allow_html=True)
 
-    # Profile summary cards
-    profile_summary_cols = st.columns(3, gap="medium")
+        # Profile summary cards
+        profile_summary_cols = st.columns(3, gap="medium")
     
-    # Calculate most common archetype for each profile
-    def get_most_common_archetype(cluster_id):
-        cluster_data = df[df['Cluster'] == cluster_id]
-        if len(cluster_data) > 0 and 'Primary_Archetype' in cluster_data.columns:
-            archetype_counts = cluster_data['Primary_Archetype'].value_counts()
-            if len(archetype_counts) > 0:
-                return archetype_counts.index[0]
-        return 'N/A'
+        # Calculate most common archetype for each profile
+        def get_most_common_archetype(cluster_id):
+            cluster_data = df[df['Cluster'] == cluster_id]
+            if len(cluster_data) > 0 and 'Primary_Archetype' in cluster_data.columns:
+                archetype_counts = cluster_data['Primary_Archetype'].value_counts()
+                if len(archetype_counts) > 0:
+                    return archetype_counts.index[0]
+            return 'N/A'
     
-    profile_summaries = [
-        {
-            'id': 0,
-            'name': 'Elite Creative Attacking Players',
-            'color': '#1E88E5',
-            'description': 'Elite-level players with highest creativity and goal contribution. Young stars from big clubs with superior technical quality.',
-            'key_traits': ['Goals & Assists', 'Creativity', 'Technical Quality'],
-            'player_count': len(df[df['Cluster'] == 0]),
-            'avg_age': df[df['Cluster'] == 0]['Age'].mean() if len(df[df['Cluster'] == 0]) > 0 else 0,
-            'top_teams': ['Ajax', 'PSV', 'Go Ahead Eagle', 'NAC Breda', 'Twente'],
-            'most_common_archetype': get_most_common_archetype(0)
-        },
-        {
-            'id': 1,
-            'name': 'Developing Players',
-            'color': '#43A047',
-            'description': 'Players in development phase with basic passing abilities. High growth potential for the future with young age.',
-            'key_traits': ['Basic Passing', 'Young Age', 'Development Phase'],
-            'player_count': len(df[df['Cluster'] == 1]),
-            'avg_age': df[df['Cluster'] == 1]['Age'].mean() if len(df[df['Cluster'] == 1]) > 0 else 0,
-            'top_teams': ['Groningen', 'Utrecht', 'Sparta R\'dam', 'Feyenoord', 'Ajax'],
-            'most_common_archetype': get_most_common_archetype(1)
-        },
-        {
-            'id': 2,
-            'name': 'Defensive Engines',
-            'color': '#FB8C00',
-            'description': 'Defensively-minded players who prioritize defensive duties. Strong in physical battles with high endurance.',
-            'key_traits': ['Defense', 'Ball Recovery', 'Endurance'],
-            'player_count': len(df[df['Cluster'] == 2]),
-            'avg_age': df[df['Cluster'] == 2]['Age'].mean() if len(df[df['Cluster'] == 2]) > 0 else 0,
-            'top_teams': ['Go Ahead Eagle', 'NEC Nijmegen', 'Zwolle', 'Utrecht', 'Heerenveen'],
-            'most_common_archetype': get_most_common_archetype(2)
-        }
-    ]
+        profile_summaries = [
+            {
+                'id': 0,
+                'name': 'Elite Creative Attacking Players',
+                'color': '#1E88E5',
+                'description': 'Elite-level players with highest creativity and goal contribution. Young stars from big clubs with superior technical quality.',
+                'key_traits': ['Goals & Assists', 'Creativity', 'Technical Quality'],
+                'player_count': cluster_stats.get(0, {}).get('total_players', 0),
+                'avg_age': cluster_stats.get(0, {}).get('avg_age', 0),
+                'top_teams': cluster_stats.get(0, {}).get('top_teams', []),
+                'most_common_archetype': get_most_common_archetype(0)
+            },
+            {
+                'id': 1,
+                'name': 'Developing Players',
+                'color': '#43A047',
+                'description': 'Players in development phase with basic passing abilities. High growth potential for the future with young age.',
+                'key_traits': ['Basic Passing', 'Young Age', 'Development Phase'],
+                'player_count': cluster_stats.get(1, {}).get('total_players', 0),
+                'avg_age': cluster_stats.get(1, {}).get('avg_age', 0),
+                'top_teams': cluster_stats.get(1, {}).get('top_teams', []),
+                'most_common_archetype': get_most_common_archetype(1)
+            },
+            {
+                'id': 2,
+                'name': 'Defensive Engines',
+                'color': '#FB8C00',
+                'description': 'Defensively-minded players who prioritize defensive duties. Strong in physical battles with high endurance.',
+                'key_traits': ['Defense', 'Ball Recovery', 'Endurance'],
+                'player_count': cluster_stats.get(2, {}).get('total_players', 0),
+                'avg_age': cluster_stats.get(2, {}).get('avg_age', 0),
+                'top_teams': cluster_stats.get(2, {}).get('top_teams', []),
+                'most_common_archetype': get_most_common_archetype(2)
+            }
+        ]
     
-    for idx, profile in enumerate(profile_summaries):
-        with profile_summary_cols[idx]:
-            st.markdown(f"""
+        for idx, profile in enumerate(profile_summaries):
+            with profile_summary_cols[idx]:
+                st.markdown(f"""
                 <div style='background: #ffffff; border-radius: 8px; padding: 1.5rem; margin: 0.5rem 0;
                             border: 2px solid {profile['color']}; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
                     <div style='display: flex; align-items: center; margin-bottom: 1rem;'>
@@ -980,10 +2471,10 @@ with tab2:
                 </div>
             """, unsafe_allow_html=True)
     
-    st.markdown("---")
+        st.markdown("---")
     
-    # Archetype Info Cards Section
-    st.markdown("""
+        # Archetype Info Cards Section
+        st.markdown("""
         <div style='margin: 2rem 0 1.5rem 0;'>
             <h2 style='font-size: 1.5rem; font-weight: 600; text-align: center; color: #2563eb;'>
                 Player Archetypes Overview
@@ -994,59 +2485,59 @@ with tab2:
         </div>
     """, unsafe_allow_html=True)
     
-    # Archetype definitions and examples
-    archetype_info = {
-        'Anchor': {
-            'name': 'Anchor (Defensive Midfielder)',
-            'description': 'Plays in front of the defensive line, maintains team defensive balance. Physical player who wins the ball, makes simple passes, avoids risk.',
-            'key_metrics': ['Tkl+Int', 'Blocks', 'Recoveries'],
-            'example_players': ['Max Balard (<span style="color: #ff6600;">NAC Breda</span>)', 'Alonzo Engwanda (<span style="color: #ff6600;">Utrecht</span>)', 'Amine Lachkar (<span style="color: #ff6600;">Willem II</span>)']
-        },
-        'DLP': {
-            'name': 'Deep Lying Playmaker (DLP)',
-            'description': 'Initiates play from defensive areas, builds attacks with long passes. Technical player with high pass success rate, wide vision, progressive passing.',
-            'key_metrics': ['Pass Success', 'Prog Distance', 'Prog Passes'],
-            'example_players': ['Ringo Meerveld (<span style="color: #ff6600;">Willem II</span>)', 'Dirk Proper (<span style="color: #ff0000;">NEC Nijmegen</span>)', 'Ryan Fosso (<span style="color: #ff6600;">Fortuna Sittard</span>)']
-        },
-        'BallWinner': {
-            'name': 'Ball Winner (Ball Winner)',
-            'description': 'Expert in winning the ball in midfield, high physical strength, aggressive player. High tackle and interception numbers, effective in ball recovery.',
-            'key_metrics': ['Tkl+Int', 'Tkl Won', 'Recoveries'],
-            'example_players': ['Enric Llansana (<span style="color: #0066cc;">Go Ahead Eagle</span>)', 'Paxten Aaronson (<span style="color: #ff6600;">Utrecht</span>)', 'Espen van Ee (<span style="color: #0066cc;">Heerenveen</span>)']
-        },
-        'BoxToBox': {
-            'name': 'Box to Box (Box to Box)',
-            'description': 'Performs both defensive and offensive duties, effective everywhere on the pitch, high endurance player.',
-            'key_metrics': ['Prog Runs', 'Recoveries', 'Prog Distance'],
-            'example_players': ['Antoni Milambo (<span style="color: #ff6600;">Feyenoord</span>)', 'Jorg Schreuders (<span style="color: #0066cc;">Groningen</span>)', 'Malik Tillman (<span style="color: #ff6600;">PSV</span>)']
-        },
-        'APM': {
-            'name': 'Advanced Playmaker (APM)',
-            'description': 'High creativity and technical abilities, expert in creating goals, effective in final passes and key passes.',
-            'key_metrics': ['Key Passes', 'xAG', 'GCA Pass'],
-            'example_players': ['Kenneth Taylor (<span style="color: #d2122e;">Ajax</span>)', 'Levi Smans (<span style="color: #0066cc;">Heerenveen</span>)', 'Luciano Valente (<span style="color: #0066cc;">Groningen</span>)']
-        },
-        'Mezzala': {
-            'name': 'Mezzala (Half-space Playmaker)',
-            'description': 'Creative midfielder occupying the half-spaces, links midfield to attack with progressive carries and final-third combinations; arrives late into the box.',
-            'key_metrics': ['Passes into Final Third', 'Carries into Penalty Area', 'xAG'],
-            'example_players': ['Ismael Saibari (<span style="color: #ff6600;">PSV</span>)', 'Jorg Schreuders (<span style="color: #0066cc;">Groningen</span>)', 'Mohammed Ihattaren (<span style="color: #ff0000;">RKC Waalwijk</span>)']
-        },
-        'ShadowStriker': {
-            'name': 'Shadow Striker (Second Striker)',
-            'description': 'Attacking-minded midfielder attacking the box aggressively; prioritizes shot volume and goal threat with striker-like instincts from deeper positions.',
-            'key_metrics': ['xG', 'Shots', 'Goals'],
-            'example_players': ['Ismael Saibari (<span style="color: #ff6600;">PSV</span>)', 'Leo Sauer (<span style="color: #ff6600;">NAC Breda</span>)', 'Sem Steijn (<span style="color: #ff0000;">Twente</span>)']
+        # Archetype definitions and examples
+        archetype_info = {
+            'Anchor': {
+                'name': 'Anchor (Defensive Midfielder)',
+                'description': 'Plays in front of the defensive line, maintains team defensive balance. Physical player who wins the ball, makes simple passes, avoids risk.',
+                'key_metrics': ['Tkl+Int', 'Blocks', 'Recoveries'],
+                'example_players': ['Max Balard (<span style="color: #ff6600;">NAC Breda</span>)', 'Alonzo Engwanda (<span style="color: #ff6600;">Utrecht</span>)', 'Amine Lachkar (<span style="color: #ff6600;">Willem II</span>)']
+            },
+            'DLP': {
+                'name': 'Deep Lying Playmaker (DLP)',
+                'description': 'Initiates play from defensive areas, builds attacks with long passes. Technical player with high pass success rate, wide vision, progressive passing.',
+                'key_metrics': ['Pass Success', 'Prog Distance', 'Prog Passes'],
+                'example_players': ['Ringo Meerveld (<span style="color: #ff6600;">Willem II</span>)', 'Dirk Proper (<span style="color: #ff0000;">NEC Nijmegen</span>)', 'Ryan Fosso (<span style="color: #ff6600;">Fortuna Sittard</span>)']
+            },
+            'BallWinner': {
+                'name': 'Ball Winner (Ball Winner)',
+                'description': 'Expert in winning the ball in midfield, high physical strength, aggressive player. High tackle and interception numbers, effective in ball recovery.',
+                'key_metrics': ['Tkl+Int', 'Tkl Won', 'Recoveries'],
+                'example_players': ['Enric Llansana (<span style="color: #0066cc;">Go Ahead Eagle</span>)', 'Paxten Aaronson (<span style="color: #ff6600;">Utrecht</span>)', 'Espen van Ee (<span style="color: #0066cc;">Heerenveen</span>)']
+            },
+            'BoxToBox': {
+                'name': 'Box to Box (Box to Box)',
+                'description': 'Performs both defensive and offensive duties, effective everywhere on the pitch, high endurance player.',
+                'key_metrics': ['Prog Runs', 'Recoveries', 'Prog Distance'],
+                'example_players': ['Antoni Milambo (<span style="color: #ff6600;">Feyenoord</span>)', 'Jorg Schreuders (<span style="color: #0066cc;">Groningen</span>)', 'Malik Tillman (<span style="color: #ff6600;">PSV</span>)']
+            },
+            'APM': {
+                'name': 'Advanced Playmaker (APM)',
+                'description': 'High creativity and technical abilities, expert in creating goals, effective in final passes and key passes.',
+                'key_metrics': ['Key Passes', 'xAG', 'GCA Pass'],
+                'example_players': ['Kenneth Taylor (<span style="color: #d2122e;">Ajax</span>)', 'Levi Smans (<span style="color: #0066cc;">Heerenveen</span>)', 'Luciano Valente (<span style="color: #0066cc;">Groningen</span>)']
+            },
+            'Mezzala': {
+                'name': 'Mezzala (Half-space Playmaker)',
+                'description': 'Creative midfielder occupying the half-spaces, links midfield to attack with progressive carries and final-third combinations; arrives late into the box.',
+                'key_metrics': ['Passes into Final Third', 'Carries into Penalty Area', 'xAG'],
+                'example_players': ['Ismael Saibari (<span style="color: #ff6600;">PSV</span>)', 'Jorg Schreuders (<span style="color: #0066cc;">Groningen</span>)', 'Mohammed Ihattaren (<span style="color: #ff0000;">RKC Waalwijk</span>)']
+            },
+            'ShadowStriker': {
+                'name': 'Shadow Striker (Second Striker)',
+                'description': 'Attacking-minded midfielder attacking the box aggressively; prioritizes shot volume and goal threat with striker-like instincts from deeper positions.',
+                'key_metrics': ['xG', 'Shots', 'Goals'],
+                'example_players': ['Ismael Saibari (<span style="color: #ff6600;">PSV</span>)', 'Leo Sauer (<span style="color: #ff6600;">NAC Breda</span>)', 'Sem Steijn (<span style="color: #ff0000;">Twente</span>)']
+            }
         }
-    }
     
-    # Create archetype cards in a grid layout
-    archetype_cols = st.columns(2, gap="medium")
+        # Create archetype cards in a grid layout
+        archetype_cols = st.columns(2, gap="medium")
     
-    for idx, (archetype_key, archetype_data) in enumerate(archetype_info.items()):
-        col_idx = idx % 2
-        with archetype_cols[col_idx]:
-            st.markdown(f"""
+        for idx, (archetype_key, archetype_data) in enumerate(archetype_info.items()):
+            col_idx = idx % 2
+            with archetype_cols[col_idx]:
+                st.markdown(f"""
                 <div style='background: #ffffff; border-radius: 8px; padding: 1.5rem; margin: 0.5rem 0;
                             border: 1px solid #e9ecef; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
                     <div style='display: flex; align-items: center; margin-bottom: 1rem;'>
@@ -1072,11 +2563,11 @@ with tab2:
                 </div>
             """, unsafe_allow_html=True)
     
-    st.markdown("---")
+        st.markdown("---")
     
     
-    # Filtered Results Section with Modern Cards
-    st.markdown("""
+        # Filtered Results Section with Modern Cards
+        st.markdown("""
         <div style='text-align: center; margin: 2rem 0 1rem 0;'>
             <h2 style='font-size: 1.5rem; font-weight: 600; margin: 0; color: #2563eb;'>
                 Filtered Players
@@ -1087,25 +2578,25 @@ with tab2:
         </div>
     """, unsafe_allow_html=True)
 
-    col1, col2, col3 = st.columns(3, gap="medium")
-    with col1:
-        st.markdown(f"""
+        col1, col2, col3 = st.columns(3, gap="medium")
+        with col1:
+            st.markdown(f"""
             <div style='background: #ffffff; padding: 1.5rem 1rem; border-radius: 8px; text-align: center; 
                         border: 1px solid #e9ecef; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
                 <h2 style='color: #2563eb; margin: 0; font-size: 2rem; font-weight: 700;'>{len(df_filtered)}</h2>
                 <p style='color: #6c757d; margin: 0.5rem 0 0 0; font-size: 0.9rem; font-weight: 500;'>TOTAL PLAYERS</p>
             </div>
         """, unsafe_allow_html=True)
-    with col2:
-        st.markdown(f"""
+        with col2:
+            st.markdown(f"""
             <div style='background: #ffffff; padding: 1.5rem 1rem; border-radius: 8px; text-align: center; 
                         border: 1px solid #e9ecef; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
                 <h2 style='color: #2563eb; margin: 0; font-size: 2rem; font-weight: 700;'>{df_filtered['Age'].mean():.1f}</h2>
                 <p style='color: #6c757d; margin: 0.5rem 0 0 0; font-size: 0.9rem; font-weight: 500;'>AVERAGE AGE</p>
             </div>
         """, unsafe_allow_html=True)
-    with col3:
-        st.markdown(f"""
+        with col3:
+            st.markdown(f"""
             <div style='background: #ffffff; padding: 1.5rem 1rem; border-radius: 8px; text-align: center; 
                         border: 1px solid #e9ecef; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
                 <h2 style='color: #2563eb; margin: 0; font-size: 2rem; font-weight: 700;'>{df_filtered['std_Min'].mean():.0f}</h2>
@@ -1113,7 +2604,7 @@ with tab2:
             </div>
         """, unsafe_allow_html=True)
 
-    st.markdown("""
+        st.markdown("""
         <div style='text-align: center; margin: 2rem 0 1rem 0;'>
             <h2 style='font-size: 1.5rem; font-weight: 600; margin: 0; color: #2563eb;'>
                 View Detailed Player Data
@@ -1123,58 +2614,52 @@ with tab2:
             </p>
         </div>
     """, unsafe_allow_html=True)
-    st.dataframe(df_filtered, use_container_width=True, height=400)
+        st.dataframe(df_filtered, use_container_width=True, height=400)
 
-    st.markdown("---")
+        st.markdown("---")
     
-    # Column Descriptions Section
-    with st.expander("Column Descriptions (Click to expand)", expanded=False):
-        # Create columns for better layout
-        col1, col2, col3 = st.columns(3, gap="medium")
-        
-        # Split column_info into 3 parts
-        items = list(column_info.items())
-        chunk_size = len(items) // 3
-        remainder = len(items) % 3
-        
-        # Distribute items across columns
-        start = 0
-        for i, col in enumerate([col1, col2, col3]):
-            if i < remainder:
-                end = start + chunk_size + 1
-            else:
-                end = start + chunk_size
+        # Column Descriptions Section
+        with st.expander("Column Descriptions (Click to expand)", expanded=False):
+            # Create columns for better layout
+            col1, col2, col3 = st.columns(3, gap="medium")
+        
+            # Split column_info into 3 parts
+            items = list(column_info.items())
+            chunk_size = len(items) // 3
+            remainder = len(items) % 3
+        
+            # Distribute items across columns
+            start = 0
+            for i, col in enumerate([col1, col2, col3]):
+                if i < remainder:
+                    end = start + chunk_size + 1
+                else:
+                    end = start + chunk_size
             
-            with col:
-                for col_name, desc in items[start:end]:
-                    st.markdown(f"**{col_name}**: {desc}", unsafe_allow_html=True)
+                with col:
+                    for col_name, desc in items[start:end]:
+                        st.markdown(f"**{col_name}**: {desc}", unsafe_allow_html=True)
             
-            start = end
+                start = end
 
 with tab3:
-    st.markdown("### Top 5 Players by Profile")
-    st.markdown("Discover the best performers in each player profile category")
+    if tab3.open:
+        st.markdown("### Top 5 Players by Profile")
+        st.markdown("Discover the best performers in each player profile category")
     
-    # Metric sets suitable for cluster profiles (New 3 Clusters)
-    cluster_metrics_map = {
-        0: ['std_Gls','std_Ast','std_xG','std_xAG','pass_KP','shoot_Sh','gca_PassLive'],      # Super Stars: goals + assists + creativity + shots
-        1: ['std_Min','pass_Cmp%','pt_Min%','misc_Won','std_MP'],                           # Developing: playing time + basic passing + duels
-        2: ['def_Tkl','def_TklW','def_Int','def_Blocks','misc_Recov','misc_TklW','poss_PrgDist'] # Hard Workers: defense + ball recovery + physical power
-    }
-
-    # Calculate according to current filters
-    df_rank = df_filtered.copy()
-
-    for cid, metrics in cluster_metrics_map.items():
-        # Modern Profile Cards with Gradients
-        profile_gradients = {
-            0: 'linear-gradient(135deg, #FF6600 0%, #FF8533 100%)',
-            1: 'linear-gradient(135deg, #FFA500 0%, #FFB84D 100%)',
-            2: 'linear-gradient(135deg, #FF8533 0%, #FFA64D 100%)'
-        }
-        profile_icons = {0: '', 1: '', 2: ''}
+        # Rankings for the current filters (scores scaled over the filtered players), cached per filter state
+        rankings = top_players_cache.get(filtered_positions)
+
+        for cid, metrics in CLUSTER_RATING_METRICS.items():
+            # Modern Profile Cards with Gradients
+            profile_gradients = {
+                0: 'linear-gradient(135deg, #FF6600 0%, #FF8533 100%)',
+                1: 'linear-gradient(135deg, #FFA500 0%, #FFB84D 100%)',
+                2: 'linear-gradient(135deg, #FF8533 0%, #FFA64D 100%)'
+            }
+            profile_icons = {0: '', 1: '', 2: ''}
         
-        st.markdown(f"""
+            st.markdown(f"""
             <div style='background: #ffffff; padding: 1.5rem; border-radius: 8px; margin: 1.5rem 0;
                         border: 1px solid #e9ecef; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>
                 <h2 style='color: #2563eb; margin: 0; font-size: 1.3rem; font-weight: 600;'>
@@ -1183,297 +2668,75 @@ with tab3:
             </div>
         """, unsafe_allow_html=True)
         
-        # Calculate cluster statistics from real data
-        cluster_data = df[df['Cluster'] == cid]
+            # Calculate cluster statistics from real data
+            cluster_data = df[df['Cluster'] == cid]
         
-        st.info(f"**Playing Style**: {cluster_profiles[cid]['detailed_stats'].get('playing_style', 'General midfield players')}")
-
-        # Is this player profile available in selected filter?
-        if cid not in df_rank["Cluster"].unique():
-            st.info("No players found in this player profile matching filtering criteria.")
-            continue
+            st.info(f"**Playing Style**: {cluster_profiles[cid]['detailed_stats'].get('playing_style', 'General midfield players')}")
 
-        # Only available metrics
-        available_metrics = [m for m in metrics if m in df_rank.columns]
-        if not available_metrics:
-            st.warning("No valid metrics found for this player profile.")
-            continue
-
-        # Normalization
-        scaler_rank = MinMaxScaler()
-        scaled_vals = scaler_rank.fit_transform(df_rank[available_metrics])
-        score = scaled_vals.mean(axis=1)  # Equal weight: you can add weighting if desired
+            # Is this player profile available in selected filter?
+            if cid not in rankings['profiles']:
+                st.info("No players found in this player profile matching filtering criteria.")
+                continue
 
-        # Score series
-        df_rank[f"Cluster{cid}_Score"] = score
+            # Only available metrics
+            available_metrics = [m for m in metrics if m in df.columns]
+            if not available_metrics:
+                st.warning("No valid metrics found for this player profile.")
+                continue
 
-        # Top 5 in this cluster
-        top_players = df_rank[df_rank["Cluster"] == cid].nlargest(5, f"Cluster{cid}_Score")
+            # Top 5 in this cluster
+            top_positions, top_scores = rankings['profiles'][cid]
 
-        # Player Report Cards - Minimal Design
-        st.markdown("### Player Report")
-        st.markdown("---")
+            # Player Report Cards - Minimal Design
+            st.markdown("### Player Report")
+            st.markdown("---")
         
-        # Create player cards in rows (3 cards per row for compact view)
-        for idx in range(0, len(top_players), 3):
-            cols = st.columns(3, gap="medium")
+            # Create player cards in rows (3 cards per row for compact view)
+            for idx in range(0, len(top_positions), 3):
+                cols = st.columns(3, gap="medium")
             
-            for col_idx, col in enumerate(cols):
-                player_idx = idx + col_idx
-                if player_idx < len(top_players):
-                    player = top_players.iloc[player_idx]
-                    
-                    # Get archetype info
-                    primary_archetype = player.get('Primary_Archetype', 'N/A')
-                    archetype_score = player.get('Archetype_Score', 0)
-                    
-                    # Border colors based on cluster
-                    border_colors = {0: '#1E88E5', 1: '#43A047', 2: '#FB8C00'}
-                    score_value = player[f"Cluster{cid}_Score"] * 100
-                    
-                    with col:
-                        
-                        # Minimal card with border
-                        st.markdown(f"""
-                            <div class='player-card' style='border: 2px solid {border_colors.get(cid, border_colors[0])};
-                                        border-radius: 10px; padding: 1rem; 
-                                        background: white; box-shadow: 0 2px 8px rgba(0,0,0,0.1);'>
-                                <div style='text-align: center;'>
-                                    <div style='color: {border_colors.get(cid, border_colors[0])}; 
-                                                font-size: 0.8rem; font-weight: 600;'>
-                                        #{player_idx + 1}
-                                    </div>
-                                    <h4 style='margin: 0.3rem 0; color: #333; font-size: 1.1rem; background: linear-gradient(135deg, {get_profile_color(cid)}15, {get_profile_color(cid)}08); padding: 0.3rem 0.5rem; border-radius: 4px;'>
-                                        {player['Player']}
-                                    </h4>
-                                    <p style='margin: 0; color: {get_team_color(player['Squad'])}; font-size: 0.85rem; background: linear-gradient(135deg, {get_profile_color(cid)}12, {get_profile_color(cid)}05); padding: 0.2rem 0.5rem; border-radius: 4px; font-weight: 600;'>
-                                        {player['Squad']}
-                                    </p>
-                                </div>
-                            </div>
-                        """, unsafe_allow_html=True)
-                        
-                        # Compact info grid
-                        st.markdown(f"""
-                            <div style='display: grid; grid-template-columns: 1fr 1fr; gap: 0.5rem; 
-                                        margin-top: 0.8rem; font-size: 0.85rem;'>
-                                <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px;'>
-                                    <div style='color: #888; font-size: 0.7rem;'>Nation</div>
-                                    <div style='font-weight: 600; color: #333;'>{player.get('Nation', 'N/A')}</div>
-                                </div>
-                                <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px;'>
-                                    <div style='color: #888; font-size: 0.7rem;'>Age</div>
-                                    <div style='font-weight: 600; color: #333;'>{player['Age']:.0f}</div>
-                                </div>
-                                <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px; grid-column: span 2;'>
-                                    <div style='color: #888; font-size: 0.7rem;'>Profile</div>
-                                    <div style='font-weight: 600; color: {border_colors.get(cid, border_colors[0])}; font-size: 0.75rem;'>
-                                        {cid}: {cluster_profiles[cid]['name']}
-                                    </div>
-                                </div>
-                                <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px; grid-column: span 2;'>
-                                    <div style='color: #888; font-size: 0.7rem;'>Overall Rating</div>
-                                    <div style='font-weight: 600; color: {get_rating_color(score_value)};'>
-                                        {score_value:.1f}
-                                    </div>
-                                </div>
-                            </div>
-                        """, unsafe_allow_html=True)
-                        
-                        
-                        # Archetype section + Secondary (if exists)
-                        secondary_arch = player.get('Secondary_Archetype', None)
-                        secondary_score_val = player.get('Secondary_Archetype_Score', None)
-                        secondary_html = ""
-                        if isinstance(secondary_arch, str) and len(secondary_arch.strip()) > 0 and secondary_arch != 'N/A':
-                            secondary_color = get_archetype_color(secondary_arch)
-                            # Güvenli sayı formatlama
-                            try:
-                                sec_score_txt = f", {float(secondary_score_val):.0f}" if secondary_score_val is not None and not pd.isna(secondary_score_val) else ""
-                            except Exception:
-                                sec_score_txt = ""
-                            secondary_html = f"<div style='color: #6b7280; font-size: 0.72rem; font-weight: 500; margin-top: 0.4rem;'>Secondary: <span style='color: {secondary_color}; font-weight: 700;'>{secondary_arch}</span>{sec_score_txt}</div>"
-
-                        st.markdown(
-                            f"""
-                            <div style='margin-top: 0.8rem; padding: 0.6rem; 
-                                        background: linear-gradient(135deg, {get_archetype_color(primary_archetype)}15, {get_archetype_color(primary_archetype)}05);
-                                        border-radius: 5px; text-align: center; min-height: 120px;'>
-                                <div style='color: #6b7280; font-size: 0.75rem; font-weight: 500; margin-bottom: 0.4rem; border-bottom: 1px solid #e5e7eb; padding-bottom: 0.2rem; display: inline-block;'>
-                                    Archetype
-                                </div>
-                                <div style='font-weight: 700; color: {get_archetype_color(primary_archetype)}; 
-                                            font-size: 0.95rem;'>
-                                    {primary_archetype}
-                                </div>
-                                <div style='color: #666; font-size: 0.75rem; margin-top: 0.2rem;'>
-                                   Archetype Score: {archetype_score:.0f}
-                                </div>
-                            """ + secondary_html + f"""
-                            </div>
-                            """,
-                            unsafe_allow_html=True,
-                        )
-                        
-                        # Performance stats - Dynamic based on archetype
-                        archetype = str(primary_archetype).strip()
-                        if archetype == 'Anchor':
-                            metric1_label, metric1_value = "Tkl+Int", player['def_Tkl+Int']
-                            metric2_label, metric2_value = "Blocks", player['def_Blocks']
-                            metric3_label, metric3_value = "Recoveries", player['misc_Recov']
-                        elif archetype == 'DLP':
-                            metric1_label, metric1_value = "Pass Success", player['pass_Cmp%']
-                            metric2_label, metric2_value = "Prog Distance", player['pass_PrgDist']
-                            metric3_label, metric3_value = "Prog Passes", player['pass_PrgP']
-                        elif archetype == 'BallWinner':
-                            metric1_label, metric1_value = "Tkl+Int", player['def_Tkl+Int']
-                            metric2_label, metric2_value = "Tkl Won", player['def_TklW']
-                            metric3_label, metric3_value = "Recoveries", player['misc_Recov']
-                        elif archetype == 'BoxToBox':
-                            metric1_label, metric1_value = "Prog Runs", player['std_PrgR']
-                            metric2_label, metric2_value = "Recoveries", player['misc_Recov']
-                            metric3_label, metric3_value = "Prog Distance", player['poss_PrgDist']
-                        elif archetype == 'APM':
-                            metric1_label, metric1_value = "Key Passes", player['pass_KP']
-                            metric2_label, metric2_value = "xAG", player['std_xAG']
-                            metric3_label, metric3_value = "GCA Pass", player['gca_PassLive']
-                        elif archetype == 'Mezzala':
-                            metric1_label, metric1_value = "Final 3rd", player['poss_1/3']
-                            metric2_label, metric2_value = "Pen Area", player['poss_CPA']
-                            metric3_label, metric3_value = "xAG", player['std_xAG']
-                        elif archetype == 'ShadowStriker':
-                            metric1_label, metric1_value = "xG", player['std_xG']
-                            metric2_label, metric2_value = "Shots", player['shoot_Sh']
-                            metric3_label, metric3_value = "Goals", player['std_Gls']
-                        else:  # Default/fallback metrics
-                            metric1_label, metric1_value = "Minutes", player['std_Min']
-                            metric2_label, metric2_value = "Pass Success", player['pass_Cmp%']
-                            metric3_label, metric3_value = "Matches", player['std_MP']
-                        
-                        
-                        
-                        st.markdown(f"""
-                            <div style='margin-top: 0.8rem; padding: 0.6rem; background: #f9f9f9; border-radius: 5px;'>
-                                <div style='display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 0.3rem; font-size: 0.75rem; text-align: center;'>
-                                    <div>
-                                        <div style='color: #888; font-size: 0.65rem;'>{metric1_label}</div>
-                                        <div style='font-weight: 600; color: {get_score_color(metric1_value, archetype)};'>{metric1_value:.0f}</div>
-                                    </div>
-                                    <div>
-                                        <div style='color: #888; font-size: 0.65rem;'>{metric2_label}</div>
-                                        <div style='font-weight: 600; color: {get_score_color(metric2_value, archetype)};'>{metric2_value:.0f}</div>
-                                    </div>
-                                    <div>
-                                        <div style='color: #888; font-size: 0.65rem;'>{metric3_label}</div>
-                                        <div style='font-weight: 600; color: {get_score_color(metric3_value, archetype)};'>{metric3_value:.0f}</div>
-                                    </div>
-                                </div>
-                            </div>
-                        """, unsafe_allow_html=True)
-                        
-                        st.markdown("<br>", unsafe_allow_html=True)
-        
-        st.divider()
-
-    # ---------------------------------
-    # Top 3 Players by Archetype (New)
-    # ---------------------------------
-    st.markdown("### Top 3 Players by Archetype")
-    st.markdown("Filtrelere göre her arketipin en iyi 3 oyuncusu")
+                for col_idx, col in enumerate(cols):
+                    player_idx = idx + col_idx
+                    if player_idx < len(top_positions):
+                        with col:
+                            card_renderer.show('profile', top_positions[player_idx], f"#{player_idx + 1}",
+                                               top_scores[player_idx] * 100)
+                            st.markdown("<br>", unsafe_allow_html=True)
+        
+            st.divider()
+
+        # ---------------------------------
+        # Top 3 Players by Archetype (New)
+        # ---------------------------------
+        st.markdown("### Top 3 Players by Archetype")
+        st.markdown("Filtrelere göre her arketipin en iyi 3 oyuncusu")
+
+        if 'Primary_Archetype' in df_filtered.columns:
+            archetypes = [
+                'Anchor','DLP','BallWinner','BoxToBox','APM','Mezzala','ShadowStriker'
+            ]
 
-    if 'Primary_Archetype' in df_filtered.columns:
-        archetypes = [
-            'Anchor','DLP','BallWinner','BoxToBox','APM','Mezzala','ShadowStriker'
-        ]
+            for arch in archetypes:
+                if arch not in rankings['archetypes']:
+                    continue
 
-        for arch in archetypes:
-            arch_df = df_filtered[df_filtered['Primary_Archetype'] == arch]
-            if arch_df.empty:
-                continue
+                arch_positions = rankings['archetypes'][arch]
 
-            score_col = 'Archetype_Score' if 'Archetype_Score' in arch_df.columns else None
-            if score_col:
-                arch_top = arch_df.sort_values(score_col, ascending=False).head(3)
-            else:
-                arch_top = arch_df.sort_values('std_Min', ascending=False).head(3)
-
-            st.markdown(f"#### {arch} - Top 3")
-            cols = st.columns(3, gap="medium")
-            for i in range(3):
-                if i < len(arch_top):
-                    player = arch_top.iloc[i]
-                    with cols[i]:
-                        # Ensure cluster_id_int exists before using in card styles
-                        cluster_id = player.get('Cluster', None)
-                        try:
-                            cluster_id_int = int(cluster_id) if cluster_id is not None and not pd.isna(cluster_id) else None
-                        except Exception:
-                            cluster_id_int = None
-                        card_color = get_profile_color(cluster_id_int) if cluster_id_int is not None else '#6b7280'
-                        archetype_color = get_archetype_color(arch)
-                        player_name = player.get('Player','N/A')
-                        squad = player.get('Squad','N/A')
-                        age = player.get('Age', np.nan)
-                        score_val = float(player.get(score_col, 0)) if score_col else float(player.get('std_Min', 0))
-
-                        st.markdown(f"""
-                            <div class='player-card' style='border: 2px solid {card_color};
-                                        border-radius: 10px; padding: 1rem; 
-                                        background: white; box-shadow: 0 2px 8px rgba(0,0,0,0.1);'>
-                                <div style='text-align: center;'>
-                                    <div style='color: {card_color}; font-size: 0.8rem; font-weight: 600;'>
-                                        #{i + 1}
-                                    </div>
-                                    <h4 style='margin: 0.3rem 0; color: #333; font-size: 1.1rem; background: linear-gradient(135deg, {card_color}15, {card_color}08); padding: 0.3rem 0.5rem; border-radius: 4px;'>
-                                        {player_name}
-                                    </h4>
-                                    <p style='margin: 0; color: {get_team_color(squad)}; font-size: 0.85rem; background: linear-gradient(135deg, {card_color}12, {card_color}05); padding: 0.2rem 0.5rem; border-radius: 4px; font-weight: 600;'>
-                                        {squad}
-                                    </p>
-                                </div>
-                            </div>
-                        """, unsafe_allow_html=True)
-
-                        age_display = 'N/A' if pd.isna(age) else f"{age:.0f}"
-                        cluster_id = player.get('Cluster', None)
-                        try:
-                            cluster_id_int = int(cluster_id) if cluster_id is not None and not pd.isna(cluster_id) else None
-                        except Exception:
-                            cluster_id_int = None
-                        profile_name = cluster_profiles.get(cluster_id_int, {}).get('name', 'N/A') if cluster_id_int is not None else 'N/A'
-                        profile_color = get_profile_color(cluster_id_int) if cluster_id_int is not None else '#6b7280'
-
-                        st.markdown(f"""
-                            <div style='display: grid; grid-template-columns: 1fr 1fr; gap: 0.5rem; 
-                                        margin-top: 0.8rem; font-size: 0.85rem;'>
-                                <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px;'>
-                                    <div style='color: #888; font-size: 0.7rem;'>Archetype</div>
-                                    <div style='font-weight: 600; color: {archetype_color};'>{arch}</div>
-                                </div>
-                                <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px;'>
-                                    <div style='color: #888; font-size: 0.7rem;'>Age</div>
-                                    <div style='font-weight: 600; color: #333;'>{age_display}</div>
-                                </div>
-                                <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px; grid-column: span 2;'>
-                                    <div style='color: #888; font-size: 0.7rem;'>Profile</div>
-                                    <div style='font-weight: 600; color: {profile_color};'>{'' if cluster_id_int is None else cluster_id_int}: {profile_name}</div>
-                                </div>
-                                <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px; grid-column: span 2;'>
-                                    <div style='color: #888; font-size: 0.7rem;'>{'Archetype Score' if score_col else 'Minutes'}</div>
-                                    <div style='font-weight: 600; color: {get_rating_color(score_val if score_col else min(score_val/20, 100))};'>
-                                        {score_val:.1f}
-                                    </div>
-                                </div>
-                            </div>
-                        """, unsafe_allow_html=True)
+                st.markdown(f"#### {arch} - Top 3")
+                cols = st.columns(3, gap="medium")
+                for i in range(3):
+                    if i < len(arch_positions):
+                        with cols[i]:
+                            card_renderer.show('archetype', arch_positions[i], f"#{i + 1}")
 
 with tab4:
-    st.markdown("### Player Analysis & Comparison")
-    st.markdown("Deep dive into individual player performance with radar charts and similarity analysis")
+    if tab4.open:
+        st.markdown("### Player Analysis & Comparison")
+        st.markdown("Deep dive into individual player performance with radar charts and similarity analysis")
     
-    # Instructions box
-    with st.expander("How to use this section (Click to expand)", expanded=False):
-        st.markdown("""
+        # Instructions box
+        with st.expander("How to use this section (Click to expand)", expanded=False):
+            st.markdown("""
         **Steps:**
         1. Select one or more players from the dropdown below
         2. View their performance radar charts across multiple categories
@@ -1487,338 +2750,432 @@ with tab4:
         - Use sidebar filters to narrow down player selection
         """)
 
-    st.markdown("---")
+        st.markdown("---")
 
-    # Initial radar metrics
-    radar_metrics = ['std_MP','std_Min','std_90s','std_Gls','std_Ast','std_xG','std_xAG','misc_Fls','std_CrdY','std_CrdR']
+        # Initial radar metrics
+        radar_metrics = ['std_MP','std_Min','std_90s','std_Gls','std_Ast','std_xG','std_xAG','misc_Fls','std_CrdY','std_CrdR']
+
+        st.markdown("<h3 style='margin: 0 0 1rem 0; font-size: 1.3rem;'>Select Players for Analysis</h3>", unsafe_allow_html=True)
+
+        @st.fragment
+        def render_metric_scatter(selected_players, player_colors):
+            """X/Y metric scatter of the selected players; changing an axis reruns only this section."""
+            # Metrik seçimi için dropdown'lar
+            available_metrics = {
+                'pass_PrgP': 'Progressive Passes',
+                'poss_PrgC': 'Progressive Carries', 
+                'std_xAG': 'Expected Assists (xAG)',
+                'std_xG': 'Expected Goals (xG)',
+                'def_Tkl': 'Tackles',
+                'def_Int': 'Interceptions',
+                'pass_KP': 'Key Passes',
+                'shoot_Sh': 'Total Shots',
+                'misc_Recov': 'Ball Recoveries',
+                'pass_1/3': 'Passes into Final Third',
+                'passt_Sw': 'Switches',
+                'pass_Cmp%': 'Pass Completion %',
+                'def_Tkl+Int': 'Defensive Actions',
+                'gca_TO': 'Successful Dribbles leading to Goal Chance',
+            }
 
-    st.markdown("<h3 style='margin: 0 0 1rem 0; font-size: 1.3rem;'>Select Players for Analysis</h3>", unsafe_allow_html=True)
-    player_select = st.multiselect(
-        "Choose one or more players", 
-        df["Player"].unique(), 
-        default=[], 
-        key="player_select",
-        help="You can select multiple players for comparison"
-    )
+            col_x, col_y = st.columns(2, gap="medium")
+            with col_x:
+                x_metric = st.selectbox(
+                    "X Axis Metric",
+                    options=list(available_metrics.keys()),
+                    format_func=lambda x: available_metrics[x],
+                    index=0,
+                    help="Select metric for X axis"
+                )
+            with col_y:
+                y_metric = st.selectbox(
+                    "Y Axis Metric", 
+                    options=list(available_metrics.keys()),
+                    format_func=lambda x: available_metrics[x],
+                    index=2,
+                    help="Select metric for Y axis"
+                )
 
-    def update_player_view(selected_players):
-        if not selected_players:
-            st.info("Please select the player(s) you want to analyze.")
-            return
+            if selected_players and x_metric in df.columns and y_metric in df.columns:
+                scatter_key = figure_cache.key('scatter', selected_players, (x_metric, y_metric))
+                fig_scatter = figure_cache.get(scatter_key)
+                if fig_scatter is None:
+                    # Seçilen oyuncular ve diğer oyuncular
+                    selected_mask = np.zeros(len(df), dtype=bool)
+                    selected_mask[player_index.positions_of(selected_players)] = True
+                    selected_df = df[selected_mask].copy()
+                    other_df = df[~selected_mask].copy()
             
-        # Get data of selected players
-        selected_rows = df[df["Player"].isin(selected_players)]
-        if selected_rows.empty:
-            st.warning("Selected players are outside filtering criteria.")
-            return
-
-        # Player Profile information of selected players
-        unique_clusters = selected_rows["Cluster"].unique()
-        
-        # ---------------------------
-        # Selected Players Profile Cards
-        # ---------------------------
-        st.markdown("###  Selected Player Cards")
-        st.markdown("<br>", unsafe_allow_html=True)
-        
-        # Calculate overall ratings for selected players
-        cluster_metrics_map_analysis = {
-            0: ['std_Gls','std_Ast','std_xG','std_xAG','pass_KP','shoot_Sh','gca_PassLive'],
-            1: ['std_Min','pass_Cmp%','pt_Min%','misc_Won','std_MP'],
-            2: ['def_Tkl','def_TklW','def_Int','def_Blocks','misc_Recov','misc_TklW','poss_PrgDist']
-        }
-        
-        # Create player cards in rows (3 cards per row for compact view)
-        for idx in range(0, len(selected_players), 3):
-            cols = st.columns(3, gap="medium")
+                    # Scatter plot oluştur
+                    fig_scatter = go.Figure()
             
-            for col_idx, col in enumerate(cols):
-                player_idx = idx + col_idx
-                if player_idx < len(selected_players):
-                    player_name = selected_players[player_idx]
-                    player = selected_rows[selected_rows["Player"] == player_name].iloc[0]
+                    # Diğer oyuncular (arka plan)
+                    if not other_df.empty:
+                        fig_scatter.add_trace(go.Scatter(
+                            x=other_df[x_metric],
+                            y=other_df[y_metric],
+                            mode='markers',
+                            name='Other Players',
+                            marker=dict(
+                                color='lightgray',
+                                size=8,
+                                opacity=0.6,
+                                line=dict(width=1, color='white')
+                            ),
+                            text=other_df['Player'],
+                            hovertemplate='<b>%{text}</b><br>' +
+                                         f'{available_metrics[x_metric]}: %{{x:.2f}}<br>' +
+                                         f'{available_metrics[y_metric]}: %{{y:.2f}}<br>' +
+                                         '<extra></extra>'
+                        ))
+            
+                    # Seçilen oyuncular (vurgulanmış) - Jitter ile üst üste gelme sorunu çözümü
+                    import random
+                    random.seed(42)  # Tutarlı jitter için
+                    # Renk eşlemesi: üstteki radar grafiklerde kullanılan palete uyumlu
+                    try:
+                        player_color_map = {name: player_colors[i % len(player_colors)] for i, name in enumerate(selected_players)}
+                    except Exception:
+                        # Fallback paleti
+                        _fallback_colors = ['#636EFA', '#EF553B', '#00CC96', '#AB63FA', '#FFA15A', '#19D3F3', '#FF6692', '#B6E880']
+                        player_color_map = {name: _fallback_colors[i % len(_fallback_colors)] for i, name in enumerate(selected_players)}
+            
+                    # Aynı pozisyondaki oyuncuları grupla
+                    position_groups = {}
+                    for player_name in selected_players:
+                        player_data = player_index.lookup(df, player_name)
+                        if not player_data.empty:
+                            player_row = player_data.iloc[0]
+                            x_val = player_row[x_metric]
+                            y_val = player_row[y_metric]
+                            pos_key = f"{x_val:.3f}_{y_val:.3f}"
                     
-                    # Get archetype info
-                    primary_archetype = player.get('Primary_Archetype', 'N/A')
-                    archetype_score = player.get('Archetype_Score', 0)
+                            if pos_key not in position_groups:
+                                position_groups[pos_key] = []
+                            position_groups[pos_key].append((player_name, player_row))
+            
+                    # Her pozisyon grubu için jitter uygula
+                    for pos_key, players_at_pos in position_groups.items():
+                        base_x, base_y = pos_key.split('_')
+                        base_x, base_y = float(base_x), float(base_y)
+                
+                        # Jitter miktarı (metrik değerlerine göre ayarlanmış)
+                        x_range = other_df[x_metric].max() - other_df[x_metric].min() if not other_df.empty else 1
+                        y_range = other_df[y_metric].max() - other_df[y_metric].min() if not other_df.empty else 1
+                        jitter_x = x_range * 0.02  # %2 jitter
+                        jitter_y = y_range * 0.02
+                
+                        for i, (player_name, player_row) in enumerate(players_at_pos):
+                            # Jitter hesapla (dairesel dağılım)
+                            if len(players_at_pos) > 1:
+                                angle = (2 * np.pi * i) / len(players_at_pos)
+                                jitter_offset_x = jitter_x * np.cos(angle)
+                                jitter_offset_y = jitter_y * np.sin(angle)
+                            else:
+                                jitter_offset_x = jitter_offset_y = 0
                     
-                    # Border colors based on cluster
-                    border_colors = {0: '#1E88E5', 1: '#43A047', 2: '#FB8C00'}
-                    cluster_id = player['Cluster']
+                            # Oyuncu rengi: radar paleti ile aynı sırada
+                            player_color = player_color_map.get(player_name, '#636EFA')
                     
-                    # Calculate overall rating for this player
-                    metrics_for_cluster = cluster_metrics_map_analysis.get(cluster_id, [])
-                    available_metrics = [m for m in metrics_for_cluster if m in df.columns]
-                    if available_metrics:
-                        scaler_rating = MinMaxScaler()
-                        scaled_vals = scaler_rating.fit_transform(df[available_metrics])
-                        player_idx_in_df = df[df['Player'] == player_name].index[0]
-                        player_position_in_filtered = df.index.get_loc(player_idx_in_df)
-                        overall_rating = scaled_vals[player_position_in_filtered].mean() * 100
-                    else:
-                        overall_rating = 0
+                            # Hover metni (çoklu oyuncu uyarısı)
+                            if len(players_at_pos) > 1:
+                                hover_text = f"<b>{player_name}</b><br>⚠️ Multiple players at this position<br>" + \
+                                           f'{available_metrics[x_metric]}: {base_x:.2f}<br>' + \
+                                           f'{available_metrics[y_metric]}: {base_y:.2f}<br>'
+                            else:
+                                hover_text = f"<b>{player_name}</b><br>" + \
+                                           f'{available_metrics[x_metric]}: {base_x:.2f}<br>' + \
+                                           f'{available_metrics[y_metric]}: {base_y:.2f}<br>'
                     
-                    with col:
-                        
-                        # Minimal card with border
-                        st.markdown(f"""
-                            <div class='player-card' style='border: 2px solid {border_colors.get(cluster_id, border_colors[0])};
-                                        border-radius: 10px; padding: 1rem; 
-                                        background: white; box-shadow: 0 2px 8px rgba(0,0,0,0.1);'>
-                                <div style='text-align: center;'>
-                                    <div style='color: {border_colors.get(cluster_id, border_colors[0])}; 
-                                                font-size: 0.8rem; font-weight: 600;'>
-                                        SELECTED #{player_idx + 1}
-                                    </div>
-                                    <h4 style='margin: 0.3rem 0; color: #333; font-size: 1.1rem; background: linear-gradient(135deg, {get_profile_color(cluster_id)}15, {get_profile_color(cluster_id)}08); padding: 0.3rem 0.5rem; border-radius: 4px;'>
-                                        {player['Player']}
-                                    </h4>
-                                    <p style='margin: 0; color: {get_team_color(player['Squad'])}; font-size: 0.85rem; background: linear-gradient(135deg, {get_profile_color(cluster_id)}12, {get_profile_color(cluster_id)}05); padding: 0.2rem 0.5rem; border-radius: 4px; font-weight: 600;'>
-                                        {player['Squad']}
-                                    </p>
-                                </div>
-                            </div>
-                        """, unsafe_allow_html=True)
-                        
-                        # Compact info grid
-                        st.markdown(f"""
-                            <div style='display: grid; grid-template-columns: 1fr 1fr; gap: 0.5rem; 
-                                        margin-top: 0.8rem; font-size: 0.85rem;'>
-                                <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px;'>
-                                    <div style='color: #888; font-size: 0.7rem;'>Nation</div>
-                                    <div style='font-weight: 600; color: #333;'>{player.get('Nation', 'N/A')}</div>
-                                </div>
-                                <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px;'>
-                                    <div style='color: #888; font-size: 0.7rem;'>Age</div>
-                                    <div style='font-weight: 600; color: #333;'>{player['Age']:.0f}</div>
-                                </div>
-                                <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px; grid-column: span 2;'>
-                                    <div style='color: #888; font-size: 0.7rem;'>Profile</div>
-                                    <div style='font-weight: 600; color: {border_colors.get(cluster_id, border_colors[0])}; font-size: 0.75rem;'>
-                                        {cluster_id}: {cluster_profiles[cluster_id]['name']}
-                                    </div>
-                                </div>
-                                <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px; grid-column: span 2;'>
-                                    <div style='color: #888; font-size: 0.7rem;'>Overall Rating</div>
-                                    <div style='font-weight: 600; color: {get_rating_color(overall_rating)};'>
-                                        {overall_rating:.1f}
-                                    </div>
-                                </div>
-                            </div>
-                        """, unsafe_allow_html=True)
-                        
-                        
-                        # Archetype section + Secondary (if exists)
-                        secondary_arch_sel = player.get('Secondary_Archetype', None)
-                        secondary_score_sel = player.get('Secondary_Archetype_Score', None)
-                        secondary_html_sel = ""
-                        if isinstance(secondary_arch_sel, str) and len(secondary_arch_sel.strip()) > 0 and secondary_arch_sel != 'N/A':
-                            secondary_color_sel = get_archetype_color(secondary_arch_sel)
-                            try:
-                                sec_score_txt_sel = f", {float(secondary_score_sel):.0f}" if secondary_score_sel is not None and not pd.isna(secondary_score_sel) else ""
-                            except Exception:
-                                sec_score_txt_sel = ""
-                            secondary_html_sel = f"<div style='color: #6b7280; font-size: 0.72rem; font-weight: 500; margin-top: 0.4rem;'>Secondary: <span style='color: {secondary_color_sel}; font-weight: 700;'>{secondary_arch_sel}</span>{sec_score_txt_sel}</div>"
-
-                        st.markdown(
-                            f"""
-                            <div style='margin-top: 0.8rem; padding: 0.6rem; 
-                                        background: linear-gradient(135deg, {get_archetype_color(primary_archetype)}15, {get_archetype_color(primary_archetype)}05);
-                                        border-radius: 5px; text-align: center; min-height: 120px;'>
-                                <div style='color: #6b7280; font-size: 0.75rem; font-weight: 500; margin-bottom: 0.4rem; border-bottom: 1px solid #e5e7eb; padding-bottom: 0.2rem; display: inline-block;'>
-                                    Archetype
-                                </div>
-                                <div style='font-weight: 700; color: {get_archetype_color(primary_archetype)}; 
-                                            font-size: 0.95rem;'>
-                                    {primary_archetype}
-                                </div>
-                                <div style='color: #666; font-size: 0.75rem; margin-top: 0.2rem;'>
-                                   Archetype Score: {archetype_score:.0f}
-                                </div>
-                            """ + secondary_html_sel + f"""
-                            </div>
-                            """,
-                            unsafe_allow_html=True,
-                        )
-                        
-                        # Performance stats - Dynamic based on archetype
-                        archetype = str(primary_archetype).strip()
-                        if archetype == 'Anchor':
-                            metric1_label, metric1_value = "Tkl+Int", player['def_Tkl+Int']
-                            metric2_label, metric2_value = "Blocks", player['def_Blocks']
-                            metric3_label, metric3_value = "Recoveries", player['misc_Recov']
-                        elif archetype == 'DLP':
-                            metric1_label, metric1_value = "Pass Success", player['pass_Cmp%']
-                            metric2_label, metric2_value = "Prog Distance", player['pass_PrgDist']
-                            metric3_label, metric3_value = "Prog Passes", player['pass_PrgP']
-                        elif archetype == 'BallWinner':
-                            metric1_label, metric1_value = "Tkl+Int", player['def_Tkl+Int']
-                            metric2_label, metric2_value = "Tkl Won", player['def_TklW']
-                            metric3_label, metric3_value = "Recoveries", player['misc_Recov']
-                        elif archetype == 'BoxToBox':
-                            metric1_label, metric1_value = "Prog Runs", player['std_PrgR']
-                            metric2_label, metric2_value = "Recoveries", player['misc_Recov']
-                            metric3_label, metric3_value = "Prog Distance", player['poss_PrgDist']
-                        elif archetype == 'APM':
-                            metric1_label, metric1_value = "Key Passes", player['pass_KP']
-                            metric2_label, metric2_value = "xAG", player['std_xAG']
-                            metric3_label, metric3_value = "GCA Pass", player['gca_PassLive']
-                        elif archetype == 'Mezzala':
-                            metric1_label, metric1_value = "Final 3rd", player['poss_1/3']
-                            metric2_label, metric2_value = "Pen Area", player['poss_CPA']
-                            metric3_label, metric3_value = "xAG", player['std_xAG']
-                        elif archetype == 'ShadowStriker':
-                            metric1_label, metric1_value = "xG", player['std_xG']
-                            metric2_label, metric2_value = "Shots", player['shoot_Sh']
-                            metric3_label, metric3_value = "Goals", player['std_Gls']
-                        else:  # Default/fallback metrics
-                            metric1_label, metric1_value = "Minutes", player['std_Min']
-                            metric2_label, metric2_value = "Pass Success", player['pass_Cmp%']
-                            metric3_label, metric3_value = "Matches", player['std_MP']
-                        
-                        
-                        
-                        st.markdown(f"""
-                            <div style='margin-top: 0.8rem; padding: 0.6rem; background: #f9f9f9; border-radius: 5px;'>
-                                <div style='display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 0.3rem; font-size: 0.75rem; text-align: center;'>
-                                    <div>
-                                        <div style='color: #888; font-size: 0.65rem;'>{metric1_label}</div>
-                                        <div style='font-weight: 600; color: {get_score_color(metric1_value, archetype)};'>{metric1_value:.0f}</div>
-                                    </div>
-                                    <div>
-                                        <div style='color: #888; font-size: 0.65rem;'>{metric2_label}</div>
-                                        <div style='font-weight: 600; color: {get_score_color(metric2_value, archetype)};'>{metric2_value:.0f}</div>
-                                    </div>
-                                    <div>
-                                        <div style='color: #888; font-size: 0.65rem;'>{metric3_label}</div>
-                                        <div style='font-weight: 600; color: {get_score_color(metric3_value, archetype)};'>{metric3_value:.0f}</div>
-                                    </div>
-                                </div>
-                            </div>
-                        """, unsafe_allow_html=True)
-                        
-                        st.markdown("<br>", unsafe_allow_html=True)
-        
-        st.markdown("---")
-
-        # ---------------------------
-        # Multi-Player vs Cluster Radar
-        # ---------------------------
-        scaler = MinMaxScaler()
-        df_scaled = pd.DataFrame(scaler.fit_transform(df[radar_metrics]), columns=radar_metrics, index=df.index)
+                            fig_scatter.add_trace(go.Scatter(
+                                x=[base_x + jitter_offset_x],
+                                y=[base_y + jitter_offset_y],
+                                mode='markers',
+                                name=player_name,
+                                marker=dict(
+                                    color=player_color,
+                                    size=20,  # Boyut artırıldı
+                                    symbol='star',
+                                    line=dict(width=3, color='white')
+                                ),
+                                text=[player_name],
+                                hovertemplate=hover_text + '<extra></extra>'
+                            ))
+            
+                    # Grafik düzenleme
+                    fig_scatter.update_layout(
+                        title=f"Player Comparison: {available_metrics[y_metric]} vs {available_metrics[x_metric]}",
+                        xaxis_title=available_metrics[x_metric],
+                        yaxis_title=available_metrics[y_metric],
+                        template='plotly_dark',
+                        height=500,
+                        hovermode='closest',
+                        legend=dict(font=dict(size=12))
+                    )
+                    figure_cache.put(scatter_key, fig_scatter)
+            
+                st.plotly_chart(fig_scatter, use_container_width=True)
+
+        @st.fragment
+        def render_print_buttons(selected_players):
+            """Print buttons for the selected player(s); clicking one reruns only this section."""
+            if len(selected_players) == 1:
+                # PDF Print özelliği
+                player_name = selected_players[0]
+            
+                # Print CSS ve JavaScript ekle
+                st.markdown("""
+            <style>
+            @media print {
+                body * {
+                    visibility: hidden;
+                }
+                .print-area, .print-area * {
+                    visibility: visible;
+                }
+                .print-area {
+                    position: absolute;
+                    left: 0;
+                    top: 0;
+                    width: 100%;
+                }
+                .no-print {
+                    display: none !important;
+                }
+                .page-break {
+                    page-break-before: always;
+                }
+            }
+            .print-btn {
+                background-color: #dc3545;
+                color: white;
+                border: none;
+                padding: 12px 24px;
+                border-radius: 6px;
+                cursor: pointer;
+                font-size: 16px;
+                font-weight: bold;
+                transition: background-color 0.3s;
+            }
+            .print-btn:hover {
+                background-color: #c82333;
+            }
+            </style>
+            
+            <script>
+            function printPage() {
+                // Print dialog'u aç
+                window.print();
+            }
+            
+            // Sayfa yüklendiğinde print fonksiyonunu hazırla
+            document.addEventListener('DOMContentLoaded', function() {
+                console.log('Print function ready');
+            });
+            </script>
+            """, unsafe_allow_html=True)
+            
+                # Print butonu - Streamlit components ile
+                col1, col2, col3 = st.columns([1, 2, 1])
+                with col2:
+                    if st.button(f"📄 {player_name} - PDF Print", 
+                               type="primary", 
+                               use_container_width=True,
+                               help="Sayfayı PDF olarak yazdırmak için tıklayın"):
+                        st.markdown("""
+                    <script>
+                    setTimeout(function() {
+                        window.print();
+                    }, 100);
+                    </script>
+                    """, unsafe_allow_html=True)
+            
+                # Print alanını işaretle
+                st.markdown('<div class="print-area">', unsafe_allow_html=True)
 
-        metrics_tr = [column_info[m] for m in radar_metrics]
-        
-        fig_radar = go.Figure()
+            
         
-        # Player colors
-        player_colors = ['#636EFA', '#EF553B', '#00CC96', '#AB63FA', '#FFA15A', '#19D3F3', '#FF6692', '#B6E880']
+            elif len(selected_players) > 1:
+                # PDF Print özelliği - Çoklu oyuncu karşılaştırması
+                players_list = ", ".join(selected_players)
+            
+                # Print butonu - Streamlit components ile
+                col1, col2, col3 = st.columns([1, 2, 1])
+                with col2:
+                    if st.button(f"📄 {len(selected_players)} Oyuncu Karşılaştırması - PDF Print", 
+                               type="primary", 
+                               use_container_width=True,
+                               help="Sayfayı PDF olarak yazdırmak için tıklayın"):
+                        st.markdown("""
+                    <script>
+                    setTimeout(function() {
+                        window.print();
+                    }, 100);
+                    </script>
+                    """, unsafe_allow_html=True)
+            
+                # Print alanını işaretle
+                st.markdown('<div class="print-area">', unsafe_allow_html=True)
+
+        def update_player_view(selected_players):
+            if not selected_players:
+                st.info("Please select the player(s) you want to analyze.")
+                return
+            
+            # Get data of selected players
+            selected_rows = df.iloc[player_index.positions_of(selected_players)]
+            if selected_rows.empty:
+                st.warning("Selected players are outside filtering criteria.")
+                return
+
+            # Player Profile information of selected players
+            unique_clusters = selected_rows["Cluster"].unique()
+        
+            # ---------------------------
+            # Selected Players Profile Cards
+            # ---------------------------
+            st.markdown("###  Selected Player Cards")
+            st.markdown("<br>", unsafe_allow_html=True)
         
-        # Add trace for each player
-        for idx, player_name in enumerate(selected_players):
-            player_row = selected_rows[selected_rows["Player"] == player_name]
-            if not player_row.empty:
-                player_scaled = df_scaled.loc[player_row.index[0]]
-                color = player_colors[idx % len(player_colors)]
-                # Create closed polygon by adding first value to the end
-                r_values = list(player_scaled.values) + [player_scaled.values[0]]
-                theta_values = metrics_tr + [metrics_tr[0]]
+            # Create player cards in rows (3 cards per row for compact view)
+            for idx in range(0, len(selected_players), 3):
+                cols = st.columns(3, gap="medium")
+            
+                for col_idx, col in enumerate(cols):
+                    player_idx = idx + col_idx
+                    if player_idx < len(selected_players):
+                        player_name = selected_players[player_idx]
+                        player_pos = player_index.position(player_name)
+                        # Overall rating precomputed at load (profile_ratings)
+                        overall_rating = profile_ratings['Profile_Rating'].iat[player_pos]
+
+                        with col:
+                            card_renderer.show('profile', player_pos, f"SELECTED #{player_idx + 1}", overall_rating)
+                            st.markdown("<br>", unsafe_allow_html=True)
+        
+            st.markdown("---")
+
+            # ---------------------------
+            # Multi-Player vs Cluster Radar
+            # ---------------------------
+            df_scaled = pd.DataFrame(scaled_features.get(radar_metrics), columns=radar_metrics, index=df.index)
+
+            metrics_tr = [column_info[m] for m in radar_metrics]
+        
+            # Player colors
+            player_colors = ['#636EFA', '#EF553B', '#00CC96', '#AB63FA', '#FFA15A', '#19D3F3', '#FF6692', '#B6E880']
+            # Chart renkler - birbirinden ayırt edilebilir
+            cluster_colors = ['#1E88E5', '#43A047', '#FB8C00']  # Profile 0: Mavi, Profile 1: Yeşil, Profile 2: Turuncu
+
+            radar_key = figure_cache.key('radar', selected_players, radar_metrics)
+            fig_radar = figure_cache.get(radar_key)
+            if fig_radar is None:
+                fig_radar = go.Figure()
+
+                # Add trace for each player
+                for idx, player_name in enumerate(selected_players):
+                    player_row = player_index.lookup(df, player_name)
+                    if not player_row.empty:
+                        player_scaled = df_scaled.loc[player_row.index[0]]
+                        color = player_colors[idx % len(player_colors)]
+                        # Create closed polygon by adding first value to the end
+                        r_values = list(player_scaled.values) + [player_scaled.values[0]]
+                        theta_values = metrics_tr + [metrics_tr[0]]
                 
-                fig_radar.add_trace(go.Scatterpolar(
-                    r=r_values, 
-                    theta=theta_values, 
-                    fill='toself', 
-                    name=player_name, 
-                    line=dict(color=color, width=3)
-                ))
-        
-        # Add player profile averages
-        # Chart renkler - birbirinden ayırt edilebilir
-        cluster_colors = ['#1E88E5', '#43A047', '#FB8C00']  # Profile 0: Mavi, Profile 1: Yeşil, Profile 2: Turuncu
-        for idx, cluster_id in enumerate(unique_clusters):
-            cluster_mean_scaled = df_scaled[df["Cluster"] == cluster_id].mean()
-            cluster_color = cluster_colors[cluster_id % len(cluster_colors)]
-            # Create closed polygon by adding first value to the end
-            r_cluster_values = list(cluster_mean_scaled.values) + [cluster_mean_scaled.values[0]]
-            theta_cluster_values = metrics_tr + [metrics_tr[0]]
+                        fig_radar.add_trace(go.Scatterpolar(
+                            r=r_values, 
+                            theta=theta_values, 
+                            fill='toself', 
+                            name=player_name, 
+                            line=dict(color=color, width=3)
+                        ))
+        
+                # Add player profile averages
+                for idx, cluster_id in enumerate(unique_clusters):
+                    cluster_mean_scaled = df_scaled[df["Cluster"] == cluster_id].mean()
+                    cluster_color = cluster_colors[cluster_id % len(cluster_colors)]
+                    # Create closed polygon by adding first value to the end
+                    r_cluster_values = list(cluster_mean_scaled.values) + [cluster_mean_scaled.values[0]]
+                    theta_cluster_values = metrics_tr + [metrics_tr[0]]
             
-            fig_radar.add_trace(go.Scatterpolar(
-                r=r_cluster_values, 
-                theta=theta_cluster_values, 
-                fill='toself', 
-                name=f"Player Profile {cluster_id} Average", 
-                line=dict(color=cluster_color, width=3, dash='dot'), 
-                opacity=0.6,
-                visible='legendonly'
-            ))
+                    fig_radar.add_trace(go.Scatterpolar(
+                        r=r_cluster_values, 
+                        theta=theta_cluster_values, 
+                        fill='toself', 
+                        name=f"Player Profile {cluster_id} Average", 
+                        line=dict(color=cluster_color, width=3, dash='dot'), 
+                        opacity=0.6,
+                        visible='legendonly'
+                    ))
         
-        fig_radar.update_layout(
-            polar=dict(radialaxis=dict(visible=True, range=[0,1])),
-            showlegend=True, 
-            title="Selected Players vs Player Profile Averages",
-            template='plotly_dark', 
-            title_font=dict(size=16, color='#000000'), 
-            legend=dict(font=dict(size=12))
-        )
+                fig_radar.update_layout(
+                    polar=dict(radialaxis=dict(visible=True, range=[0,1])),
+                    showlegend=True, 
+                    title="Selected Players vs Player Profile Averages",
+                    template='plotly_dark', 
+                    title_font=dict(size=16, color='#000000'), 
+                    legend=dict(font=dict(size=12))
+                )
+                figure_cache.put(radar_key, fig_radar)
         
-        # Standart Stats başlığı
-        st.markdown("""
+            # Standart Stats başlığı
+            st.markdown("""
             <h2 style='color: #2563eb; margin: 0 0 1rem 0; font-size: 1.8rem; font-weight: 700;'>
                 Standart Stats
             </h2>
         """, unsafe_allow_html=True)
         
-        # Radar ve tabloyu yan yana göster
-        radar_col, table_col = st.columns([2, 1.5], gap="large")
-        with radar_col:
-            st.plotly_chart(fig_radar, use_container_width=True)
-
-        with table_col:
-            # Seçilen oyuncular için metrik info kartları (Player vs Profile Avg, 0-100)
-            st.markdown("<h4 style='margin:0 0 0.5rem 0;'>Info Cards</h4>", unsafe_allow_html=True)
-
-            def build_player_info_card(player_name_str):
-                pr = selected_rows[selected_rows["Player"] == player_name_str]
-                if pr.empty:
-                    return None
-                idx = pr.index[0]
-                player_scaled = df_scaled.loc[idx]
-                cluster_id = pr.iloc[0].get("Cluster", None)
-                try:
-                    cluster_int = int(cluster_id) if cluster_id is not None and not pd.isna(cluster_id) else None
-                except Exception:
-                    cluster_int = None
-                if cluster_int is None:
-                    cluster_avg = pd.Series([np.nan]*len(radar_metrics), index=radar_metrics)
-                else:
-                    cluster_avg = df_scaled[df["Cluster"] == cluster_int][radar_metrics].mean()
-                # Archetype average (Primary_Archetype)
-                primary_arch = pr.iloc[0].get('Primary_Archetype', None)
-                if primary_arch is None or pd.isna(primary_arch):
-                    archetype_avg = pd.Series([np.nan]*len(radar_metrics), index=radar_metrics)
-                else:
-                    archetype_avg = df_scaled[df['Primary_Archetype'] == primary_arch][radar_metrics].mean()
-                # Archetype color (for bars and legend)
-                arch_color = get_archetype_color(str(primary_arch)) if primary_arch is not None and not pd.isna(primary_arch) else '#6b7280'
-
-                player_vals = (player_scaled.values * 100).astype(float)
-                profile_vals = (cluster_avg.values * 100).astype(float)
-                archetype_vals = (archetype_avg.values * 100).astype(float)
-
-                # Kart üst bilgileri
-                squad_name = pr.iloc[0].get("Squad", "N/A")
-                age_val = pr.iloc[0].get("Age", None)
-                profile_name = cluster_profiles.get(cluster_int, {}).get("name", "N/A") if cluster_int is not None else "N/A"
-                border_color = get_profile_color(cluster_int) if cluster_int is not None else '#6b7280'
-
-                # Metrik satırlarını HTML olarak kur (Player vs Profile Avg vs Archetype Avg)
-                rows_html = []
-                for i, metric in enumerate(radar_metrics):
-                    metric_label = column_info.get(metric, metric)
-                    pv = 0.0 if pd.isna(player_vals[i]) else float(player_vals[i])
-                    av = 0.0 if pd.isna(profile_vals[i]) else float(profile_vals[i])
-                    aav = 0.0 if pd.isna(archetype_vals[i]) else float(archetype_vals[i])
-                    row = f"""
+            # Radar ve tabloyu yan yana göster
+            radar_col, table_col = st.columns([2, 1.5], gap="large")
+            with radar_col:
+                st.plotly_chart(fig_radar, use_container_width=True)
+
+            with table_col:
+                # Seçilen oyuncular için metrik info kartları (Player vs Profile Avg, 0-100)
+                st.markdown("<h4 style='margin:0 0 0.5rem 0;'>Info Cards</h4>", unsafe_allow_html=True)
+
+                def build_player_info_card(player_name_str):
+                    pr = player_index.lookup(df, player_name_str)
+                    if pr.empty:
+                        return None
+                    idx = pr.index[0]
+                    player_scaled = df_scaled.loc[idx]
+                    cluster_id = pr.iloc[0].get("Cluster", None)
+                    try:
+                        cluster_int = int(cluster_id) if cluster_id is not None and not pd.isna(cluster_id) else None
+                    except Exception:
+                        cluster_int = None
+                    if cluster_int is None:
+                        cluster_avg = pd.Series([np.nan]*len(radar_metrics), index=radar_metrics)
+                    else:
+                        cluster_avg = df_scaled[df["Cluster"] == cluster_int][radar_metrics].mean()
+                    # Archetype average (Primary_Archetype)
+                    primary_arch = pr.iloc[0].get('Primary_Archetype', None)
+                    if primary_arch is None or pd.isna(primary_arch):
+                        archetype_avg = pd.Series([np.nan]*len(radar_metrics), index=radar_metrics)
+                    else:
+                        archetype_avg = df_scaled[df['Primary_Archetype'] == primary_arch][radar_metrics].mean()
+                    # Archetype color (for bars and legend)
+                    arch_color = get_archetype_color(str(primary_arch)) if primary_arch is not None and not pd.isna(primary_arch) else '#6b7280'
+
+                    player_vals = (player_scaled.values * 100).astype(float)
+                    profile_vals = (cluster_avg.values * 100).astype(float)
+                    archetype_vals = (archetype_avg.values * 100).astype(float)
+
+                    # Kart üst bilgileri
+                    squad_name = pr.iloc[0].get("Squad", "N/A")
+                    age_val = pr.iloc[0].get("Age", None)
+                    profile_name = cluster_profiles.get(cluster_int, {}).get("name", "N/A") if cluster_int is not None else "N/A"
+                    border_color = get_profile_color(cluster_int) if cluster_int is not None else '#6b7280'
+
+                    # Metrik satırlarını HTML olarak kur (Player vs Profile Avg vs Archetype Avg)
+                    rows_html = []
+                    for i, metric in enumerate(radar_metrics):
+                        metric_label = column_info.get(metric, metric)
+                        pv = 0.0 if pd.isna(player_vals[i]) else float(player_vals[i])
+                        av = 0.0 if pd.isna(profile_vals[i]) else float(profile_vals[i])
+                        aav = 0.0 if pd.isna(archetype_vals[i]) else float(archetype_vals[i])
+                        row = f"""
                     <div style='margin:0.35rem 0;'>
                         <div style='font-size:0.75rem;color:#6b7280;margin-bottom:0.2rem;'>{metric_label}</div>
                         <div style='display:flex;align-items:center;gap:0.5rem;'>
@@ -1847,11 +3204,11 @@ with tab4:
                         </div>
                     </div>
                     """
-                    rows_html.append(row)
+                        rows_html.append(row)
 
-                age_text = "N/A" if age_val is None or pd.isna(age_val) else f"{float(age_val):.0f}"
-                primary_arch = pr.iloc[0].get('Primary_Archetype', 'N/A')
-                card_html = f"""
+                    age_text = "N/A" if age_val is None or pd.isna(age_val) else f"{float(age_val):.0f}"
+                    primary_arch = pr.iloc[0].get('Primary_Archetype', 'N/A')
+                    card_html = f"""
                 <div class='player-card' style='border: 2px solid {border_color}; border-radius: 10px; padding: 1rem; background: #ffffff; box-shadow: 0 2px 8px rgba(0,0,0,0.08);'>
                     <div style='display:flex;flex-wrap:wrap;align-items:center;gap:0.5rem;justify-content:space-between;margin-bottom:0.4rem;'>
                         <div style='display:flex;flex-wrap:wrap;align-items:center;gap:0.5rem;'>
@@ -1882,161 +3239,157 @@ with tab4:
                     </div>
                 </div>
                 """
-                return card_html
-
-            if selected_players:
-                # 3 sütunlu satırlar halinde info kartları
-                for start in range(0, len(selected_players), 3):
-                    row_players = selected_players[start:start+3]
-                    cols = st.columns(len(row_players), gap="medium")
-                    for cidx, pname in enumerate(row_players):
-                        with cols[cidx]:
-                            card = build_player_info_card(pname)
-                            if card is not None:
-                                components.html(card, height=720, scrolling=True)
-
-        # ---------------------------
-        # Category-Based Radars
-        # ---------------------------
-        categories = {
-            "Playing Time / Participation": ['std_MP','std_Min','std_90s','pt_Min%','pt_Mn/MP'],
-            "Passing / Playmaking": ['pass_Cmp%','pass_PrgDist','pass_KP','pass_1/3','pass_PPA','pass_PrgP','passt_TB','passt_Sw','passt_Crs','gca_PassLive','gca_PassDead','gca_TO'],
-            "Ball Carrying / Progressive Play": ['poss_Carries','poss_PrgDist','poss_PrgC','poss_1/3','poss_CPA','gca_Sh','gca_Fld'],
-            "Shooting / Goal Contribution": ['std_Gls','std_Ast','std_xG','std_xAG','shoot_Sh'],
-            "Defensive Actions / Defense": ['def_Tkl','def_TklW','def_Int','def_Tkl+Int','def_Blocks','def_Pass','def_Def 3rd','def_Mid 3rd','def_Att 3rd','misc_TklW','misc_Recov','misc_Won','def_Lost'],
-            "Mistakes / Discipline": ['misc_Lost','misc_Fls','misc_Fld','std_CrdY','std_CrdR','poss_Mis','poss_Dis']
-        }
+                    return card_html
+
+                if selected_players:
+                    # 3 sütunlu satırlar halinde info kartları, tek component içinde
+                    render_info_card_grid([build_player_info_card(pname) for pname in selected_players], 720)
+
+            # ---------------------------
+            # Category-Based Radars
+            # ---------------------------
+            categories = {
+                "Playing Time / Participation": ['std_MP','std_Min','std_90s','pt_Min%','pt_Mn/MP'],
+                "Passing / Playmaking": ['pass_Cmp%','pass_PrgDist','pass_KP','pass_1/3','pass_PPA','pass_PrgP','passt_TB','passt_Sw','passt_Crs','gca_PassLive','gca_PassDead','gca_TO'],
+                "Ball Carrying / Progressive Play": ['poss_Carries','poss_PrgDist','poss_PrgC','poss_1/3','poss_CPA','gca_Sh','gca_Fld'],
+                "Shooting / Goal Contribution": ['std_Gls','std_Ast','std_xG','std_xAG','shoot_Sh'],
+                "Defensive Actions / Defense": ['def_Tkl','def_TklW','def_Int','def_Tkl+Int','def_Blocks','def_Pass','def_Def 3rd','def_Mid 3rd','def_Att 3rd','misc_TklW','misc_Recov','misc_Won','def_Lost'],
+                "Mistakes / Discipline": ['misc_Lost','misc_Fls','misc_Fld','std_CrdY','std_CrdR','poss_Mis','poss_Dis']
+            }
 
-        for category, cat_metrics in categories.items():
-            st.markdown(f"""
+            for category, cat_metrics in categories.items():
+                st.markdown(f"""
                 <h2 style='color: #2563eb; margin: 0 0 1rem 0; font-size: 1.8rem; font-weight: 700;'>
                     {category}
                 </h2>
             """, unsafe_allow_html=True)
-            cat_metrics_available = [m for m in cat_metrics if m in df.columns]
-            cat_metrics_tr = [column_info[m] for m in cat_metrics_available]
+                cat_metrics_available = [m for m in cat_metrics if m in df.columns]
+                cat_metrics_tr = [column_info[m] for m in cat_metrics_available]
             
-            if not cat_metrics_tr:
-                continue
+                if not cat_metrics_tr:
+                    continue
                 
-            # Scaling for category
-            cat_scaler = MinMaxScaler()
-            df_cat_scaled = pd.DataFrame(
-                cat_scaler.fit_transform(df[cat_metrics_available]),
-                columns=cat_metrics_tr, 
-                index=df.index
-            )
+                # Scaling for category
+                df_cat_scaled = pd.DataFrame(
+                    scaled_features.get(cat_metrics_available),
+                    columns=cat_metrics_tr, 
+                    index=df.index
+                )
 
-            fig_cat = go.Figure()
+                cat_key = figure_cache.key('category_radar', selected_players, cat_metrics_available, category)
+                fig_cat = figure_cache.get(cat_key)
+                if fig_cat is None:
+                    fig_cat = go.Figure()
             
-            # Add trace for each player
-            for idx, player_name in enumerate(selected_players):
-                player_row = selected_rows[selected_rows["Player"] == player_name]
-                if not player_row.empty:
-                    player_scaled_cat = df_cat_scaled.loc[player_row.index[0]]
-                    color = player_colors[idx % len(player_colors)]
-                    # Create closed polygon by adding first value to the end
-                    r_cat_values = list(player_scaled_cat.values) + [player_scaled_cat.values[0]]
-                    theta_cat_values = cat_metrics_tr + [cat_metrics_tr[0]]
+                    # Add trace for each player
+                    for idx, player_name in enumerate(selected_players):
+                        player_row = player_index.lookup(df, player_name)
+                        if not player_row.empty:
+                            player_scaled_cat = df_cat_scaled.loc[player_row.index[0]]
+                            color = player_colors[idx % len(player_colors)]
+                            # Create closed polygon by adding first value to the end
+                            r_cat_values = list(player_scaled_cat.values) + [player_scaled_cat.values[0]]
+                            theta_cat_values = cat_metrics_tr + [cat_metrics_tr[0]]
                     
-                    fig_cat.add_trace(go.Scatterpolar(
-                        r=r_cat_values, 
-                        theta=theta_cat_values, 
-                        fill='toself', 
-                        name=player_name, 
-                        line=dict(color=color, width=3)
-                    ))
+                            fig_cat.add_trace(go.Scatterpolar(
+                                r=r_cat_values, 
+                                theta=theta_cat_values, 
+                                fill='toself', 
+                                name=player_name, 
+                                line=dict(color=color, width=3)
+                            ))
             
-            # Add player profile averages
-            for idx, cluster_id in enumerate(unique_clusters):
-                cluster_mean_cat = df_cat_scaled[df["Cluster"] == cluster_id].mean()
-                cluster_color = cluster_colors[cluster_id % len(cluster_colors)]
-                # Create closed polygon by adding first value to the end
-                r_cat_cluster_values = list(cluster_mean_cat.values) + [cluster_mean_cat.values[0]]
-                theta_cat_cluster_values = cat_metrics_tr + [cat_metrics_tr[0]]
+                    # Add player profile averages
+                    for idx, cluster_id in enumerate(unique_clusters):
+                        cluster_mean_cat = df_cat_scaled[df["Cluster"] == cluster_id].mean()
+                        cluster_color = cluster_colors[cluster_id % len(cluster_colors)]
+                        # Create closed polygon by adding first value to the end
+                        r_cat_cluster_values = list(cluster_mean_cat.values) + [cluster_mean_cat.values[0]]
+                        theta_cat_cluster_values = cat_metrics_tr + [cat_metrics_tr[0]]
                 
-                fig_cat.add_trace(go.Scatterpolar(
-                    r=r_cat_cluster_values, 
-                    theta=theta_cat_cluster_values, 
-                    fill='toself', 
-                    name=f"Player Profile {cluster_id} Average", 
-                    line=dict(color=cluster_color, width=3, dash='dot'), 
-                    opacity=0.6,
-                    visible='legendonly'
-                ))
-
-            fig_cat.update_layout(
-                polar=dict(radialaxis=dict(visible=True, range=[0,1])),
-                showlegend=True,
-                template='plotly_dark',
-                title=f"{category} - Selected Players vs Player Profile Averages",
-                title_font=dict(size=16, color='#000000'),
-                legend=dict(font=dict(size=12))
-            )
-            cat_left_col, cat_right_col = st.columns([2, 1.5], gap="large")
-            with cat_left_col:
-                st.plotly_chart(fig_cat, use_container_width=True)
-
-            # Kategori için info kartları (oyuncu vs profil ortalaması) sağda
-            with cat_right_col:
-                st.markdown("<h4 style='margin:0.25rem 0 0.5rem 0;'>Info Cards</h4>", unsafe_allow_html=True)
-
-            def build_category_info_card(player_name_str, metrics_keys, df_scaled_local):
-                pr = selected_rows[selected_rows["Player"] == player_name_str]
-                if pr.empty:
-                    return None
-                idx_local = pr.index[0]
-                player_scaled_loc = df_scaled_local.loc[idx_local]
-                cluster_id_loc = pr.iloc[0].get("Cluster", None)
-                try:
-                    cluster_int_loc = int(cluster_id_loc) if cluster_id_loc is not None and not pd.isna(cluster_id_loc) else None
-                except Exception:
-                    cluster_int_loc = None
-                if cluster_int_loc is None:
-                    cluster_avg_loc = pd.Series([np.nan]*len(metrics_keys), index=[column_info[m] for m in metrics_keys])
-                else:
-                    # df_scaled_local kolonları zaten çevrilmiş başlıkları (column_info) kullanıyor olabilir; kontrol et
-                    if list(df_scaled_local.columns) == [column_info[m] for m in metrics_keys]:
-                        cluster_avg_loc = df_scaled_local[df["Cluster"] == cluster_int_loc].mean()
-                        player_vals_series = player_scaled_loc
-                        metric_labels = list(df_scaled_local.columns)
+                        fig_cat.add_trace(go.Scatterpolar(
+                            r=r_cat_cluster_values, 
+                            theta=theta_cat_cluster_values, 
+                            fill='toself', 
+                            name=f"Player Profile {cluster_id} Average", 
+                            line=dict(color=cluster_color, width=3, dash='dot'), 
+                            opacity=0.6,
+                            visible='legendonly'
+                        ))
+
+                    fig_cat.update_layout(
+                        polar=dict(radialaxis=dict(visible=True, range=[0,1])),
+                        showlegend=True,
+                        template='plotly_dark',
+                        title=f"{category} - Selected Players vs Player Profile Averages",
+                        title_font=dict(size=16, color='#000000'),
+                        legend=dict(font=dict(size=12))
+                    )
+                    figure_cache.put(cat_key, fig_cat)
+                cat_left_col, cat_right_col = st.columns([2, 1.5], gap="large")
+                with cat_left_col:
+                    st.plotly_chart(fig_cat, use_container_width=True)
+
+                # Kategori için info kartları (oyuncu vs profil ortalaması) sağda
+                with cat_right_col:
+                    st.markdown("<h4 style='margin:0.25rem 0 0.5rem 0;'>Info Cards</h4>", unsafe_allow_html=True)
+
+                def build_category_info_card(player_name_str, metrics_keys, df_scaled_local):
+                    pr = player_index.lookup(df, player_name_str)
+                    if pr.empty:
+                        return None
+                    idx_local = pr.index[0]
+                    player_scaled_loc = df_scaled_local.loc[idx_local]
+                    cluster_id_loc = pr.iloc[0].get("Cluster", None)
+                    try:
+                        cluster_int_loc = int(cluster_id_loc) if cluster_id_loc is not None and not pd.isna(cluster_id_loc) else None
+                    except Exception:
+                        cluster_int_loc = None
+                    if cluster_int_loc is None:
+                        cluster_avg_loc = pd.Series([np.nan]*len(metrics_keys), index=[column_info[m] for m in metrics_keys])
                     else:
-                        cluster_avg_loc = df_scaled_local[df["Cluster"] == cluster_int_loc][metrics_keys].mean()
-                        player_vals_series = player_scaled_loc[metrics_keys]
-                        metric_labels = [column_info[m] for m in metrics_keys]
-
-                # Archetype avg for current category
-                primary_arch_cur = pr.iloc[0].get('Primary_Archetype', None)
-                arch_color_rows = get_archetype_color(str(primary_arch_cur)) if primary_arch_cur is not None and not pd.isna(primary_arch_cur) else '#6b7280'
-                if primary_arch_cur is None or pd.isna(primary_arch_cur):
-                    archetype_avg_loc = pd.Series([np.nan]*len(metric_labels), index=metric_labels)
-                else:
-                    mask_arch = (df['Primary_Archetype'] == primary_arch_cur)
-                    if list(df_scaled_local.columns) == metric_labels:
-                        archetype_avg_loc = df_scaled_local[mask_arch].mean()
+                        # df_scaled_local kolonları zaten çevrilmiş başlıkları (column_info) kullanıyor olabilir; kontrol et
+                        if list(df_scaled_local.columns) == [column_info[m] for m in metrics_keys]:
+                            cluster_avg_loc = df_scaled_local[df["Cluster"] == cluster_int_loc].mean()
+                            player_vals_series = player_scaled_loc
+                            metric_labels = list(df_scaled_local.columns)
+                        else:
+                            cluster_avg_loc = df_scaled_local[df["Cluster"] == cluster_int_loc][metrics_keys].mean()
+                            player_vals_series = player_scaled_loc[metrics_keys]
+                            metric_labels = [column_info[m] for m in metrics_keys]
+
+                    # Archetype avg for current category
+                    primary_arch_cur = pr.iloc[0].get('Primary_Archetype', None)
+                    arch_color_rows = get_archetype_color(str(primary_arch_cur)) if primary_arch_cur is not None and not pd.isna(primary_arch_cur) else '#6b7280'
+                    if primary_arch_cur is None or pd.isna(primary_arch_cur):
+                        archetype_avg_loc = pd.Series([np.nan]*len(metric_labels), index=metric_labels)
                     else:
-                        archetype_avg_loc = df_scaled_local.loc[mask_arch, metrics_keys].mean()
-
-                # Değerleri 0-100'e çevir
-                p_vals = (player_vals_series.values * 100).astype(float)
-                a_vals = (cluster_avg_loc.values * 100).astype(float)
-                aa_vals = (archetype_avg_loc.values * 100).astype(float)
-
-                # Kart üst bilgileri
-                squad_name_loc = pr.iloc[0].get("Squad", "N/A")
-                age_val_loc = pr.iloc[0].get("Age", None)
-                age_text_loc = "N/A" if age_val_loc is None or pd.isna(age_val_loc) else f"{float(age_val_loc):.0f}"
-                primary_arch_loc = pr.iloc[0].get('Primary_Archetype', 'N/A')
-                arch_color_loc = get_archetype_color(str(primary_arch_loc))
-                profile_name_loc = cluster_profiles.get(cluster_int_loc, {}).get("name", "N/A") if cluster_int_loc is not None else "N/A"
-                border_color_loc = get_profile_color(cluster_int_loc) if cluster_int_loc is not None else '#6b7280'
-
-                rows_html_loc = []
-                for i, metric_label in enumerate(metric_labels):
-                    pv = 0.0 if pd.isna(p_vals[i]) else float(p_vals[i])
-                    av = 0.0 if pd.isna(a_vals[i]) else float(a_vals[i])
-                    aav = 0.0 if pd.isna(aa_vals[i]) else float(aa_vals[i])
-                    row = f"""
+                        mask_arch = (df['Primary_Archetype'] == primary_arch_cur)
+                        if list(df_scaled_local.columns) == metric_labels:
+                            archetype_avg_loc = df_scaled_local[mask_arch].mean()
+                        else:
+                            archetype_avg_loc = df_scaled_local.loc[mask_arch, metrics_keys].mean()
+
+                    # Değerleri 0-100'e çevir
+                    p_vals = (player_vals_series.values * 100).astype(float)
+                    a_vals = (cluster_avg_loc.values * 100).astype(float)
+                    aa_vals = (archetype_avg_loc.values * 100).astype(float)
+
+                    # Kart üst bilgileri
+                    squad_name_loc = pr.iloc[0].get("Squad", "N/A")
+                    age_val_loc = pr.iloc[0].get("Age", None)
+                    age_text_loc = "N/A" if age_val_loc is None or pd.isna(age_val_loc) else f"{float(age_val_loc):.0f}"
+                    primary_arch_loc = pr.iloc[0].get('Primary_Archetype', 'N/A')
+                    arch_color_loc = get_archetype_color(str(primary_arch_loc))
+                    profile_name_loc = cluster_profiles.get(cluster_int_loc, {}).get("name", "N/A") if cluster_int_loc is not None else "N/A"
+                    border_color_loc = get_profile_color(cluster_int_loc) if cluster_int_loc is not None else '#6b7280'
+
+                    rows_html_loc = []
+                    for i, metric_label in enumerate(metric_labels):
+                        pv = 0.0 if pd.isna(p_vals[i]) else float(p_vals[i])
+                        av = 0.0 if pd.isna(a_vals[i]) else float(a_vals[i])
+                        aav = 0.0 if pd.isna(aa_vals[i]) else float(aa_vals[i])
+                        row = f"""
                     <div style='margin:0.3rem 0;'>
                         <div style='font-size:0.75rem;color:#6b7280;margin-bottom:0.15rem;'>{metric_label}</div>
                         <div style='display:flex;align-items:center;gap:0.5rem;'>
@@ -2065,9 +3418,9 @@ with tab4:
                         </div>
                     </div>
                     """
-                    rows_html_loc.append(row)
+                        rows_html_loc.append(row)
 
-                card_html_loc = f"""
+                    card_html_loc = f"""
                 <div class='player-card' style='border: 2px solid {border_color_loc}; border-radius: 10px; padding: 1rem; background: #ffffff; box-shadow: 0 2px 8px rgba(0,0,0,0.08);'>
                     <div style='display:flex;flex-wrap:wrap;align-items:center;gap:0.5rem;justify-content:space-between;margin-bottom:0.4rem;'>
                         <div style='display:flex;flex-wrap:wrap;align-items:center;gap:0.5rem;'>
@@ -2098,24 +3451,19 @@ with tab4:
                     </div>
                 </div>
                 """
-                return card_html_loc
-
-            if selected_players and cat_metrics_available:
-                for start_idx in range(0, len(selected_players), 3):
-                    row_players_loc = selected_players[start_idx:start_idx+3]
-                    cols_loc = cat_right_col.columns(len(row_players_loc), gap="medium")
-                    for cc, pname_loc in enumerate(row_players_loc):
-                        with cols_loc[cc]:
-                            card_loc = build_category_info_card(pname_loc, cat_metrics_available, df_cat_scaled)
-                            if card_loc is not None:
-                                components.html(card_loc, height=640, scrolling=True)
+                    return card_html_loc
+
+                if selected_players and cat_metrics_available:
+                    with cat_right_col:
+                        render_info_card_grid([build_category_info_card(pname_loc, cat_metrics_available, df_cat_scaled)
+                                               for pname_loc in selected_players], 640)
 
             
 
-        # ---------------------------
-        # Archetype Score Distribution (Before Similar Players)
-        # ---------------------------
-        st.markdown("""
+            # ---------------------------
+            # Archetype Score Distribution (Before Similar Players)
+            # ---------------------------
+            st.markdown("""
             <div style='margin: 3rem 0 1.2rem 0;'>
                 <h2 style='font-size: 1.6rem; font-weight: 700; color: #2563eb; margin: 0;'>
                     Archetype Distribution Chart
@@ -2126,62 +3474,66 @@ with tab4:
             </div>
         """, unsafe_allow_html=True)
 
-        archetypes_full = ['Anchor','DLP','BallWinner','BoxToBox','APM','Mezzala','ShadowStriker']
-        arch_to_col = {a: f"{a}_Score" for a in archetypes_full}
-
-        if selected_players:
-            # Radar ile aynı oyuncu renk paleti
-            try:
-                player_color_map_rose = {name: player_colors[i % len(player_colors)] for i, name in enumerate(selected_players)}
-            except Exception:
-                _fallback_colors = ['#636EFA', '#EF553B', '#00CC96', '#AB63FA', '#FFA15A', '#19D3F3', '#FF6692', '#B6E880']
-                player_color_map_rose = {name: _fallback_colors[i % len(_fallback_colors)] for i, name in enumerate(selected_players)}
-            fig_arch = go.Figure()
-            for idx_p, player_name in enumerate(selected_players):
-                prow = selected_rows[selected_rows["Player"] == player_name]
-                if prow.empty:
-                    continue
-                prow = prow.iloc[0]
-                # Y ekseni değerleri
-                y_vals = []
-                for a in archetypes_full:
-                    coln = arch_to_col[a]
-                    y_vals.append(float(prow.get(coln, np.nan)))
-                # Renkler arketip rengi
-                colors = [get_archetype_color(a) for a in archetypes_full]
-                # Primary vurgusu: kalın kenarlık ve yıldız texti
-                primary_arch = str(prow.get('Primary_Archetype', ''))
-                marker_line_width = [2 if a == primary_arch else 0 for a in archetypes_full]
-                marker_line_color = ["#111827" if a == primary_arch else "rgba(0,0,0,0)" for a in archetypes_full]
-                # Oyuncu ismi (sadece ilk isim)
-                full_name = str(prow.get('Player', ''))
-                first_name = full_name.split(' ')[0] if full_name else ''
-                text_labels = [f"{first_name}★" if a == primary_arch else first_name for a in archetypes_full]
-
-                fig_arch.add_trace(go.Bar(
-                    name=player_name,
-                    x=archetypes_full,
-                    y=y_vals,
-                    marker=dict(color=colors, line=dict(width=marker_line_width, color=marker_line_color)),
-                    text=text_labels,
-                    textposition='outside',
-                    cliponaxis=False
-                ))
+            archetypes_full = ['Anchor','DLP','BallWinner','BoxToBox','APM','Mezzala','ShadowStriker']
+            arch_to_col = {a: f"{a}_Score" for a in archetypes_full}
 
-            fig_arch.update_layout(
-                barmode='group',
-                template='plotly_dark',
-                yaxis=dict(title='Score (0-100)', rangemode='tozero'),
-                xaxis=dict(title='Archetype'),
-                legend=dict(font=dict(size=12)),
-                showlegend=False
-            )
-            st.plotly_chart(fig_arch, use_container_width=True)
+            if selected_players:
+                # Radar ile aynı oyuncu renk paleti
+                try:
+                    player_color_map_rose = {name: player_colors[i % len(player_colors)] for i, name in enumerate(selected_players)}
+                except Exception:
+                    _fallback_colors = ['#636EFA', '#EF553B', '#00CC96', '#AB63FA', '#FFA15A', '#19D3F3', '#FF6692', '#B6E880']
+                    player_color_map_rose = {name: _fallback_colors[i % len(_fallback_colors)] for i, name in enumerate(selected_players)}
+                arch_key = figure_cache.key('archetype_bars', selected_players, archetypes_full)
+                fig_arch = figure_cache.get(arch_key)
+                if fig_arch is None:
+                    fig_arch = go.Figure()
+                    for idx_p, player_name in enumerate(selected_players):
+                        prow = player_index.lookup(df, player_name)
+                        if prow.empty:
+                            continue
+                        prow = prow.iloc[0]
+                        # Y ekseni değerleri
+                        y_vals = []
+                        for a in archetypes_full:
+                            coln = arch_to_col[a]
+                            y_vals.append(float(prow.get(coln, np.nan)))
+                        # Renkler arketip rengi
+                        colors = [get_archetype_color(a) for a in archetypes_full]
+                        # Primary vurgusu: kalın kenarlık ve yıldız texti
+                        primary_arch = str(prow.get('Primary_Archetype', ''))
+                        marker_line_width = [2 if a == primary_arch else 0 for a in archetypes_full]
+                        marker_line_color = ["#111827" if a == primary_arch else "rgba(0,0,0,0)" for a in archetypes_full]
+                        # Oyuncu ismi (sadece ilk isim)
+                        full_name = str(prow.get('Player', ''))
+                        first_name = full_name.split(' ')[0] if full_name else ''
+                        text_labels = [f"{first_name}★" if a == primary_arch else first_name for a in archetypes_full]
+
+                        fig_arch.add_trace(go.Bar(
+                            name=player_name,
+                            x=archetypes_full,
+                            y=y_vals,
+                            marker=dict(color=colors, line=dict(width=marker_line_width, color=marker_line_color)),
+                            text=text_labels,
+                            textposition='outside',
+                            cliponaxis=False
+                        ))
+
+                    fig_arch.update_layout(
+                        barmode='group',
+                        template='plotly_dark',
+                        yaxis=dict(title='Score (0-100)', rangemode='tozero'),
+                        xaxis=dict(title='Archetype'),
+                        legend=dict(font=dict(size=12)),
+                        showlegend=False
+                    )
+                    figure_cache.put(arch_key, fig_arch)
+                st.plotly_chart(fig_arch, use_container_width=True)
 
-        # ---------------------------
-        # Interactive Scatter Plot
-        # ---------------------------
-        st.markdown("""
+            # ---------------------------
+            # Interactive Scatter Plot
+            # ---------------------------
+            st.markdown("""
             <div style='margin: 3rem 0 1.2rem 0;'>
                 <h2 style='font-size: 1.6rem; font-weight: 700; color: #2563eb; margin: 0;'>
                     Interactive Player Comparison
@@ -2192,160 +3544,12 @@ with tab4:
             </div>
         """, unsafe_allow_html=True)
 
-        # Metrik seçimi için dropdown'lar
-        available_metrics = {
-            'pass_PrgP': 'Progressive Passes',
-            'poss_PrgC': 'Progressive Carries', 
-            'std_xAG': 'Expected Assists (xAG)',
-            'std_xG': 'Expected Goals (xG)',
-            'def_Tkl': 'Tackles',
-            'def_Int': 'Interceptions',
-            'pass_KP': 'Key Passes',
-            'shoot_Sh': 'Total Shots',
-            'misc_Recov': 'Ball Recoveries',
-            'pass_1/3': 'Passes into Final Third',
-            'passt_Sw': 'Switches',
-            'pass_Cmp%': 'Pass Completion %',
-            'def_Tkl+Int': 'Defensive Actions',
-            'gca_TO': 'Successful Dribbles leading to Goal Chance',
-        }
-
-        col_x, col_y = st.columns(2, gap="medium")
-        with col_x:
-            x_metric = st.selectbox(
-                "X Axis Metric",
-                options=list(available_metrics.keys()),
-                format_func=lambda x: available_metrics[x],
-                index=0,
-                help="Select metric for X axis"
-            )
-        with col_y:
-            y_metric = st.selectbox(
-                "Y Axis Metric", 
-                options=list(available_metrics.keys()),
-                format_func=lambda x: available_metrics[x],
-                index=2,
-                help="Select metric for Y axis"
-            )
-
-        if selected_players and x_metric in df.columns and y_metric in df.columns:
-            # Seçilen oyuncular ve diğer oyuncular
-            selected_df = df[df['Player'].isin(selected_players)].copy()
-            other_df = df[~df['Player'].isin(selected_players)].copy()
-            
-            # Scatter plot oluştur
-            fig_scatter = go.Figure()
-            
-            # Diğer oyuncular (arka plan)
-            if not other_df.empty:
-                fig_scatter.add_trace(go.Scatter(
-                    x=other_df[x_metric],
-                    y=other_df[y_metric],
-                    mode='markers',
-                    name='Other Players',
-                    marker=dict(
-                        color='lightgray',
-                        size=8,
-                        opacity=0.6,
-                        line=dict(width=1, color='white')
-                    ),
-                    text=other_df['Player'],
-                    hovertemplate='<b>%{text}</b><br>' +
-                                 f'{available_metrics[x_metric]}: %{{x:.2f}}<br>' +
-                                 f'{available_metrics[y_metric]}: %{{y:.2f}}<br>' +
-                                 '<extra></extra>'
-                ))
-            
-            # Seçilen oyuncular (vurgulanmış) - Jitter ile üst üste gelme sorunu çözümü
-            import random
-            random.seed(42)  # Tutarlı jitter için
-            # Renk eşlemesi: üstteki radar grafiklerde kullanılan palete uyumlu
-            try:
-                player_color_map = {name: player_colors[i % len(player_colors)] for i, name in enumerate(selected_players)}
-            except Exception:
-                # Fallback paleti
-                _fallback_colors = ['#636EFA', '#EF553B', '#00CC96', '#AB63FA', '#FFA15A', '#19D3F3', '#FF6692', '#B6E880']
-                player_color_map = {name: _fallback_colors[i % len(_fallback_colors)] for i, name in enumerate(selected_players)}
-            
-            # Aynı pozisyondaki oyuncuları grupla
-            position_groups = {}
-            for player_name in selected_players:
-                player_data = selected_df[selected_df['Player'] == player_name]
-                if not player_data.empty:
-                    player_row = player_data.iloc[0]
-                    x_val = player_row[x_metric]
-                    y_val = player_row[y_metric]
-                    pos_key = f"{x_val:.3f}_{y_val:.3f}"
-                    
-                    if pos_key not in position_groups:
-                        position_groups[pos_key] = []
-                    position_groups[pos_key].append((player_name, player_row))
-            
-            # Her pozisyon grubu için jitter uygula
-            for pos_key, players_at_pos in position_groups.items():
-                base_x, base_y = pos_key.split('_')
-                base_x, base_y = float(base_x), float(base_y)
-                
-                # Jitter miktarı (metrik değerlerine göre ayarlanmış)
-                x_range = other_df[x_metric].max() - other_df[x_metric].min() if not other_df.empty else 1
-                y_range = other_df[y_metric].max() - other_df[y_metric].min() if not other_df.empty else 1
-                jitter_x = x_range * 0.02  # %2 jitter
-                jitter_y = y_range * 0.02
-                
-                for i, (player_name, player_row) in enumerate(players_at_pos):
-                    # Jitter hesapla (dairesel dağılım)
-                    if len(players_at_pos) > 1:
-                        angle = (2 * np.pi * i) / len(players_at_pos)
-                        jitter_offset_x = jitter_x * np.cos(angle)
-                        jitter_offset_y = jitter_y * np.sin(angle)
-                    else:
-                        jitter_offset_x = jitter_offset_y = 0
-                    
-                    # Oyuncu rengi: radar paleti ile aynı sırada
-                    player_color = player_color_map.get(player_name, '#636EFA')
-                    
-                    # Hover metni (çoklu oyuncu uyarısı)
-                    if len(players_at_pos) > 1:
-                        hover_text = f"<b>{player_name}</b><br>⚠️ Multiple players at this position<br>" + \
-                                   f'{available_metrics[x_metric]}: {base_x:.2f}<br>' + \
-                                   f'{available_metrics[y_metric]}: {base_y:.2f}<br>'
-                    else:
-                        hover_text = f"<b>{player_name}</b><br>" + \
-                                   f'{available_metrics[x_metric]}: {base_x:.2f}<br>' + \
-                                   f'{available_metrics[y_metric]}: {base_y:.2f}<br>'
-                    
-                    fig_scatter.add_trace(go.Scatter(
-                        x=[base_x + jitter_offset_x],
-                        y=[base_y + jitter_offset_y],
-                        mode='markers',
-                        name=player_name,
-                        marker=dict(
-                            color=player_color,
-                            size=20,  # Boyut artırıldı
-                            symbol='star',
-                            line=dict(width=3, color='white')
-                        ),
-                        text=[player_name],
-                        hovertemplate=hover_text + '<extra></extra>'
-                    ))
-            
-            # Grafik düzenleme
-            fig_scatter.update_layout(
-                title=f"Player Comparison: {available_metrics[y_metric]} vs {available_metrics[x_metric]}",
-                xaxis_title=available_metrics[x_metric],
-                yaxis_title=available_metrics[y_metric],
-                template='plotly_dark',
-                height=500,
-                hovermode='closest',
-                legend=dict(font=dict(size=12))
-            )
-            
-            st.plotly_chart(fig_scatter, use_container_width=True)
+            render_metric_scatter(selected_players, player_colors)
 
-        # ---------------------------
-        # Defansif Aktivite Haritası
-        # ---------------------------
-        st.markdown("""
+            # ---------------------------
+            # Defansif Aktivite Haritası
+            # ---------------------------
+            st.markdown("""
             <div style='margin: 3rem 0 1.5rem 0;'>
                 <h2 style='font-size: 2rem; font-weight: 800; color: #2563eb;'>
                     Defensive Activity Map
@@ -2353,133 +3557,133 @@ with tab4:
             </div>
         """, unsafe_allow_html=True)
         
-        # Defansif aktivite haritası oluşturma
+            # Defansif aktivite haritası oluşturma
         
-        # Haritaları 2'şer yan yana göster
-        if len(selected_players) > 0:
-            # İki sütunlu layout
-            cols = st.columns(2)
+            # Haritaları 2'şer yan yana göster
+            if len(selected_players) > 0:
+                # İki sütunlu layout
+                cols = st.columns(2)
             
-            for i, player_name in enumerate(selected_players):
-                col_index = i % 2
-                with cols[col_index]:
-                    player_row = selected_rows[selected_rows["Player"] == player_name]
-                    if not player_row.empty:
-                        st.markdown(f"""
+                for i, player_name in enumerate(selected_players):
+                    col_index = i % 2
+                    with cols[col_index]:
+                        player_row = player_index.lookup(df, player_name)
+                        if not player_row.empty:
+                            st.markdown(f"""
                             <h3 style='color: #000000; margin: 0 0 0.5rem 0; font-size: 1.2rem; font-weight: 600;'>
                                 {player_name}
                             </h3>
                         """, unsafe_allow_html=True)
                         
-                        # Defansif aktivite verilerini al
-                        def_def = player_row['def_Def 3rd'].iloc[0]
-                        def_mid = player_row['def_Mid 3rd'].iloc[0]
-                        def_att = player_row['def_Att 3rd'].iloc[0]
+                            # Defansif aktivite verilerini al
+                            def_def = player_row['def_Def 3rd'].iloc[0]
+                            def_mid = player_row['def_Mid 3rd'].iloc[0]
+                            def_att = player_row['def_Att 3rd'].iloc[0]
                         
-                        # Bölgeleri ve değerlerini sözlük olarak sakla
-                        defensive_actions = {
-                            'DEF': def_def,
-                            'MID': def_mid,
-                            'ATT': def_att
-                        }
+                            # Bölgeleri ve değerlerini sözlük olarak sakla
+                            defensive_actions = {
+                                'DEF': def_def,
+                                'MID': def_mid,
+                                'ATT': def_att
+                            }
                         
-                        # Değerlere göre büyükten küçüğe sırala
-                        sorted_actions = dict(sorted(defensive_actions.items(), key=lambda x: x[1], reverse=True))
+                            # Değerlere göre büyükten küçüğe sırala
+                            sorted_actions = dict(sorted(defensive_actions.items(), key=lambda x: x[1], reverse=True))
                         
-                        # Renkleri tanımla
-                        colors = ['green', 'yellow', 'red']
-                        color_map = {}
+                            # Renkleri tanımla
+                            colors = ['green', 'yellow', 'red']
+                            color_map = {}
                         
-                        # Sıralanmış bölgelere renkleri ata
-                        for j, (region, value) in enumerate(sorted_actions.items()):
-                            color_map[region] = colors[j]
+                            # Sıralanmış bölgelere renkleri ata
+                            for j, (region, value) in enumerate(sorted_actions.items()):
+                                color_map[region] = colors[j]
                         
-                        # Matplotlib figürü oluştur - kompakt ve 2'şer yan yana
-                        plt.style.use('default')
-                        fig, ax = plt.subplots(figsize=(6, 4))
-                        fig.patch.set_facecolor('#ffffff')
-                        ax.set_facecolor('#ffffff')
+                            # Matplotlib figürü oluştur - kompakt ve 2'şer yan yana
+                            plt.style.use('default')
+                            fig, ax = plt.subplots(figsize=(6, 4))
+                            fig.patch.set_facecolor('#ffffff')
+                            ax.set_facecolor('#ffffff')
                         
-                        # Futbol sahası arka planını yükle
-                        try:
-                            pitch_img = Image.open('pitch.png')
-                            # Görseli 1/4 oranında küçült ve ortala
-                            ax.imshow(pitch_img, extent=[25, 75, 25, 75], aspect='auto')
-                        except FileNotFoundError:
-                            # Eğer pitch.png bulunamazsa, basit bir saha çiz
-                            ax.set_xlim(0, 100)
-                            ax.set_ylim(0, 100)
-                            ax.add_patch(patches.Rectangle((0, 0), 100, 100, linewidth=2, edgecolor='white', facecolor='green', alpha=0.3))
-                            # Saha çizgileri
-                            ax.plot([0, 100], [50, 50], 'w-', linewidth=2)
-                            ax.plot([16.5, 16.5], [21, 79], 'w-', linewidth=2)
-                            ax.plot([83.5, 83.5], [21, 79], 'w-', linewidth=2)
-                            ax.plot([0, 0], [0, 100], 'w-', linewidth=2)
-                            ax.plot([100, 100], [0, 100], 'w-', linewidth=2)
+                            # Futbol sahası arka planını yükle
+                            try:
+                                pitch_img = Image.open('pitch.png')
+                                # Görseli 1/4 oranında küçült ve ortala
+                                ax.imshow(pitch_img, extent=[25, 75, 25, 75], aspect='auto')
+                            except FileNotFoundError:
+                                # Eğer pitch.png bulunamazsa, basit bir saha çiz
+                                ax.set_xlim(0, 100)
+                                ax.set_ylim(0, 100)
+                                ax.add_patch(patches.Rectangle((0, 0), 100, 100, linewidth=2, edgecolor='white', facecolor='green', alpha=0.3))
+                                # Saha çizgileri
+                                ax.plot([0, 100], [50, 50], 'w-', linewidth=2)
+                                ax.plot([16.5, 16.5], [21, 79], 'w-', linewidth=2)
+                                ax.plot([83.5, 83.5], [21, 79], 'w-', linewidth=2)
+                                ax.plot([0, 0], [0, 100], 'w-', linewidth=2)
+                                ax.plot([100, 100], [0, 100], 'w-', linewidth=2)
                         
-                        # Bölgeleri çiz (pitch 25-75 aralığında olduğu için koordinatları ayarla)
-                        regions = {
-                            'DEF': (25, 25, 16.67, 50),      # Sol üçte birlik
-                            'MID': (41.67, 25, 16.67, 50),   # Orta üçte birlik  
-                            'ATT': (58.33, 25, 16.67, 50)    # Sağ üçte birlik
-                        }
+                            # Bölgeleri çiz (pitch 25-75 aralığında olduğu için koordinatları ayarla)
+                            regions = {
+                                'DEF': (25, 25, 16.67, 50),      # Sol üçte birlik
+                                'MID': (41.67, 25, 16.67, 50),   # Orta üçte birlik  
+                                'ATT': (58.33, 25, 16.67, 50)    # Sağ üçte birlik
+                            }
                         
-                        for region, (x, y, width, height) in regions.items():
-                            color = color_map[region]
-                            value = defensive_actions[region]
+                            for region, (x, y, width, height) in regions.items():
+                                color = color_map[region]
+                                value = defensive_actions[region]
                             
-                            # Yarı saydam dikdörtgen ekle
-                            rect = patches.Rectangle((x, y), width, height, 
-                                                   facecolor=color, alpha=0.6, 
-                                                   edgecolor='black', linewidth=2)
-                            ax.add_patch(rect)
+                                # Yarı saydam dikdörtgen ekle
+                                rect = patches.Rectangle((x, y), width, height, 
+                                                       facecolor=color, alpha=0.6, 
+                                                       edgecolor='black', linewidth=2)
+                                ax.add_patch(rect)
                             
-                            # Bölge adı ve değeri ekle - Streamlit tema uyumlu
-                            center_x = x + width/2
-                            center_y = y + height/2
-                            ax.text(center_x, center_y + 6, region, 
-                                   fontsize=11, fontweight='600', ha='center', va='center',
-                                   color='#1f2937', fontfamily='DejaVu Sans',
-                                   bbox=dict(boxstyle="round,pad=0.3", facecolor='#ffffff', alpha=0.95, 
-                                            edgecolor='#e5e7eb', linewidth=1))
-                            ax.text(center_x, center_y - 6, f'{int(value)}', 
-                                   fontsize=9, fontweight='700', ha='center', va='center',
-                                   color='#6b7280', fontfamily='DejaVu Sans',
-                                   bbox=dict(boxstyle="round,pad=0.2", facecolor='#f9fafb', alpha=1.0, 
-                                            edgecolor='#d1d5db', linewidth=0.5))
+                                # Bölge adı ve değeri ekle - Streamlit tema uyumlu
+                                center_x = x + width/2
+                                center_y = y + height/2
+                                ax.text(center_x, center_y + 6, region, 
+                                       fontsize=11, fontweight='600', ha='center', va='center',
+                                       color='#1f2937', fontfamily='DejaVu Sans',
+                                       bbox=dict(boxstyle="round,pad=0.3", facecolor='#ffffff', alpha=0.95, 
+                                                edgecolor='#e5e7eb', linewidth=1))
+                                ax.text(center_x, center_y - 6, f'{int(value)}', 
+                                       fontsize=9, fontweight='700', ha='center', va='center',
+                                       color='#6b7280', fontfamily='DejaVu Sans',
+                                       bbox=dict(boxstyle="round,pad=0.2", facecolor='#f9fafb', alpha=1.0, 
+                                                edgecolor='#d1d5db', linewidth=0.5))
                         
-                        # Grafiği temizle
-                        ax.set_xlim(0, 100)
-                        ax.set_ylim(0, 100)
-                        ax.axis('off')
+                            # Grafiği temizle
+                            ax.set_xlim(0, 100)
+                            ax.set_ylim(0, 100)
+                            ax.axis('off')
                         
-                        # Başlık ekle - tema uyumlu
-                        fig.suptitle(f'{player_name} - Defensive Activity Distribution', 
-                                   fontsize=12, fontweight='700', y=0.80, 
-                                   fontfamily='DejaVu Sans', color='#2563eb')
+                            # Başlık ekle - tema uyumlu
+                            fig.suptitle(f'{player_name} - Defensive Activity Distribution', 
+                                       fontsize=12, fontweight='700', y=0.80, 
+                                       fontfamily='DejaVu Sans', color='#2563eb')
                         
-                        # Renk açıklaması ekle - açıklayıcı
-                        legend_text = ""
-                        for k, (region, color) in enumerate(color_map.items()):
-                            if k > 0:
-                                legend_text += " | "
-                            legend_text += f"{region} Zone ({defensive_actions[region]} actions)"
+                            # Renk açıklaması ekle - açıklayıcı
+                            legend_text = ""
+                            for k, (region, color) in enumerate(color_map.items()):
+                                if k > 0:
+                                    legend_text += " | "
+                                legend_text += f"{region} Zone ({defensive_actions[region]} actions)"
                         
-                        ax.text(50, 12, legend_text, fontsize=8, va='center', ha='center',
-                               fontfamily='DejaVu Sans', fontweight='500', color='#374151',
-                               bbox=dict(boxstyle="round,pad=0.3", facecolor='#ffffff', 
-                                        alpha=0.95, edgecolor='#e5e7eb', linewidth=1))
+                            ax.text(50, 12, legend_text, fontsize=8, va='center', ha='center',
+                                   fontfamily='DejaVu Sans', fontweight='500', color='#374151',
+                                   bbox=dict(boxstyle="round,pad=0.3", facecolor='#ffffff', 
+                                            alpha=0.95, edgecolor='#e5e7eb', linewidth=1))
                         
-                        # Boşlukları optimize et - kompakt
-                        plt.subplots_adjust(top=0.90, bottom=0.20, left=0.05, right=0.95)
-                        st.pyplot(fig, use_container_width=True)
-                        plt.close()
-        
-        # ---------------------------
-        # Pas Gülü Grafiği (Rose Chart)
-        # ---------------------------
-        st.markdown(
-            """
+                            # Boşlukları optimize et - kompakt
+                            plt.subplots_adjust(top=0.90, bottom=0.20, left=0.05, right=0.95)
+                            st.pyplot(fig, use_container_width=True)
+                            plt.close()
+        
+            # ---------------------------
+            # Pas Gülü Grafiği (Rose Chart)
+            # ---------------------------
+            st.markdown(
+                """
             <div style='margin: 3rem 0 1.2rem 0;'>
                 <h2 style='font-size: 1.6rem; font-weight: 700; color: #2563eb; margin: 0;'>
                     Passing Rose Chart
@@ -2489,150 +3693,154 @@ with tab4:
                 </p>
             </div>
             """,
-            unsafe_allow_html=True,
-        )
-
-        if selected_players:
-            def hex_to_rgba(hex_color, alpha=0.25):
-                h = str(hex_color).lstrip('#')
-                if len(h) != 6:
-                    return f'rgba(37, 99, 235, {alpha})'
-                r = int(h[0:2], 16)
-                g = int(h[2:4], 16)
-                b = int(h[4:6], 16)
-                return f'rgba({r}, {g}, {b}, {alpha})'
-
-            def safe_val(v):
-                try:
-                    f = float(v)
-                    return 0.0 if pd.isna(f) else f
-                except Exception:
-                    return 0.0
+                unsafe_allow_html=True,
+            )
 
-            def safe_mean(values):
-                nums = []
-                for v in values:
+            if selected_players:
+                def hex_to_rgba(hex_color, alpha=0.25):
+                    h = str(hex_color).lstrip('#')
+                    if len(h) != 6:
+                        return f'rgba(37, 99, 235, {alpha})'
+                    r = int(h[0:2], 16)
+                    g = int(h[2:4], 16)
+                    b = int(h[4:6], 16)
+                    return f'rgba({r}, {g}, {b}, {alpha})'
+
+                def safe_val(v):
                     try:
                         f = float(v)
-                        if not pd.isna(f):
-                            nums.append(f)
+                        return 0.0 if pd.isna(f) else f
                     except Exception:
-                        continue
-                return float(np.mean(nums)) if len(nums) > 0 else 0.0
-
-            for start_idx in range(0, len(selected_players), 2):
-                row_players = selected_players[start_idx:start_idx + 2]
-                cols = st.columns(len(row_players))
-                for ci, pname in enumerate(row_players):
-                    with cols[ci]:
-                        pr = selected_rows[selected_rows["Player"] == pname]
-                        if pr.empty:
-                            continue
-                        prow = pr.iloc[0]
-
-                        puan_guvenli = safe_val(prow.get('pass_Cmp%', np.nan))
-                        puan_oyunkurma = safe_mean([prow.get('pass_PrgP', np.nan), prow.get('pass_1/3', np.nan)])
-                        puan_yaraticilik = safe_mean([prow.get('pass_KP', np.nan), prow.get('std_xAG', np.nan)])
-                        puan_vizyon = safe_val(prow.get('passt_Sw', np.nan))
-
-                        kategoriler = ['Safe Passing', 'Build-up', 'Creativity', 'Vision']
-                        puanlar = [puan_guvenli, puan_oyunkurma, puan_yaraticilik, puan_vizyon]
+                        return 0.0
 
-                        r_vals = puanlar + [puanlar[0]]
-                        theta_vals = kategoriler + [kategoriler[0]]
-
-                        cluster_id = prow.get('Cluster', None)
+                def safe_mean(values):
+                    nums = []
+                    for v in values:
                         try:
-                            cluster_int = int(cluster_id) if cluster_id is not None and not pd.isna(cluster_id) else None
+                            f = float(v)
+                            if not pd.isna(f):
+                                nums.append(f)
                         except Exception:
-                            cluster_int = None
-                        # Oyuncu rengi: Standard Stats radar paletiyle aynı
-                        base_color = player_color_map_rose.get(pname, '#636EFA')
-
-                        # Rose chart (Barpolar) - eşit açılı, petal görünümü
-                        angles = list(np.linspace(0, 360, len(kategoriler), endpoint=False))
-                        widths = [88] * len(kategoriler)
-
-                        fig_rose = go.Figure()
-                        fig_rose.add_trace(
-                            go.Barpolar(
-                                r=puanlar,
-                                theta=angles,
-                                width=widths,
-                                marker=dict(
-                                    color=[hex_to_rgba(base_color, 0.35)] * len(kategoriler),
-                                    line=dict(color=base_color, width=0),
-                                ),
-                                name=pname,
-                                hovertemplate=
-                                    '<b>' + pname + '</b><br>' +
-                                    '%{customdata[0]}: %{r:.1f}<extra></extra>',
-                                customdata=[[k] for k in kategoriler],
-                                opacity=0.95,
-                            )
-                        )
-                        # Kategori ayırıcı çizgiler (merkezden dışa 4 çizgi)
-                        for sep_angle in angles:
-                            fig_rose.add_trace(
-                                go.Scatterpolar(
-                                    r=[0, 100],
-                                    theta=[sep_angle + 45, sep_angle + 45],
-                                    mode='lines',
-                                    line=dict(color='rgba(209,213,219,0.9)', width=1),  # açık gri
-                                    hoverinfo='skip',
+                            continue
+                    return float(np.mean(nums)) if len(nums) > 0 else 0.0
+
+                for start_idx in range(0, len(selected_players), 2):
+                    row_players = selected_players[start_idx:start_idx + 2]
+                    cols = st.columns(len(row_players))
+                    for ci, pname in enumerate(row_players):
+                        with cols[ci]:
+                            # Oyuncu rengi: Standard Stats radar paletiyle aynı
+                            base_color = player_color_map_rose.get(pname, '#636EFA')
+                            rose_key = figure_cache.key('rose', [pname], (), base_color)
+                            fig_rose = figure_cache.get(rose_key)
+                            if fig_rose is None:
+                                pr = player_index.lookup(df, pname)
+                                if pr.empty:
+                                    continue
+                                prow = pr.iloc[0]
+
+                                puan_guvenli = safe_val(prow.get('pass_Cmp%', np.nan))
+                                puan_oyunkurma = safe_mean([prow.get('pass_PrgP', np.nan), prow.get('pass_1/3', np.nan)])
+                                puan_yaraticilik = safe_mean([prow.get('pass_KP', np.nan), prow.get('std_xAG', np.nan)])
+                                puan_vizyon = safe_val(prow.get('passt_Sw', np.nan))
+
+                                kategoriler = ['Safe Passing', 'Build-up', 'Creativity', 'Vision']
+                                puanlar = [puan_guvenli, puan_oyunkurma, puan_yaraticilik, puan_vizyon]
+
+                                r_vals = puanlar + [puanlar[0]]
+                                theta_vals = kategoriler + [kategoriler[0]]
+
+                                cluster_id = prow.get('Cluster', None)
+                                try:
+                                    cluster_int = int(cluster_id) if cluster_id is not None and not pd.isna(cluster_id) else None
+                                except Exception:
+                                    cluster_int = None
+
+                                # Rose chart (Barpolar) - eşit açılı, petal görünümü
+                                angles = list(np.linspace(0, 360, len(kategoriler), endpoint=False))
+                                widths = [88] * len(kategoriler)
+
+                                fig_rose = go.Figure()
+                                fig_rose.add_trace(
+                                    go.Barpolar(
+                                        r=puanlar,
+                                        theta=angles,
+                                        width=widths,
+                                        marker=dict(
+                                            color=[hex_to_rgba(base_color, 0.35)] * len(kategoriler),
+                                            line=dict(color=base_color, width=0),
+                                        ),
+                                        name=pname,
+                                        hovertemplate=
+                                            '<b>' + pname + '</b><br>' +
+                                            '%{customdata[0]}: %{r:.1f}<extra></extra>',
+                                        customdata=[[k] for k in kategoriler],
+                                        opacity=0.95,
+                                    )
+                                )
+                                # Kategori ayırıcı çizgiler (merkezden dışa 4 çizgi)
+                                for sep_angle in angles:
+                                    fig_rose.add_trace(
+                                        go.Scatterpolar(
+                                            r=[0, 100],
+                                            theta=[sep_angle + 45, sep_angle + 45],
+                                            mode='lines',
+                                            line=dict(color='rgba(209,213,219,0.9)', width=1),  # açık gri
+                                            hoverinfo='skip',
+                                            showlegend=False,
+                                        )
+                                    )
+                                # Bar değer etiketleri (dışarıda metin olarak)
+                                label_r = [min(100, float(v) + 6.0) for v in puanlar]
+                                fig_rose.add_trace(
+                                    go.Scatterpolar(
+                                        r=label_r,
+                                        theta=angles,
+                                        mode='text',
+                                        text=[f"{float(v):.0f}" for v in puanlar],
+                                        textfont=dict(color='#ffffff', size=12),
+                                        hoverinfo='skip',
+                                        showlegend=False,
+                                    )
+                                )
+                                fig_rose.update_layout(
+                                    polar=dict(
+                                        radialaxis=dict(
+                                            visible=True,
+                                            range=[0, 100],
+                                            showticklabels=False,
+                                            ticks='',
+                                            showline=False,
+                                            gridcolor='rgba(0,0,0,0)',
+                                            gridwidth=0
+                                        ),
+                                        angularaxis=dict(
+                                            direction='clockwise',
+                                            rotation=90,
+                                            tickmode='array',
+                                            tickvals=angles,
+                                            ticktext=kategoriler,
+                                            ticks='',
+                                            showline=False,
+                                            gridcolor='rgba(0,0,0,0)',
+                                            tickfont=dict(size=14, color='#000000', family='Inter, DejaVu Sans')
+                                        ),
+                                        bargap=0.02,
+                                    ),
                                     showlegend=False,
+                                    title=f"{pname}: Passing Rose Chart",
+                                    template='plotly_dark',
+                                    height=420,
+                                    margin=dict(t=60, b=20, l=20, r=20),
                                 )
-                            )
-                        # Bar değer etiketleri (dışarıda metin olarak)
-                        label_r = [min(100, float(v) + 6.0) for v in puanlar]
-                        fig_rose.add_trace(
-                            go.Scatterpolar(
-                                r=label_r,
-                                theta=angles,
-                                mode='text',
-                                text=[f"{float(v):.0f}" for v in puanlar],
-                                textfont=dict(color='#ffffff', size=12),
-                                hoverinfo='skip',
-                                showlegend=False,
-                            )
-                        )
-                        fig_rose.update_layout(
-                            polar=dict(
-                                radialaxis=dict(
-                                    visible=True,
-                                    range=[0, 100],
-                                    showticklabels=False,
-                                    ticks='',
-                                    showline=False,
-                                    gridcolor='rgba(0,0,0,0)',
-                                    gridwidth=0
-                                ),
-                                angularaxis=dict(
-                                    direction='clockwise',
-                                    rotation=90,
-                                    tickmode='array',
-                                    tickvals=angles,
-                                    ticktext=kategoriler,
-                                    ticks='',
-                                    showline=False,
-                                    gridcolor='rgba(0,0,0,0)',
-                                    tickfont=dict(size=14, color='#000000', family='Inter, DejaVu Sans')
-                                ),
-                                bargap=0.02,
-                            ),
-                            showlegend=False,
-                            title=f"{pname}: Passing Rose Chart",
-                            template='plotly_dark',
-                            height=420,
-                            margin=dict(t=60, b=20, l=20, r=20),
-                        )
-                        st.plotly_chart(fig_rose, use_container_width=True)
-
-        # ---------------------------
-        # Reward & Security Gauges (Gauge)
-        # ---------------------------
-        st.markdown(
-            """
+                                figure_cache.put(rose_key, fig_rose)
+                            st.plotly_chart(fig_rose, use_container_width=True)
+
+            # ---------------------------
+            # Reward & Security Gauges (Gauge)
+            # ---------------------------
+            st.markdown(
+                """
             <div style='margin: 2.5rem 0 1.0rem 0;'>
                 <h2 style='font-size: 1.6rem; font-weight: 700; color: #2563eb; margin: 0;'>
                     Reward & Security Gauges
@@ -2642,89 +3850,95 @@ with tab4:
                 </p>
             </div>
             """,
-            unsafe_allow_html=True,
-        )
-
-        if selected_players:
-            def _safe_float(v):
-                try:
-                    f = float(v)
-                    return 0.0 if pd.isna(f) else f
-                except Exception:
-                    return 0.0
+                unsafe_allow_html=True,
+            )
 
-            for pname in selected_players:
-                prow_all = selected_rows[selected_rows["Player"] == pname]
-                if prow_all.empty:
-                    continue
-                prow = prow_all.iloc[0]
-
-                # Reward: pass_KP, pass_PPA, poss_PrgC, gca_TO (0-100 ortalama)
-                reward_metrics = [
-                    _safe_float(prow.get('pass_KP', 0)),
-                    _safe_float(prow.get('pass_PPA', 0)),
-                    _safe_float(prow.get('poss_PrgC', 0)),
-                    _safe_float(prow.get('gca_TO', 0)),
-                ]
-                reward_score = int(round(float(np.mean(reward_metrics)) if len(reward_metrics) > 0 else 0.0))
+            if selected_players:
+                def _safe_float(v):
+                    try:
+                        f = float(v)
+                        return 0.0 if pd.isna(f) else f
+                    except Exception:
+                        return 0.0
+
+                for pname in selected_players:
+                    reward_key = figure_cache.key('reward_gauge', [pname])
+                    security_key = figure_cache.key('security_gauge', [pname])
+                    reward_fig, security_fig = figure_cache.get(reward_key), figure_cache.get(security_key)
+                    if reward_fig is None or security_fig is None:
+                        prow_all = player_index.lookup(df, pname)
+                        if prow_all.empty:
+                            continue
+                        prow = prow_all.iloc[0]
+
+                        # Reward: pass_KP, pass_PPA, poss_PrgC, gca_TO (0-100 ortalama)
+                        reward_metrics = [
+                            _safe_float(prow.get('pass_KP', 0)),
+                            _safe_float(prow.get('pass_PPA', 0)),
+                            _safe_float(prow.get('poss_PrgC', 0)),
+                            _safe_float(prow.get('gca_TO', 0)),
+                        ]
+                        reward_score = int(round(float(np.mean(reward_metrics)) if len(reward_metrics) > 0 else 0.0))
 
-                # Security: poss_Dis, poss_Mis (ters 0-100; yüksek = daha güvenli)
-                security_raw = [
-                    _safe_float(prow.get('poss_Dis', 0)),
-                    _safe_float(prow.get('poss_Mis', 0)),
-                ]
-                security_inverted = [max(0.0, min(100.0, 100.0 - v)) for v in security_raw]
-                security_score = int(round(float(np.mean(security_inverted)) if len(security_inverted) > 0 else 0.0))
-
-                # Renk adımları
-                steps_cfg = [
-                    {'range': [0, 40], 'color': '#ef4444'},      # red
-                    {'range': [40, 70], 'color': '#f59e0b'},     # yellow
-                    {'range': [70, 100], 'color': '#10b981'},    # green
-                ]
+                        # Security: poss_Dis, poss_Mis (ters 0-100; yüksek = daha güvenli)
+                        security_raw = [
+                            _safe_float(prow.get('poss_Dis', 0)),
+                            _safe_float(prow.get('poss_Mis', 0)),
+                        ]
+                        security_inverted = [max(0.0, min(100.0, 100.0 - v)) for v in security_raw]
+                        security_score = int(round(float(np.mean(security_inverted)) if len(security_inverted) > 0 else 0.0))
+
+                        # Renk adımları
+                        steps_cfg = [
+                            {'range': [0, 40], 'color': '#ef4444'},      # red
+                            {'range': [40, 70], 'color': '#f59e0b'},     # yellow
+                            {'range': [70, 100], 'color': '#10b981'},    # green
+                        ]
 
-                # Reward Gauge
-                reward_fig = go.Figure(go.Indicator(
-                    mode="gauge+number",
-                    value=reward_score,
-                    title={'text': "Reward Profile", 'font': {'size': 16}},
-                    gauge={
-                        'axis': {'range': [0, 100]},
-                        'bar': {'color': '#000000'},
-                        'steps': steps_cfg,
-                        'threshold': {'line': {'color': '#000000', 'width': 6}, 'thickness': 0.9, 'value': reward_score},
-                    },
-                    number={'suffix': '', 'font': {'size': 22}},
-                ))
-                reward_fig.update_layout(height=280, margin=dict(t=40, b=10, l=10, r=10), template='plotly_dark')
-
-                # Security Gauge
-                security_fig = go.Figure(go.Indicator(
-                    mode="gauge+number",
-                    value=security_score,
-                    title={'text': "Security Profile", 'font': {'size': 16}},
-                    gauge={
-                        'axis': {'range': [0, 100]},
-                        'bar': {'color': '#000000'},
-                        'steps': steps_cfg,
-                        'threshold': {'line': {'color': '#000000', 'width': 6}, 'thickness': 0.9, 'value': security_score},
-                    },
-                    number={'suffix': '', 'font': {'size': 22}},
-                ))
-                security_fig.update_layout(height=280, margin=dict(t=40, b=10, l=10, r=10), template='plotly_dark')
-
-                st.markdown(f"**{pname}**", unsafe_allow_html=True)
-                c1, c2 = st.columns(2)
-                with c1:
-                    st.plotly_chart(reward_fig, use_container_width=True)
-                with c2:
-                    st.plotly_chart(security_fig, use_container_width=True)
-
-        # ---------------------------
-        # Goal Contribution DNA (Donut)
-        # ---------------------------
-        st.markdown(
-            """
+                        # Reward Gauge
+                        reward_fig = go.Figure(go.Indicator(
+                            mode="gauge+number",
+                            value=reward_score,
+                            title={'text': "Reward Profile", 'font': {'size': 16}},
+                            gauge={
+                                'axis': {'range': [0, 100]},
+                                'bar': {'color': '#000000'},
+                                'steps': steps_cfg,
+                                'threshold': {'line': {'color': '#000000', 'width': 6}, 'thickness': 0.9, 'value': reward_score},
+                            },
+                            number={'suffix': '', 'font': {'size': 22}},
+                        ))
+                        reward_fig.update_layout(height=280, margin=dict(t=40, b=10, l=10, r=10), template='plotly_dark')
+
+                        # Security Gauge
+                        security_fig = go.Figure(go.Indicator(
+                            mode="gauge+number",
+                            value=security_score,
+                            title={'text': "Security Profile", 'font': {'size': 16}},
+                            gauge={
+                                'axis': {'range': [0, 100]},
+                                'bar': {'color': '#000000'},
+                                'steps': steps_cfg,
+                                'threshold': {'line': {'color': '#000000', 'width': 6}, 'thickness': 0.9, 'value': security_score},
+                            },
+                            number={'suffix': '', 'font': {'size': 22}},
+                        ))
+                        security_fig.update_layout(height=280, margin=dict(t=40, b=10, l=10, r=10), template='plotly_dark')
+                        figure_cache.put(reward_key, reward_fig)
+                        figure_cache.put(security_key, security_fig)
+
+                    st.markdown(f"**{pname}**", unsafe_allow_html=True)
+                    c1, c2 = st.columns(2)
+                    with c1:
+                        st.plotly_chart(reward_fig, use_container_width=True)
+                    with c2:
+                        st.plotly_chart(security_fig, use_container_width=True)
+
+            # ---------------------------
+            # Goal Contribution DNA (Donut)
+            # ---------------------------
+            st.markdown(
+                """
             <div style='margin: 3rem 0 1.2rem 0;'>
                 <h2 style='font-size: 1.6rem; font-weight: 700; color: #2563eb; margin: 0;'>
                     Goal Contribution DNA
@@ -2734,93 +3948,97 @@ with tab4:
                 </p>
             </div>
             """,
-            unsafe_allow_html=True,
-        )
-
-        if selected_players:
-            labels_gca = [
-                "Live Pass",
-                "Dead Ball",
-                "Take-on / Dribble",
-                "Shot Rebound",
-                "Fouled / Won Foul",
-            ]
-            color_gca = [
-                '#636EFA', '#EF553B', '#00CC96', '#AB63FA', '#FFA15A'
-            ]
-
-            for start_idx in range(0, len(selected_players), 2):
-                row_players = selected_players[start_idx:start_idx + 2]
-                cols = st.columns(len(row_players))
-                for ci, pname in enumerate(row_players):
-                    with cols[ci]:
-                        pr = selected_rows[selected_rows["Player"] == pname]
-                        if pr.empty:
-                            continue
-                        prow = pr.iloc[0]
+                unsafe_allow_html=True,
+            )
 
-                        def _safe(v):
-                            try:
-                                f = float(v)
-                                return 0.0 if pd.isna(f) else f
-                            except Exception:
-                                return 0.0
-
-                        vals = [
-                            _safe(prow.get('gca_PassLive', 0)),
-                            _safe(prow.get('gca_PassDead', 0)),
-                            _safe(prow.get('gca_TO', 0)),
-                            _safe(prow.get('gca_Sh', 0)),
-                            _safe(prow.get('gca_Fld', 0)),
-                        ]
-                        total_gca = float(np.sum(vals))
-                        if total_gca <= 0:
-                            st.info("Bu oyuncunun sezon boyunca kayıtlı bir gol pozisyonu yaratma aksiyonu bulunmamaktadır.")
-                            continue
+            if selected_players:
+                labels_gca = [
+                    "Live Pass",
+                    "Dead Ball",
+                    "Take-on / Dribble",
+                    "Shot Rebound",
+                    "Fouled / Won Foul",
+                ]
+                color_gca = [
+                    '#636EFA', '#EF553B', '#00CC96', '#AB63FA', '#FFA15A'
+                ]
 
-                        max_idx = int(np.argmax(vals)) if any(v > 0 for v in vals) else 0
-                        pull_arr = [0.0] * len(vals)
-                        pull_arr[max_idx] = 0.10
-
-                        fig_donut = go.Figure([
-                            go.Pie(
-                                labels=labels_gca,
-                                values=vals,
-                                hole=0.5,
-                                marker=dict(colors=color_gca, line=dict(color='white', width=1)),
-                                sort=False,
-                                direction='clockwise',
-                                textinfo='percent',
-                                textposition='inside',
-                                insidetextorientation='radial',
-                                pull=pull_arr,
-                                hovertemplate='%{label}<br>%{value} Actions (%{percent})<extra></extra>',
-                                name=pname,
-                            )
-                        ])
-
-                        fig_donut.add_annotation(
-                            text=f"Total GCA\n{int(total_gca)}",
-                            x=0.5, y=0.5, showarrow=False,
-                            font=dict(size=18, color='#ffffff')
-                        )
-                        fig_donut.update_traces(textfont=dict(color='#ffffff', size=12))
-                        fig_donut.update_layout(
-                            title=f"{pname}: Goal Contribution DNA",
-                            template='plotly_dark',
-                            showlegend=True,
-                            height=420,
-                            margin=dict(t=60, b=20, l=20, r=20),
-                            legend=dict(font=dict(size=12))
-                        )
-                        st.plotly_chart(fig_donut, use_container_width=True)
+                for start_idx in range(0, len(selected_players), 2):
+                    row_players = selected_players[start_idx:start_idx + 2]
+                    cols = st.columns(len(row_players))
+                    for ci, pname in enumerate(row_players):
+                        with cols[ci]:
+                            donut_key = figure_cache.key('gca_donut', [pname])
+                            fig_donut = figure_cache.get(donut_key)
+                            if fig_donut is None:
+                                pr = player_index.lookup(df, pname)
+                                if pr.empty:
+                                    continue
+                                prow = pr.iloc[0]
+
+                                def _safe(v):
+                                    try:
+                                        f = float(v)
+                                        return 0.0 if pd.isna(f) else f
+                                    except Exception:
+                                        return 0.0
+
+                                vals = [
+                                    _safe(prow.get('gca_PassLive', 0)),
+                                    _safe(prow.get('gca_PassDead', 0)),
+                                    _safe(prow.get('gca_TO', 0)),
+                                    _safe(prow.get('gca_Sh', 0)),
+                                    _safe(prow.get('gca_Fld', 0)),
+                                ]
+                                total_gca = float(np.sum(vals))
+                                if total_gca <= 0:
+                                    st.info("Bu oyuncunun sezon boyunca kayıtlı bir gol pozisyonu yaratma aksiyonu bulunmamaktadır.")
+                                    continue
+
+                                max_idx = int(np.argmax(vals)) if any(v > 0 for v in vals) else 0
+                                pull_arr = [0.0] * len(vals)
+                                pull_arr[max_idx] = 0.10
+
+                                fig_donut = go.Figure([
+                                    go.Pie(
+                                        labels=labels_gca,
+                                        values=vals,
+                                        hole=0.5,
+                                        marker=dict(colors=color_gca, line=dict(color='white', width=1)),
+                                        sort=False,
+                                        direction='clockwise',
+                                        textinfo='percent',
+                                        textposition='inside',
+                                        insidetextorientation='radial',
+                                        pull=pull_arr,
+                                        hovertemplate='%{label}<br>%{value} Actions (%{percent})<extra></extra>',
+                                        name=pname,
+                                    )
+                                ])
+
+                                fig_donut.add_annotation(
+                                    text=f"Total GCA\n{int(total_gca)}",
+                                    x=0.5, y=0.5, showarrow=False,
+                                    font=dict(size=18, color='#ffffff')
+                                )
+                                fig_donut.update_traces(textfont=dict(color='#ffffff', size=12))
+                                fig_donut.update_layout(
+                                    title=f"{pname}: Goal Contribution DNA",
+                                    template='plotly_dark',
+                                    showlegend=True,
+                                    height=420,
+                                    margin=dict(t=60, b=20, l=20, r=20),
+                                    legend=dict(font=dict(size=12))
+                                )
+                                figure_cache.put(donut_key, fig_donut)
+                            st.plotly_chart(fig_donut, use_container_width=True)
 
         
 
-        # ---------------------------
-        # Similar Players
-        # ---------------------------
-        st.markdown("""
+            # ---------------------------
+            # Similar Players
+            # ---------------------------
+            st.markdown("""
             <div style='margin: 3rem 0 1.2rem 0;'>
                 <h2 style='font-size: 1.6rem; font-weight: 700; color: #2563eb; margin: 0;'>
                     Similar Players
@@ -2828,109 +4046,68 @@ with tab4:
             </div>
         """, unsafe_allow_html=True)
         
-        # Yeni yöntem: küme içi, 0-100 metrikler ile Öklidyen mesafe -> 0-100 benzerlik (Kart görünümü)
-        for player_name in selected_players:
-            top_sim = find_similar_players(df, player_name, top_k=3)
-            if top_sim is None or top_sim.empty:
-                st.info(f"No similar players found for {player_name}.")
-                continue
-            st.markdown(f"**Statistically Similar Profiles – {player_name}**")
-            st.markdown("<br>", unsafe_allow_html=True)
-            # 3 kartlık satır
-            cols_cards = st.columns(min(3, len(top_sim)), gap="medium")
-            for i in range(len(top_sim)):
-                row = top_sim.iloc[i]
-                pname = str(row.get('Player','N/A'))
-                squad = str(row.get('Squad','N/A'))
-                age_val = row.get('Age', np.nan)
-                arch = str(row.get('Primary_Archetype','N/A'))
-                sim = float(row.get('Similarity_Score', 0.0))
-                arch_color = get_archetype_color(arch)
-                team_color = get_team_color(squad)
-                # Profile color (from Cluster of this player)
-                try:
-                    cluster_id_sim = df.loc[df['Player'] == pname, 'Cluster'].iloc[0]
-                except Exception:
-                    cluster_id_sim = None
-                prof_color = get_profile_color(int(cluster_id_sim)) if cluster_id_sim is not None and not pd.isna(cluster_id_sim) else '#6b7280'
-                age_display = 'N/A' if pd.isna(age_val) else f"{float(age_val):.0f}"
-                with cols_cards[i % len(cols_cards)]:
-                    st.markdown(f"""
-                        <div class='player-card' style='border: 2px solid {prof_color};
-                                    border-radius: 10px; padding: 1rem; 
-                                    background: white; box-shadow: 0 2px 8px rgba(0,0,0,0.1);'>
-                            <div style='text-align: center;'>
-                                <div style='color: {prof_color}; font-size: 0.8rem; font-weight: 700;'>#{i+1} MOST SIMILAR</div>
-                                <h4 style='margin: 0.3rem 0; color: #111827; font-size: 1.05rem; background: linear-gradient(135deg, {prof_color}15, {prof_color}08); padding: 0.3rem 0.5rem; border-radius: 4px;'>
-                                    {pname}
-                                </h4>
-                                <p style='margin: 0; color: {team_color}; font-size: 0.9rem; background: linear-gradient(135deg, {prof_color}12, {prof_color}05); padding: 0.2rem 0.5rem; border-radius: 4px; font-weight: 600;'>
-                                    {squad}
-                                </p>
-                            </div>
-                        </div>
-                    """, unsafe_allow_html=True)
-
-                    st.markdown(f"""
-                        <div style='display: grid; grid-template-columns: 1fr 1fr; gap: 0.5rem; 
-                                    margin-top: 0.8rem; font-size: 0.85rem;'>
-                            <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px;'>
-                                <div style='color: #888; font-size: 0.7rem;'>Age</div>
-                                <div style='font-weight: 600; color: #111827;'>{age_display}</div>
-                            </div>
-                            <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px;'>
-                                <div style='color: #888; font-size: 0.7rem;'>Archetype</div>
-                                <div style='font-weight: 700; color: {arch_color};'>{arch}</div>
-                            </div>
-                            <div style='text-align: center; padding: 0.4rem; background: #f5f5f5; border-radius: 5px; grid-column: span 2;'>
-                                <div style='color: #888; font-size: 0.7rem;'>Similarity Score</div>
-                                <div style='font-weight: 800; color: {get_rating_color(sim)};'>{sim:.1f}</div>
-                            </div>
-                        </div>
-                    """, unsafe_allow_html=True)
-            st.markdown("<br><br>", unsafe_allow_html=True)
-
-        # ---------------------------
-        # Compare All Player Profiles
-        # ---------------------------
-        st.markdown("""
+            # Yeni yöntem: küme içi, 0-100 metrikler ile Öklidyen mesafe -> 0-100 benzerlik (Kart görünümü)
+            similar_sets = query_similar_players(df, selected_players, top_k=3)
+            for player_name in selected_players:
+                top_sim = similar_sets[player_name]
+                if top_sim is None or top_sim.empty:
+                    st.info(f"No similar players found for {player_name}.")
+                    continue
+                st.markdown(f"**Statistically Similar Profiles – {player_name}**")
+                st.markdown("<br>", unsafe_allow_html=True)
+                # 3 kartlık satır
+                cols_cards = st.columns(min(3, len(top_sim)), gap="medium")
+                for i in range(len(top_sim)):
+                    with cols_cards[i % len(cols_cards)]:
+                        card_renderer.show('similar', int(top_sim.index[i]), f"#{i+1} MOST SIMILAR",
+                                           float(top_sim['Similarity_Score'].iat[i]))
+                st.markdown("<br><br>", unsafe_allow_html=True)
+
+            # ---------------------------
+            # Compare All Player Profiles
+            # ---------------------------
+            st.markdown("""
             <div style='margin: 3rem 0 1.2rem 0;'>
                 <h2 style='font-size: 1.6rem; font-weight: 700; color: #2563eb; margin: 0;'>
                     Compare All Player Profiles
                 </h2>
             </div>
         """, unsafe_allow_html=True)
-        df_scaled_all = pd.DataFrame(MinMaxScaler().fit_transform(df[radar_metrics]),
-                                     columns=radar_metrics, index=df.index)
-        cluster_means_scaled = df_scaled_all.groupby(df["Cluster"]).mean()
-        fig_all = go.Figure()
-        # Chart renkler - birbirinden ayırt edilebilir
-        colors = ['#1E88E5', '#43A047', '#FB8C00']  # Profile 0: Mavi, Profile 1: Yeşil, Profile 2: Turuncu
-        for idx, (cid,row) in enumerate(cluster_means_scaled.iterrows()):
-            # Create closed polygon by adding first value to the end
-            r_all_values = list(row.values) + [row.values[0]]
-            theta_all_values = [column_info[m] for m in radar_metrics] + [column_info[radar_metrics[0]]]
+            all_key = figure_cache.key('all_profiles', (), radar_metrics)
+            fig_all = figure_cache.get(all_key)
+            if fig_all is None:
+                df_scaled_all = pd.DataFrame(scaled_features.get(radar_metrics),
+                                             columns=radar_metrics, index=df.index)
+                cluster_means_scaled = df_scaled_all.groupby(df["Cluster"]).mean()
+                fig_all = go.Figure()
+                # Chart renkler - birbirinden ayırt edilebilir
+                colors = ['#1E88E5', '#43A047', '#FB8C00']  # Profile 0: Mavi, Profile 1: Yeşil, Profile 2: Turuncu
+                for idx, (cid,row) in enumerate(cluster_means_scaled.iterrows()):
+                    # Create closed polygon by adding first value to the end
+                    r_all_values = list(row.values) + [row.values[0]]
+                    theta_all_values = [column_info[m] for m in radar_metrics] + [column_info[radar_metrics[0]]]
             
-            fig_all.add_trace(go.Scatterpolar(
-                r=r_all_values,
-                theta=theta_all_values,
-                fill='toself',
-                name=f"Player Profile {cid}",
-                line=dict(width=2,color=colors[idx%len(colors)]),
-                opacity=0.7
-            ))
-        fig_all.update_layout(
-            polar=dict(radialaxis=dict(visible=True, range=[0,1])),
-            showlegend=True,
-            title="Comparison of All Player Profiles",
-            template='plotly_dark'
-        )
-        st.plotly_chart(fig_all, use_container_width=True, key="all_clusters_radar")
-
-        # ---------------------------
-        # / Excel Report
-        # ---------------------------
-        st.markdown("""
+                    fig_all.add_trace(go.Scatterpolar(
+                        r=r_all_values,
+                        theta=theta_all_values,
+                        fill='toself',
+                        name=f"Player Profile {cid}",
+                        line=dict(width=2,color=colors[idx%len(colors)]),
+                        opacity=0.7
+                    ))
+                fig_all.update_layout(
+                    polar=dict(radialaxis=dict(visible=True, range=[0,1])),
+                    showlegend=True,
+                    title="Comparison of All Player Profiles",
+                    template='plotly_dark'
+                )
+                figure_cache.put(all_key, fig_all)
+            st.plotly_chart(fig_all, use_container_width=True, key="all_clusters_radar")
+
+            # ---------------------------
+            # / Excel Report
+            # ---------------------------
+            st.markdown("""
             <div style='margin: 3rem 0 1.2rem 0;'>
                 <h2 style='font-size: 1.6rem; font-weight: 700; color: #2563eb; margin: 0;'>
                     Download Report
@@ -2938,114 +4115,30 @@ with tab4:
             </div>
         """, unsafe_allow_html=True)
         
-        if len(selected_players) == 1:
-            # PDF Print özelliği
-            player_name = selected_players[0]
-            
-            # Print CSS ve JavaScript ekle
-            st.markdown("""
-            <style>
-            @media print {
-                body * {
-                    visibility: hidden;
-                }
-                .print-area, .print-area * {
-                    visibility: visible;
-                }
-                .print-area {
-                    position: absolute;
-                    left: 0;
-                    top: 0;
-                    width: 100%;
-                }
-                .no-print {
-                    display: none !important;
-                }
-                .page-break {
-                    page-break-before: always;
-                }
-            }
-            .print-btn {
-                background-color: #dc3545;
-                color: white;
-                border: none;
-                padding: 12px 24px;
-                border-radius: 6px;
-                cursor: pointer;
-                font-size: 16px;
-                font-weight: bold;
-                transition: background-color 0.3s;
-            }
-            .print-btn:hover {
-                background-color: #c82333;
-            }
-            </style>
-            
-            <script>
-            function printPage() {
-                // Print dialog'u aç
-                window.print();
-            }
-            
-            // Sayfa yüklendiğinde print fonksiyonunu hazırla
-            document.addEventListener('DOMContentLoaded', function() {
-                console.log('Print function ready');
-            });
-            </script>
-            """, unsafe_allow_html=True)
-            
-            # Print butonu - Streamlit components ile
-            col1, col2, col3 = st.columns([1, 2, 1])
-            with col2:
-                if st.button(f"📄 {player_name} - PDF Print", 
-                           type="primary", 
-                           use_container_width=True,
-                           help="Sayfayı PDF olarak yazdırmak için tıklayın"):
-                    st.markdown("""
-                    <script>
-                    setTimeout(function() {
-                        window.print();
-                    }, 100);
-                    </script>
-                    """, unsafe_allow_html=True)
-            
-            # Print alanını işaretle
-            st.markdown('<div class="print-area">', unsafe_allow_html=True)
-
-            
-        
-        elif len(selected_players) > 1:
-            # PDF Print özelliği - Çoklu oyuncu karşılaştırması
-            players_list = ", ".join(selected_players)
-            
-            # Print butonu - Streamlit components ile
-            col1, col2, col3 = st.columns([1, 2, 1])
-            with col2:
-                if st.button(f"📄 {len(selected_players)} Oyuncu Karşılaştırması - PDF Print", 
-                           type="primary", 
-                           use_container_width=True,
-                           help="Sayfayı PDF olarak yazdırmak için tıklayın"):
-                    st.markdown("""
-                    <script>
-                    setTimeout(function() {
-                        window.print();
-                    }, 100);
-                    </script>
-                    """, unsafe_allow_html=True)
-            
-            # Print alanını işaretle
-            st.markdown('<div class="print-area">', unsafe_allow_html=True)
-
-            
+            render_print_buttons(selected_players)
+
+        # Player picker and analysis run as one fragment (the scatter and print
+        # buttons inside it are fragments of their own)
+        @st.fragment
+        def player_analysis_view():
+            """Player picker plus the analysis it drives; picking players reruns only this section."""
+            player_select = st.multiselect(
+                "Choose one or more players", 
+                df["Player"].unique(), 
+                default=[], 
+                key="player_select",
+                help="You can select multiple players for comparison"
+            )
+            update_player_view(player_select)
 
-    # Call the analysis function
-    update_player_view(player_select)
+        player_analysis_view()
     
-    # Print alanını kapat
-    st.markdown('</div>', unsafe_allow_html=True)
+        # Print alanını kapat
+        st.markdown('</div>', unsafe_allow_html=True)
 
 with tab5:
-    st.markdown("""
+    if tab5.open:
+        st.markdown("""
     <div style='text-align: center; margin: 2rem 0 1.5rem 0;'>
         <h1 style='font-size: 1.8rem; font-weight: 600; margin: 0; color: #2563eb;'>
             League Leaders Statistics
@@ -3056,9 +4149,9 @@ with tab5:
     </div>
     """, unsafe_allow_html=True)
 
-    # Instructions box
-    with st.expander("About This Section (Click to expand)", expanded=False):
-        st.markdown("""
+        # Instructions box
+        with st.expander("About This Section (Click to expand)", expanded=False):
+            st.markdown("""
         **League Leaders Statistics**
         - Comprehensive leaderboards across multiple performance categories
         - Creative & Passing, Defensive, Attacking, and Dribble specialists
@@ -3071,18 +4164,18 @@ with tab5:
         - Higher scores indicate better performance in that specific area
         """)
     
-    st.markdown("---")
+        st.markdown("---")
     
-    # Create sub-tabs for League Leaders
-    sub_tab1, sub_tab2, sub_tab3 = st.tabs([
-        " Creative & Passing Leaders",
-        " Defensive Leaders", 
-        " Attacking Leaders"
-    ])
+        # Create sub-tabs for League Leaders
+        sub_tab1, sub_tab2, sub_tab3 = st.tabs([
+            " Creative & Passing Leaders",
+            " Defensive Leaders", 
+            " Attacking Leaders"
+        ])
     
-    with sub_tab1:
-        # Creative & Passing Leaders content
-        st.markdown("""
+        with sub_tab1:
+            # Creative & Passing Leaders content
+            st.markdown("""
         <div style='margin: 2rem 0 1.5rem 0;'>
             <h2 style='font-size: 1.5rem; font-weight: 600; text-align: center; color: #2563eb;'>
                  Creative & Passing Leaders
@@ -3093,241 +4186,74 @@ with tab5:
         </div>
         """, unsafe_allow_html=True)
         
-        col1, col2, col3 = st.columns(3)
+            col1, col2, col3 = st.columns(3)
         
-        with col1:
-            st.markdown("""
+            with col1:
+                st.markdown("""
         <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #2563eb;'>
             <h4 style='margin: 0 0 0.5rem 0; color: #2563eb; font-size: 1rem;'>Key Pass Efficiency</h4>
             <p style='margin: 0; color: #6c757d; font-size: 0.8rem;'>Per 90 minutes</p>
         </div>
         """, unsafe_allow_html=True)
             
-            if 'pass_KP' in df.columns and 'std_Min' in df.columns:
-                df['key_pass_efficiency'] = (df['pass_KP'] / (df['std_Min'] / 90)).fillna(0)
-                creative_leaders = df.nlargest(5, 'key_pass_efficiency')[['Player', 'Squad', 'key_pass_efficiency']].copy()
-                creative_leaders.columns = ['Player', 'Team', 'Key Passes per 90']
-                creative_leaders['Key Passes per 90'] = creative_leaders['Key Passes per 90'].round(2)
-                st.dataframe(
-                    creative_leaders, 
-                    use_container_width=True, 
-                    hide_index=True,
-                    column_config={
-                        "Player": st.column_config.TextColumn("Player", width="medium"),
-                        "Team": st.column_config.TextColumn("Team", width="small"),
-                        "Key Passes per 90": st.column_config.ProgressColumn(
-                            "Key Passes per 90",
-                            format="%.2f",
-                            min_value=0,
-                            max_value=float(creative_leaders['Key Passes per 90'].max()),
-                        ),
-                    }
-                )
-            else:
-                st.info("Key passes or minutes data not found")
+                render_leaderboard(df, 'key_passes_per90')
         
-        with col2:
-            st.markdown("""
+            with col2:
+                st.markdown("""
         <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #28a745;'>
             <h4 style='margin: 0 0 0.5rem 0; color: #28a745; font-size: 1rem;'>Key Pass Efficiency</h4>
             <p style='margin: 0; color: #6c757d; font-size: 0.8rem;'>Progressive to key pass conversion</p>
         </div>
         """, unsafe_allow_html=True)
             
-            if 'pass_KP' in df.columns and 'pass_PrgP' in df.columns:
-                # Calculate key pass efficiency: KP / PrgP * 100
-                df['key_pass_efficiency'] = (df['pass_KP'] / df['pass_PrgP'] * 100).fillna(0)
-                # Filter out players with very low progressive passes to avoid misleading ratios
-                qualified_players = df[df['pass_PrgP'] >= 10]  # Minimum 10 progressive passes
-                if not qualified_players.empty:
-                    efficiency_leaders = qualified_players.nlargest(5, 'key_pass_efficiency')[['Player', 'Squad', 'key_pass_efficiency', 'pass_KP', 'pass_PrgP']].copy()
-                    efficiency_leaders.columns = ['Player', 'Team', 'Efficiency %', 'Key Passes', 'Progressive Passes']
-                    efficiency_leaders['Efficiency %'] = efficiency_leaders['Efficiency %'].round(1)
-                    efficiency_leaders['Key Passes'] = efficiency_leaders['Key Passes'].round(1)
-                    efficiency_leaders['Progressive Passes'] = efficiency_leaders['Progressive Passes'].round(1)
-                    st.dataframe(
-                        efficiency_leaders, 
-                        use_container_width=True, 
-                        hide_index=True,
-                        column_config={
-                            "Player": st.column_config.TextColumn("Player", width="medium"),
-                            "Team": st.column_config.TextColumn("Team", width="small"),
-                            "Efficiency %": st.column_config.ProgressColumn(
-                                "Efficiency %",
-                                format="%.1f%%",
-                                min_value=0,
-                                max_value=float(efficiency_leaders['Efficiency %'].max()),
-                            ),
-                            "Key Passes": st.column_config.NumberColumn("Key Passes", format="%.1f"),
-                            "Progressive Passes": st.column_config.NumberColumn("Progressive Passes", format="%.1f"),
-                        }
-                    )
-                else:
-                    st.info("No players with 10+ progressive passes found")
-            else:
-                st.info("Key passes or progressive passes data not found")
+                render_leaderboard(df, 'key_pass_efficiency')
         
-        with col3:
-            st.markdown("""
+            with col3:
+                st.markdown("""
         <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #ffc107;'>
             <h4 style='margin: 0 0 0.5rem 0; color: #ffc107; font-size: 1rem;'>Maestro</h4>
             <p style='margin: 0; color: #6c757d; font-size: 0.8rem;'>Risk & creativity balance</p>
         </div>
         """, unsafe_allow_html=True)
             
-            if 'pass_KP' in df.columns and 'pass_PPA' in df.columns and 'std_xAG' in df.columns and 'pass_Cmp%' in df.columns:
-                # Calculate maestro: (KP * 2) + PPA + (xAG * 3) - ((100 - Cmp%) / 10)
-                df['maestro_score'] = ((df['pass_KP'] * 2) + df['pass_PPA'] + (df['std_xAG'] * 3) - ((100 - df['pass_Cmp%']) / 10)).fillna(0)
-                maestro_leaders = df.nlargest(5, 'maestro_score')[['Player', 'Squad', 'maestro_score', 'pass_KP', 'pass_PPA', 'std_xAG', 'pass_Cmp%']].copy()
-                maestro_leaders.columns = ['Player', 'Team', 'Maestro Score', 'Key Passes', 'Penalty Passes', 'xAG', 'Pass %']
-                maestro_leaders['Maestro Score'] = maestro_leaders['Maestro Score'].round(1)
-                maestro_leaders['Key Passes'] = maestro_leaders['Key Passes'].round(1)
-                maestro_leaders['Penalty Passes'] = maestro_leaders['Penalty Passes'].round(1)
-                maestro_leaders['xAG'] = maestro_leaders['xAG'].round(1)
-                maestro_leaders['Pass %'] = (maestro_leaders['Pass %'] * 100).round(1)
-                st.dataframe(
-                    maestro_leaders, 
-                    use_container_width=True, 
-                    hide_index=True,
-                    column_config={
-                        "Player": st.column_config.TextColumn("Player", width="medium"),
-                        "Team": st.column_config.TextColumn("Team", width="small"),
-                        "Maestro Score": st.column_config.ProgressColumn(
-                            "Maestro Score",
-                            format="%.1f",
-                            min_value=0,
-                            max_value=float(maestro_leaders['Maestro Score'].max()),
-                        ),
-                        "Key Passes": st.column_config.NumberColumn("Key Passes", format="%.1f"),
-                        "Penalty Passes": st.column_config.NumberColumn("Penalty Passes", format="%.1f"),
-                        "xAG": st.column_config.NumberColumn("xAG", format="%.1f"),
-                        "Pass %": st.column_config.NumberColumn("Pass %", format="%.1f%%"),
-                    }
-                )
-            else:
-                st.info("Maestro calculation data not found")
+                render_leaderboard(df, 'maestro_score')
         
-        # Second row of Creative & Passing Leaders
-        col4, col5, col6 = st.columns(3)
+            # Second row of Creative & Passing Leaders
+            col4, col5, col6 = st.columns(3)
         
-        with col4:
-            st.markdown("""
+            with col4:
+                st.markdown("""
         <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #6f42c1;'>
             <h4 style='margin: 0 0 0.5rem 0; color: #6f42c1; font-size: 1rem;'>Vertical Playmaker</h4>
             <p style='margin: 0; color: #6c757d; font-size: 0.8rem;'>Progressive passing threat</p>
         </div>
         """, unsafe_allow_html=True)
             
-            if 'pass_PrgP' in df.columns and 'pass_1/3' in df.columns and 'pass_PPA' in df.columns:
-                # Calculate vertical playmaker: PrgP + (1/3 * 2) + (PPA * 5)
-                df['vertical_playmaker'] = (df['pass_PrgP'] + (df['pass_1/3'] * 2) + (df['pass_PPA'] * 5)).fillna(0)
-                vertical_leaders = df.nlargest(5, 'vertical_playmaker')[['Player', 'Squad', 'vertical_playmaker', 'pass_PrgP', 'pass_1/3', 'pass_PPA']].copy()
-                vertical_leaders.columns = ['Player', 'Team', 'Vertical Score', 'Progressive Passes', 'Final Third', 'Penalty Passes']
-                vertical_leaders['Vertical Score'] = vertical_leaders['Vertical Score'].round(1)
-                vertical_leaders['Progressive Passes'] = vertical_leaders['Progressive Passes'].round(1)
-                vertical_leaders['Final Third'] = vertical_leaders['Final Third'].round(1)
-                vertical_leaders['Penalty Passes'] = vertical_leaders['Penalty Passes'].round(1)
-                st.dataframe(
-                    vertical_leaders, 
-                    use_container_width=True, 
-                    hide_index=True,
-                    column_config={
-                        "Player": st.column_config.TextColumn("Player", width="medium"),
-                        "Team": st.column_config.TextColumn("Team", width="small"),
-                        "Vertical Score": st.column_config.ProgressColumn(
-                            "Vertical Score",
-                            format="%.1f",
-                            min_value=0,
-                            max_value=float(vertical_leaders['Vertical Score'].max()),
-                        ),
-                        "Progressive Passes": st.column_config.NumberColumn("Progressive Passes", format="%.1f"),
-                        "Final Third": st.column_config.NumberColumn("Final Third", format="%.1f"),
-                        "Penalty Passes": st.column_config.NumberColumn("Penalty Passes", format="%.1f"),
-                    }
-                )
-            else:
-                st.info("Vertical playmaker data not found")
+                render_leaderboard(df, 'vertical_playmaker')
         
-        with col5:
-            st.markdown("""
+            with col5:
+                st.markdown("""
         <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #dc3545;'>
             <h4 style='margin: 0 0 0.5rem 0; color: #dc3545; font-size: 1rem;'>Press-Resistant Passer</h4>
             <p style='margin: 0; color: #6c757d; font-size: 0.8rem;'>Reliable under pressure</p>
         </div>
         """, unsafe_allow_html=True)
             
-            if 'pass_Cmp%' in df.columns and 'poss_Dis' in df.columns:
-                # Calculate press-resistant passer: Cmp% / (Dis + 1)
-                df['press_resistant'] = (df['pass_Cmp%'] / (df['poss_Dis'] + 1)).fillna(0)
-                # Filter out players with very low dispossessions to avoid misleading ratios
-                qualified_passers = df[df['poss_Dis'] >= 5]
-                if not qualified_passers.empty:
-                    press_leaders = qualified_passers.nlargest(5, 'press_resistant')[['Player', 'Squad', 'press_resistant', 'pass_Cmp%', 'poss_Dis']].copy()
-                    press_leaders.columns = ['Player', 'Team', 'Reliability Ratio', 'Pass %', 'Dispossessions']
-                    press_leaders['Reliability Ratio'] = press_leaders['Reliability Ratio'].round(2)
-                    press_leaders['Pass %'] = (press_leaders['Pass %'] * 100).round(1)
-                    press_leaders['Dispossessions'] = press_leaders['Dispossessions'].round(1)
-                    st.dataframe(
-                        press_leaders, 
-                        use_container_width=True, 
-                        hide_index=True,
-                        column_config={
-                            "Player": st.column_config.TextColumn("Player", width="medium"),
-                            "Team": st.column_config.TextColumn("Team", width="small"),
-                            "Reliability Ratio": st.column_config.ProgressColumn(
-                                "Reliability Ratio",
-                                format="%.2f",
-                                min_value=0,
-                                max_value=float(press_leaders['Reliability Ratio'].max()),
-                            ),
-                            "Pass %": st.column_config.NumberColumn("Pass %", format="%.1f%%"),
-                            "Dispossessions": st.column_config.NumberColumn("Dispossessions", format="%.1f"),
-                        }
-                    )
-                else:
-                    st.info("No qualified passers found")
-            else:
-                st.info("Pass accuracy or dispossessions data not found")
+                render_leaderboard(df, 'press_resistant')
         
-        with col6:
-            st.markdown("""
+            with col6:
+                st.markdown("""
         <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #17a2b8;'>
             <h4 style='margin: 0 0 0.5rem 0; color: #17a2b8; font-size: 1rem;'>Visionary</h4>
             <p style='margin: 0; color: #6c757d; font-size: 0.8rem;'>Long-range passing vision</p>
         </div>
         """, unsafe_allow_html=True)
             
-            if 'passt_Sw' in df.columns and 'passt_TB' in df.columns:
-                # Calculate visionary: Sw + (TB * 3)
-                df['visionary_score'] = (df['passt_Sw'] + (df['passt_TB'] * 3)).fillna(0)
-                visionary_leaders = df.nlargest(5, 'visionary_score')[['Player', 'Squad', 'visionary_score', 'passt_Sw', 'passt_TB']].copy()
-                visionary_leaders.columns = ['Player', 'Team', 'Vision Score', 'Switches', 'Through Balls']
-                visionary_leaders['Vision Score'] = visionary_leaders['Vision Score'].round(1)
-                visionary_leaders['Switches'] = visionary_leaders['Switches'].round(1)
-                visionary_leaders['Through Balls'] = visionary_leaders['Through Balls'].round(1)
-                st.dataframe(
-                    visionary_leaders, 
-                    use_container_width=True, 
-                    hide_index=True,
-                    column_config={
-                        "Player": st.column_config.TextColumn("Player", width="medium"),
-                        "Team": st.column_config.TextColumn("Team", width="small"),
-                        "Vision Score": st.column_config.ProgressColumn(
-                            "Vision Score",
-                            format="%.1f",
-                            min_value=0,
-                            max_value=float(visionary_leaders['Vision Score'].max()),
-                        ),
-                        "Switches": st.column_config.NumberColumn("Switches", format="%.1f"),
-                        "Through Balls": st.column_config.NumberColumn("Through Balls", format="%.1f"),
-                    }
-                )
-            else:
-                st.info("Switch or through ball data not found")
+                render_leaderboard(df, 'visionary_score')
     
-    with sub_tab2:
-        # Defensive Leaders content
-        st.markdown("""
+        with sub_tab2:
+            # Defensive Leaders content
+            st.markdown("""
         <div style='margin: 2rem 0 1.5rem 0;'>
             <h2 style='font-size: 1.5rem; font-weight: 600; text-align: center; color: #2563eb;'>
                  Defensive Leaders
@@ -3338,159 +4264,54 @@ with tab5:
         </div>
         """, unsafe_allow_html=True)
         
-        col_def1, col_def2 = st.columns(2)
+            col_def1, col_def2 = st.columns(2)
         
-        with col_def1:
-            st.markdown("""
+            with col_def1:
+                st.markdown("""
         <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #2563eb;'>
             <h4 style='margin: 0 0 0.5rem 0; color: #2563eb; font-size: 1rem;'>Defensive Efficiency</h4>
             <p style='margin: 0; color: #6c757d; font-size: 0.8rem;'>Per 90 minutes</p>
         </div>
         """, unsafe_allow_html=True)
             
-            if 'def_Tkl' in df.columns and 'def_Int' in df.columns and 'std_Min' in df.columns:
-                df['defensive_efficiency'] = ((df['def_Tkl'] + df['def_Int']) / (df['std_Min'] / 90)).fillna(0)
-                defensive_leaders = df.nlargest(5, 'defensive_efficiency')[['Player', 'Squad', 'defensive_efficiency']].copy()
-                defensive_leaders.columns = ['Player', 'Team', 'Tackles+Int per 90']
-                defensive_leaders['Tackles+Int per 90'] = defensive_leaders['Tackles+Int per 90'].round(2)
-                st.dataframe(
-                    defensive_leaders, 
-                    use_container_width=True, 
-                    hide_index=True,
-                    column_config={
-                        "Player": st.column_config.TextColumn("Player", width="medium"),
-                        "Team": st.column_config.TextColumn("Team", width="small"),
-                        "Tackles+Int per 90": st.column_config.ProgressColumn(
-                            "Tackles+Int per 90",
-                            format="%.2f",
-                            min_value=0,
-                            max_value=float(defensive_leaders['Tackles+Int per 90'].max()),
-                        ),
-                    }
-                )
-            else:
-                st.info("Defensive or minutes data not found")
+                render_leaderboard(df, 'defensive_efficiency')
         
-        with col_def2:
-            st.markdown("""
+            with col_def2:
+                st.markdown("""
         <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #28a745;'>
             <h4 style='margin: 0 0 0.5rem 0; color: #28a745; font-size: 1rem;'>Recovery Rate</h4>
             <p style='margin: 0; color: #6c757d; font-size: 0.8rem;'>Per 90 minutes</p>
         </div>
         """, unsafe_allow_html=True)
             
-            if 'misc_Recov' in df.columns and 'std_Min' in df.columns:
-                df['recovery_rate'] = (df['misc_Recov'] / (df['std_Min'] / 90)).fillna(0)
-                recovery_leaders = df.nlargest(5, 'recovery_rate')[['Player', 'Squad', 'recovery_rate']].copy()
-                recovery_leaders.columns = ['Player', 'Team', 'Recoveries per 90']
-                recovery_leaders['Recoveries per 90'] = recovery_leaders['Recoveries per 90'].round(2)
-                st.dataframe(
-                    recovery_leaders, 
-                    use_container_width=True, 
-                    hide_index=True,
-                    column_config={
-                        "Player": st.column_config.TextColumn("Player", width="medium"),
-                        "Team": st.column_config.TextColumn("Team", width="small"),
-                        "Recoveries per 90": st.column_config.ProgressColumn(
-                            "Recoveries per 90",
-                            format="%.2f",
-                            min_value=0,
-                            max_value=float(recovery_leaders['Recoveries per 90'].max()),
-                        ),
-                    }
-                )
-            else:
-                st.info("Recovery or minutes data not found")
+                render_leaderboard(df, 'recovery_rate')
         
-        # Second row of Defensive Leaders
-        col_def3, col_def4 = st.columns(2)
+            # Second row of Defensive Leaders
+            col_def3, col_def4 = st.columns(2)
         
-        with col_def3:
-            st.markdown("""
+            with col_def3:
+                st.markdown("""
         <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #ffc107;'>
             <h4 style='margin: 0 0 0.5rem 0; color: #ffc107; font-size: 1rem;'>Defensive Intelligence</h4>
             <p style='margin: 0; color: #6c757d; font-size: 0.8rem;'>Interceptions vs Tackles ratio</p>
         </div>
         """, unsafe_allow_html=True)
             
-            if 'def_Int' in df.columns and 'def_Tkl' in df.columns:
-                # Calculate defensive intelligence: Int / Tkl
-                df['defensive_intelligence'] = (df['def_Int'] / df['def_Tkl']).fillna(0)
-                # Filter out players with very low defensive actions
-                qualified_defenders = df[(df['def_Tkl'] >= 5) & (df['def_Int'] >= 3)]
-                if not qualified_defenders.empty:
-                    intelligence_leaders = qualified_defenders.nlargest(5, 'defensive_intelligence')[['Player', 'Squad', 'defensive_intelligence', 'def_Int', 'def_Tkl']].copy()
-                    intelligence_leaders.columns = ['Player', 'Team', 'Intelligence Ratio', 'Interceptions', 'Tackles']
-                    intelligence_leaders['Intelligence Ratio'] = intelligence_leaders['Intelligence Ratio'].round(2)
-                    intelligence_leaders['Interceptions'] = intelligence_leaders['Interceptions'].round(1)
-                    intelligence_leaders['Tackles'] = intelligence_leaders['Tackles'].round(1)
-                    st.dataframe(
-                        intelligence_leaders, 
-                        use_container_width=True, 
-                        hide_index=True,
-                        column_config={
-                            "Player": st.column_config.TextColumn("Player", width="medium"),
-                            "Team": st.column_config.TextColumn("Team", width="small"),
-                            "Intelligence Ratio": st.column_config.ProgressColumn(
-                                "Intelligence Ratio",
-                                format="%.2f",
-                                min_value=0,
-                                max_value=float(intelligence_leaders['Intelligence Ratio'].max()),
-                            ),
-                            "Interceptions": st.column_config.NumberColumn("Interceptions", format="%.1f"),
-                            "Tackles": st.column_config.NumberColumn("Tackles", format="%.1f"),
-                        }
-                    )
-                else:
-                    st.info("No qualified defenders found")
-            else:
-                st.info("Interceptions or tackles data not found")
+                render_leaderboard(df, 'defensive_intelligence')
         
-        with col_def4:
-            st.markdown("""
+            with col_def4:
+                st.markdown("""
         <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #6f42c1;'>
             <h4 style='margin: 0 0 0.5rem 0; color: #6f42c1; font-size: 1rem;'>High Press Percentage</h4>
             <p style='margin: 0; color: #6c757d; font-size: 0.8rem;'>Defensive actions in attacking third</p>
         </div>
         """, unsafe_allow_html=True)
             
-            if 'def_Att 3rd' in df.columns and 'def_Def 3rd' in df.columns and 'def_Mid 3rd' in df.columns:
-                # Calculate high press percentage
-                df['total_def_actions'] = df['def_Def 3rd'] + df['def_Mid 3rd'] + df['def_Att 3rd']
-                df['high_press_pct'] = (df['def_Att 3rd'] / df['total_def_actions'] * 100).fillna(0)
-                # Filter out players with very low defensive actions
-                qualified_pressers = df[df['total_def_actions'] >= 10]
-                if not qualified_pressers.empty:
-                    press_leaders = qualified_pressers.nlargest(5, 'high_press_pct')[['Player', 'Squad', 'high_press_pct', 'def_Att 3rd', 'total_def_actions']].copy()
-                    press_leaders.columns = ['Player', 'Team', 'High Press %', 'Attacking Third', 'Total Actions']
-                    press_leaders['High Press %'] = press_leaders['High Press %'].round(1)
-                    press_leaders['Attacking Third'] = press_leaders['Attacking Third'].round(1)
-                    press_leaders['Total Actions'] = press_leaders['Total Actions'].round(1)
-                    st.dataframe(
-                        press_leaders, 
-                        use_container_width=True, 
-                        hide_index=True,
-                        column_config={
-                            "Player": st.column_config.TextColumn("Player", width="medium"),
-                            "Team": st.column_config.TextColumn("Team", width="small"),
-                            "High Press %": st.column_config.ProgressColumn(
-                                "High Press %",
-                                format="%.1f%%",
-                                min_value=0,
-                                max_value=100.0,
-                            ),
-                            "Attacking Third": st.column_config.NumberColumn("Attacking Third", format="%.1f"),
-                            "Total Actions": st.column_config.NumberColumn("Total Actions", format="%.1f"),
-                        }
-                    )
-                else:
-                    st.info("No qualified pressers found")
-            else:
-                st.info("Defensive third data not found")
+                render_leaderboard(df, 'high_press_pct')
     
-    with sub_tab3:
-        # Attacking Leaders content
-        st.markdown("""
+        with sub_tab3:
+            # Attacking Leaders content
+            st.markdown("""
         <div style='margin: 2rem 0 1.5rem 0;'>
             <h2 style='font-size: 1.5rem; font-weight: 600; text-align: center; color: #2563eb;'>
                  Attacking Leaders
@@ -3501,209 +4322,63 @@ with tab5:
         </div>
         """, unsafe_allow_html=True)
         
-        col5, col6, col7 = st.columns(3)
+            col5, col6, col7 = st.columns(3)
         
-        with col5:
-            st.markdown("""
+            with col5:
+                st.markdown("""
         <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #2563eb;'>
             <h4 style='margin: 0 0 0.5rem 0; color: #2563eb; font-size: 1rem;'>Most Clinical Finishers</h4>
             <p style='margin: 0; color: #6c757d; font-size: 0.8rem;'>Goals vs xG efficiency <span style='color: #dc3545; font-size: 0.75rem; font-weight: 500;'>*Minimum 5 goals required*</span></p>
         </div>
         """, unsafe_allow_html=True)
             
-            if 'std_Gls' in df.columns and 'std_xG' in df.columns and 'Gls' in df.columns:
-                # Filter players with at least 5 goals
-                qualified_finishers = df[df['Gls'] >= 5]
-                if not qualified_finishers.empty:
-                    # Calculate goals vs xG ratio (clinical finishing)
-                    qualified_finishers = qualified_finishers.copy()
-                    qualified_finishers['clinical_ratio'] = qualified_finishers['std_Gls'] / qualified_finishers['std_xG'].replace(0, 0.1)  # Avoid division by zero
-                    clinical_leaders = qualified_finishers.nlargest(5, 'clinical_ratio')[['Player', 'Squad', 'std_Gls', 'std_xG', 'clinical_ratio']].copy()
-                    clinical_leaders.columns = ['Player', 'Team', 'Goals', 'xG', 'Goals/xG Ratio']
-                    clinical_leaders['Goals/xG Ratio'] = clinical_leaders['Goals/xG Ratio'].round(2)
-                    clinical_leaders['Goals'] = clinical_leaders['Goals'].round(1)
-                    clinical_leaders['xG'] = clinical_leaders['xG'].round(1)
-                    st.dataframe(
-                        clinical_leaders, 
-                        use_container_width=True, 
-                        hide_index=True,
-                        column_config={
-                            "Player": st.column_config.TextColumn("Player", width="medium"),
-                            "Team": st.column_config.TextColumn("Team", width="small"),
-                            "Goals": st.column_config.NumberColumn("Goals", format="%.1f"),
-                            "xG": st.column_config.NumberColumn("xG", format="%.1f"),
-                            "Goals/xG Ratio": st.column_config.ProgressColumn(
-                                "Goals/xG Ratio",
-                                format="%.2f",
-                                min_value=0,
-                                max_value=float(clinical_leaders['Goals/xG Ratio'].max()),
-                            ),
-                        }
-                    )
-                else:
-                    st.info("No players with 5+ goals found")
-            else:
-                st.info("Goals or xG data not found")
+                render_leaderboard(df, 'clinical_ratio')
         
-        with col6:
-            st.markdown("""
+            with col6:
+                st.markdown("""
         <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #28a745;'>
             <h4 style='margin: 0 0 0.5rem 0; color: #28a745; font-size: 1rem;'>Penalty Area Threat</h4>
             <p style='margin: 0; color: #6c757d; font-size: 0.8rem;'>Danger in and around penalty area</p>
         </div>
         """, unsafe_allow_html=True)
             
-            if 'pass_PPA' in df.columns and 'poss_CPA' in df.columns and 'std_PrgR' in df.columns:
-                # Calculate penalty area threat: PPA + CPA + PrgR
-                df['penalty_area_threat'] = (df['pass_PPA'] + df['poss_CPA'] + df['std_PrgR']).fillna(0)
-                threat_leaders = df.nlargest(5, 'penalty_area_threat')[['Player', 'Squad', 'penalty_area_threat', 'pass_PPA', 'poss_CPA', 'std_PrgR']].copy()
-                threat_leaders.columns = ['Player', 'Team', 'Threat Score', 'Penalty Passes', 'Penalty Carries', 'Penalty Receives']
-                threat_leaders['Threat Score'] = threat_leaders['Threat Score'].round(1)
-                threat_leaders['Penalty Passes'] = threat_leaders['Penalty Passes'].round(1)
-                threat_leaders['Penalty Carries'] = threat_leaders['Penalty Carries'].round(1)
-                threat_leaders['Penalty Receives'] = threat_leaders['Penalty Receives'].round(1)
-                st.dataframe(
-                    threat_leaders, 
-                    use_container_width=True, 
-                    hide_index=True,
-                    column_config={
-                        "Player": st.column_config.TextColumn("Player", width="medium"),
-                        "Team": st.column_config.TextColumn("Team", width="small"),
-                        "Threat Score": st.column_config.ProgressColumn(
-                            "Threat Score",
-                            format="%.1f",
-                            min_value=0,
-                            max_value=float(threat_leaders['Threat Score'].max()),
-                        ),
-                        "Penalty Passes": st.column_config.NumberColumn("Penalty Passes", format="%.1f"),
-                        "Penalty Carries": st.column_config.NumberColumn("Penalty Carries", format="%.1f"),
-                        "Penalty Receives": st.column_config.NumberColumn("Penalty Receives", format="%.1f"),
-                    }
-                )
-            else:
-                st.info("Penalty area data not found")
+                render_leaderboard(df, 'penalty_area_threat')
         
-        with col7:
-            st.markdown("""
+            with col7:
+                st.markdown("""
         <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #ffc107;'>
             <h4 style='margin: 0 0 0.5rem 0; color: #ffc107; font-size: 1rem;'>One-Man Army</h4>
             <p style='margin: 0; color: #6c757d; font-size: 0.8rem;'>Individual skill creating positions</p>
         </div>
         """, unsafe_allow_html=True)
             
-            if 'gca_TO' in df.columns and 'gca_Fld' in df.columns and 'poss_CPA' in df.columns:
-                # Calculate one-man army: (TO * 10) + (Fld * 5) + CPA
-                df['one_man_army'] = ((df['gca_TO'] * 10) + (df['gca_Fld'] * 5) + df['poss_CPA']).fillna(0)
-                army_leaders = df.nlargest(5, 'one_man_army')[['Player', 'Squad', 'one_man_army', 'gca_TO', 'gca_Fld', 'poss_CPA']].copy()
-                army_leaders.columns = ['Player', 'Team', 'Army Score', 'Take-Ons', 'Fouls Won', 'Penalty Carries']
-                army_leaders['Army Score'] = army_leaders['Army Score'].round(1)
-                army_leaders['Take-Ons'] = army_leaders['Take-Ons'].round(1)
-                army_leaders['Fouls Won'] = army_leaders['Fouls Won'].round(1)
-                army_leaders['Penalty Carries'] = army_leaders['Penalty Carries'].round(1)
-                st.dataframe(
-                    army_leaders, 
-                    use_container_width=True, 
-                    hide_index=True,
-                    column_config={
-                        "Player": st.column_config.TextColumn("Player", width="medium"),
-                        "Team": st.column_config.TextColumn("Team", width="small"),
-                        "Army Score": st.column_config.ProgressColumn(
-                            "Army Score",
-                            format="%.1f",
-                            min_value=0,
-                            max_value=float(army_leaders['Army Score'].max()),
-                        ),
-                        "Take-Ons": st.column_config.NumberColumn("Take-Ons", format="%.1f"),
-                        "Fouls Won": st.column_config.NumberColumn("Fouls Won", format="%.1f"),
-                        "Penalty Carries": st.column_config.NumberColumn("Penalty Carries", format="%.1f"),
-                    }
-                )
-            else:
-                st.info("Individual skill data not found")
+                render_leaderboard(df, 'one_man_army')
         
-        # Second row of Attacking & Ball Carrying Leaders
-        col8, col9 = st.columns(2)
+            # Second row of Attacking & Ball Carrying Leaders
+            col8, col9 = st.columns(2)
         
-        with col8:
-            st.markdown("""
+            with col8:
+                st.markdown("""
         <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #6f42c1;'>
             <h4 style='margin: 0 0 0.5rem 0; color: #6f42c1; font-size: 1rem;'>Set Piece Maestro</h4>
             <p style='margin: 0; color: #6c757d; font-size: 0.8rem;'>Dead ball specialist</p>
         </div>
         """, unsafe_allow_html=True)
             
-            if 'gca_PassDead' in df.columns and 'passt_Crs' in df.columns:
-                # Calculate set piece maestro: (PassDead * 10) + Crs
-                df['set_piece_maestro'] = ((df['gca_PassDead'] * 10) + df['passt_Crs']).fillna(0)
-                maestro_leaders = df.nlargest(5, 'set_piece_maestro')[['Player', 'Squad', 'set_piece_maestro', 'gca_PassDead', 'passt_Crs']].copy()
-                maestro_leaders.columns = ['Player', 'Team', 'Maestro Score', 'Dead Ball Assists', 'Crosses']
-                maestro_leaders['Maestro Score'] = maestro_leaders['Maestro Score'].round(1)
-                maestro_leaders['Dead Ball Assists'] = maestro_leaders['Dead Ball Assists'].round(1)
-                maestro_leaders['Crosses'] = maestro_leaders['Crosses'].round(1)
-                st.dataframe(
-                    maestro_leaders, 
-                    use_container_width=True, 
-                    hide_index=True,
-                    column_config={
-                        "Player": st.column_config.TextColumn("Player", width="medium"),
-                        "Team": st.column_config.TextColumn("Team", width="small"),
-                        "Maestro Score": st.column_config.ProgressColumn(
-                            "Maestro Score",
-                            format="%.1f",
-                            min_value=0,
-                            max_value=float(maestro_leaders['Maestro Score'].max()),
-                        ),
-                        "Dead Ball Assists": st.column_config.NumberColumn("Dead Ball Assists", format="%.1f"),
-                        "Crosses": st.column_config.NumberColumn("Crosses", format="%.1f"),
-                    }
-                )
-            else:
-                st.info("Set piece data not found")
+                render_leaderboard(df, 'set_piece_maestro')
         
-        with col9:
-            st.markdown("""
+            with col9:
+                st.markdown("""
         <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #dc3545;'>
             <h4 style='margin: 0 0 0.5rem 0; color: #dc3545; font-size: 1rem;'>Most Clinical Playmakers</h4>
             <p style='margin: 0; color: #6c757d; font-size: 0.8rem;'>Assists vs xAG efficiency <span style='color: #dc3545; font-size: 0.75rem; font-weight: 500;'>*Minimum 5 assists required*</span></p>
         </div>
         """, unsafe_allow_html=True)
             
-            if 'std_Ast' in df.columns and 'std_xAG' in df.columns and 'Ast' in df.columns:
-                # Filter players with at least 5 assists
-                qualified_playmakers = df[df['Ast'] >= 5]
-                if not qualified_playmakers.empty:
-                    # Calculate assists vs xAG ratio (clinical playmaking)
-                    qualified_playmakers = qualified_playmakers.copy()
-                    qualified_playmakers['playmaking_ratio'] = qualified_playmakers['std_Ast'] / qualified_playmakers['std_xAG'].replace(0, 0.1)  # Avoid division by zero
-                    playmaking_leaders = qualified_playmakers.nlargest(5, 'playmaking_ratio')[['Player', 'Squad', 'std_Ast', 'std_xAG', 'playmaking_ratio']].copy()
-                    playmaking_leaders.columns = ['Player', 'Team', 'Assists', 'xAG', 'Assists/xAG Ratio']
-                    playmaking_leaders['Assists/xAG Ratio'] = playmaking_leaders['Assists/xAG Ratio'].round(2)
-                    playmaking_leaders['Assists'] = playmaking_leaders['Assists'].round(1)
-                    playmaking_leaders['xAG'] = playmaking_leaders['xAG'].round(1)
-                    st.dataframe(
-                        playmaking_leaders, 
-                        use_container_width=True, 
-                        hide_index=True,
-                        column_config={
-                            "Player": st.column_config.TextColumn("Player", width="medium"),
-                            "Team": st.column_config.TextColumn("Team", width="small"),
-                            "Assists": st.column_config.NumberColumn("Assists", format="%.1f"),
-                            "xAG": st.column_config.NumberColumn("xAG", format="%.1f"),
-                            "Assists/xAG Ratio": st.column_config.ProgressColumn(
-                                "Assists/xAG Ratio",
-                                format="%.2f",
-                                min_value=0,
-                                max_value=float(playmaking_leaders['Assists/xAG Ratio'].max()),
-                            ),
-                        }
-                    )
-                else:
-                    st.info("No players with 5+ assists found")
-            else:
-                st.info("Assists or xAG data not found")
+                render_leaderboard(df, 'playmaking_ratio')
         
-        # Dribble & Ball Carrying Specialists section
-        st.markdown("""
+            # Dribble & Ball Carrying Specialists section
+            st.markdown("""
         <div style='margin: 2rem 0 1.5rem 0;'>
             <h2 style='font-size: 1.5rem; font-weight: 600; text-align: center; color: #2563eb;'>
                  Dribble & Ball Carrying Specialists
@@ -3714,171 +4389,56 @@ with tab5:
         </div>
         """, unsafe_allow_html=True)
         
-        col_drib1, col_drib2 = st.columns(2)
+            col_drib1, col_drib2 = st.columns(2)
         
-        with col_drib1:
-            st.markdown("""
+            with col_drib1:
+                st.markdown("""
         <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #2563eb;'>
             <h4 style='margin: 0 0 0.5rem 0; color: #2563eb; font-size: 1rem;'>Progressive Ball Carrier</h4>
             <p style='margin: 0; color: #6c757d; font-size: 0.8rem;'>Vertical ball carrying threat</p>
         </div>
         """, unsafe_allow_html=True)
             
-            if 'poss_PrgC' in df.columns and 'poss_1/3' in df.columns and 'poss_CPA' in df.columns:
-                # Calculate progressive ball carrier: PrgC + (1/3 * 2) + (CPA * 5)
-                df['progressive_carrier'] = (df['poss_PrgC'] + (df['poss_1/3'] * 2) + (df['poss_CPA'] * 5)).fillna(0)
-                carrier_leaders = df.nlargest(5, 'progressive_carrier')[['Player', 'Squad', 'progressive_carrier', 'poss_PrgC', 'poss_1/3', 'poss_CPA']].copy()
-                carrier_leaders.columns = ['Player', 'Team', 'Carrier Score', 'Progressive Carries', 'Final Third', 'Penalty Area']
-                carrier_leaders['Carrier Score'] = carrier_leaders['Carrier Score'].round(1)
-                carrier_leaders['Progressive Carries'] = carrier_leaders['Progressive Carries'].round(1)
-                carrier_leaders['Final Third'] = carrier_leaders['Final Third'].round(1)
-                carrier_leaders['Penalty Area'] = carrier_leaders['Penalty Area'].round(1)
-                st.dataframe(
-                    carrier_leaders, 
-                    use_container_width=True, 
-                    hide_index=True,
-                    column_config={
-                        "Player": st.column_config.TextColumn("Player", width="medium"),
-                        "Team": st.column_config.TextColumn("Team", width="small"),
-                        "Carrier Score": st.column_config.ProgressColumn(
-                            "Carrier Score",
-                            format="%.1f",
-                            min_value=0,
-                            max_value=float(carrier_leaders['Carrier Score'].max()),
-                        ),
-                        "Progressive Carries": st.column_config.NumberColumn("Progressive Carries", format="%.1f"),
-                        "Final Third": st.column_config.NumberColumn("Final Third", format="%.1f"),
-                        "Penalty Area": st.column_config.NumberColumn("Penalty Area", format="%.1f"),
-                    }
-                )
-            else:
-                st.info("Ball carrying data not found")
+                render_leaderboard(df, 'progressive_carrier')
         
-        with col_drib2:
-            st.markdown("""
+            with col_drib2:
+                st.markdown("""
         <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #28a745;'>
             <h4 style='margin: 0 0 0.5rem 0; color: #28a745; font-size: 1rem;'>Press Breaker</h4>
             <p style='margin: 0; color: #6c757d; font-size: 0.8rem;'>Reliable under pressure</p>
         </div>
         """, unsafe_allow_html=True)
             
-            if 'poss_Carries' in df.columns and 'poss_Dis' in df.columns:
-                # Calculate press breaker: Carries / (Dis + 1)
-                df['press_breaker'] = (df['poss_Carries'] / (df['poss_Dis'] + 1)).fillna(0)
-                # Filter out players with very low carries to avoid misleading ratios
-                qualified_carriers = df[df['poss_Carries'] >= 20]
-                if not qualified_carriers.empty:
-                    breaker_leaders = qualified_carriers.nlargest(5, 'press_breaker')[['Player', 'Squad', 'press_breaker', 'poss_Carries', 'poss_Dis']].copy()
-                    breaker_leaders.columns = ['Player', 'Team', 'Reliability Ratio', 'Total Carries', 'Dispossessions']
-                    breaker_leaders['Reliability Ratio'] = breaker_leaders['Reliability Ratio'].round(2)
-                    breaker_leaders['Total Carries'] = breaker_leaders['Total Carries'].round(1)
-                    breaker_leaders['Dispossessions'] = breaker_leaders['Dispossessions'].round(1)
-                    st.dataframe(
-                        breaker_leaders, 
-                        use_container_width=True, 
-                        hide_index=True,
-                        column_config={
-                            "Player": st.column_config.TextColumn("Player", width="medium"),
-                            "Team": st.column_config.TextColumn("Team", width="small"),
-                            "Reliability Ratio": st.column_config.ProgressColumn(
-                                "Reliability Ratio",
-                                format="%.2f",
-                                min_value=0,
-                                max_value=float(breaker_leaders['Reliability Ratio'].max()),
-                            ),
-                            "Total Carries": st.column_config.NumberColumn("Total Carries", format="%.1f"),
-                            "Dispossessions": st.column_config.NumberColumn("Dispossessions", format="%.1f"),
-                        }
-                    )
-                else:
-                    st.info("No players with 20+ carries found")
-            else:
-                st.info("Carries or dispossessions data not found")
+                render_leaderboard(df, 'press_breaker')
         
-        # Second row of Dribble & Ball Carrying Specialists
-        col_drib3, col_drib4 = st.columns(2)
+            # Second row of Dribble & Ball Carrying Specialists
+            col_drib3, col_drib4 = st.columns(2)
         
-        with col_drib3:
-            st.markdown("""
+            with col_drib3:
+                st.markdown("""
         <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #ffc107;'>
             <h4 style='margin: 0 0 0.5rem 0; color: #ffc107; font-size: 1rem;'>End-Product Dribbler</h4>
             <p style='margin: 0; color: #6c757d; font-size: 0.8rem;'>Dribbling with goal threat</p>
         </div>
         """, unsafe_allow_html=True)
             
-            if 'gca_TO' in df.columns and 'poss_Carries' in df.columns:
-                # Calculate end-product dribbler: (TO * 100) / Carries
-                df['end_product_dribbler'] = ((df['gca_TO'] * 100) / df['poss_Carries']).fillna(0)
-                # Filter out players with very low carries to avoid misleading ratios
-                qualified_dribblers = df[df['poss_Carries'] >= 20]
-                if not qualified_dribblers.empty:
-                    dribbler_leaders = qualified_dribblers.nlargest(5, 'end_product_dribbler')[['Player', 'Squad', 'end_product_dribbler', 'gca_TO', 'poss_Carries']].copy()
-                    dribbler_leaders.columns = ['Player', 'Team', 'End-Product %', 'Take-Ons', 'Total Carries']
-                    dribbler_leaders['End-Product %'] = dribbler_leaders['End-Product %'].round(1)
-                    dribbler_leaders['Take-Ons'] = dribbler_leaders['Take-Ons'].round(1)
-                    dribbler_leaders['Total Carries'] = dribbler_leaders['Total Carries'].round(1)
-                    st.dataframe(
-                        dribbler_leaders, 
-                        use_container_width=True, 
-                        hide_index=True,
-                        column_config={
-                            "Player": st.column_config.TextColumn("Player", width="medium"),
-                            "Team": st.column_config.TextColumn("Team", width="small"),
-                            "End-Product %": st.column_config.ProgressColumn(
-                                "End-Product %",
-                                format="%.1f%%",
-                                min_value=0,
-                                max_value=float(dribbler_leaders['End-Product %'].max()),
-                            ),
-                            "Take-Ons": st.column_config.NumberColumn("Take-Ons", format="%.1f"),
-                            "Total Carries": st.column_config.NumberColumn("Total Carries", format="%.1f"),
-                        }
-                    )
-                else:
-                    st.info("No players with 20+ carries found")
-            else:
-                st.info("Take-ons or carries data not found")
+                render_leaderboard(df, 'end_product_dribbler')
         
-        with col_drib4:
-            st.markdown("""
+            with col_drib4:
+                st.markdown("""
         <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 4px solid #6f42c1;'>
             <h4 style='margin: 0 0 0.5rem 0; color: #6f42c1; font-size: 1rem;'>Dribble Impact Score</h4>
             <p style='margin: 0; color: #6c757d; font-size: 0.8rem;'>Progressive carries + defensive disruption</p>
         </div>
         """, unsafe_allow_html=True)
             
-            if 'poss_PrgC' in df.columns and 'gca_TO' in df.columns:
-                # Calculate dribble impact: PrgC + (gca_TO * 10)
-                df['dribble_impact'] = (df['poss_PrgC'] + (df['gca_TO'] * 10)).fillna(0)
-                dribble_leaders = df.nlargest(5, 'dribble_impact')[['Player', 'Squad', 'dribble_impact', 'poss_PrgC', 'gca_TO']].copy()
-                dribble_leaders.columns = ['Player', 'Team', 'Impact Score', 'Progressive Carries', 'Take-Ons']
-                dribble_leaders['Impact Score'] = dribble_leaders['Impact Score'].round(1)
-                dribble_leaders['Progressive Carries'] = dribble_leaders['Progressive Carries'].round(1)
-                dribble_leaders['Take-Ons'] = dribble_leaders['Take-Ons'].round(1)
-                st.dataframe(
-                    dribble_leaders, 
-                    use_container_width=True, 
-                    hide_index=True,
-                    column_config={
-                        "Player": st.column_config.TextColumn("Player", width="medium"),
-                        "Team": st.column_config.TextColumn("Team", width="small"),
-                        "Impact Score": st.column_config.ProgressColumn(
-                            "Impact Score",
-                            format="%.1f",
-                            min_value=0,
-                            max_value=float(dribble_leaders['Impact Score'].max()),
-                        ),
-                        "Progressive Carries": st.column_config.NumberColumn("Progressive Carries", format="%.1f"),
-                        "Take-Ons": st.column_config.NumberColumn("Take-Ons", format="%.1f"),
-                    }
-                )
-            else:
-                st.info("Progressive carries or take-ons data not found")
+                render_leaderboard(df, 'dribble_impact')
 
 
 
 with tab6:
-    st.markdown("""
+    if tab6.open:
+        st.markdown("""
     <div style='text-align: center; margin: 2rem 0 1.5rem 0;'>
         <h1 style='font-size: 1.8rem; font-weight: 600; margin: 0; color: #2563eb;'>
             Trend & Line Chart Analyses
@@ -3889,8 +4449,8 @@ with tab6:
     </div>
     """, unsafe_allow_html=True)
 
-    with st.expander("How to read trend charts (Click to expand)", expanded=False):
-        st.markdown("""
+        with st.expander("How to read trend charts (Click to expand)", expanded=False):
+            st.markdown("""
         **Understanding trends:**
         - Line charts show average performance at different levels
         - Multiple lines allow comparison across metrics
@@ -3902,435 +4462,277 @@ with tab6:
         - Understand playing time impact on performance
         """)
 
-    st.markdown("---")
+        st.markdown("---")
 
-    # Create tabs for different trend analyses
-    trend_tab1, trend_tab2, trend_tab3= st.tabs([
-        "Age Trends", 
-        "Playing Time Trends",
-        "Team Performance Trends", 
-    ])
+        # Create tabs for different trend analyses
+        trend_tab1, trend_tab2, trend_tab3= st.tabs([
+            "Age Trends", 
+            "Playing Time Trends",
+            "Team Performance Trends", 
+        ])
 
-    with trend_tab1:
-        st.markdown("### Performance Trends by Age")
-        st.markdown("Analyze how different performance metrics change with player age.")
+        with trend_tab1:
+            st.markdown("### Performance Trends by Age")
+            st.markdown("Analyze how different performance metrics change with player age.")
         
-        # Age trend analysis
-        age_groups = df.groupby('Age').agg({
-            'std_Gls': 'mean',
-            'std_Ast': 'mean', 
-            'std_xG': 'mean',
-            'std_xAG': 'mean',
-            'pass_KP': 'mean',
-            'def_Tkl': 'mean',
-            'def_Int': 'mean',
-            'Player': 'count'
-        }).reset_index()
-        age_groups.rename(columns={'Player': 'Player_Count'}, inplace=True)
+            # Age trend analysis (slice of the precomputed trend cube)
+            age_groups = trend_cube.summary('Age', ['std_Gls', 'std_Ast', 'std_xG', 'std_xAG', 'pass_KP', 'def_Tkl', 'def_Int'])
         
-        # Filter out ages with very few players (less than 2)
-        age_groups = age_groups[age_groups['Player_Count'] >= 2]
+            # Filter out ages with very few players (less than 2)
+            age_groups = age_groups[age_groups['Player_Count'] >= 2]
         
-        if not age_groups.empty:
-            # Create line chart for offensive metrics
-            fig_age_trend = go.Figure()
+            if not age_groups.empty:
+                # Create line chart for offensive metrics
+                fig_age_trend = go.Figure()
             
-            fig_age_trend.add_trace(go.Scatter(
-                x=age_groups['Age'],
-                y=age_groups['std_Gls'],
-                mode='lines+markers',
-                name='Goals per Game',
-                line=dict(color='#FF6B6B', width=3),
-                marker=dict(size=8)
-            ))
-            
-            fig_age_trend.add_trace(go.Scatter(
-                x=age_groups['Age'],
-                y=age_groups['std_Ast'],
-                mode='lines+markers',
-                name='Assists per Game',
-                line=dict(color='#4ECDC4', width=3),
-                marker=dict(size=8)
-            ))
+                fig_age_trend.add_trace(go.Scatter(
+                    x=age_groups['Age'],
+                    y=age_groups['std_Gls'],
+                    mode='lines+markers',
+                    name='Goals per Game',
+                    line=dict(color='#FF6B6B', width=3),
+                    marker=dict(size=8)
+                ))
             
-            fig_age_trend.add_trace(go.Scatter(
-                x=age_groups['Age'],
-                y=age_groups['pass_KP'],
-                mode='lines+markers',
-                name='Key Passes per Game',
-                line=dict(color='#45B7D1', width=3),
-                marker=dict(size=8)
-            ))
+                fig_age_trend.add_trace(go.Scatter(
+                    x=age_groups['Age'],
+                    y=age_groups['std_Ast'],
+                    mode='lines+markers',
+                    name='Assists per Game',
+                    line=dict(color='#4ECDC4', width=3),
+                    marker=dict(size=8)
+                ))
             
-            fig_age_trend.update_layout(
-                title="Offensive Performance Trends by Age",
-                xaxis_title="Age",
-                yaxis_title="Average per Game",
-                template='plotly_dark',
-                height=500,
-                hovermode='x unified'
-            )
+                fig_age_trend.add_trace(go.Scatter(
+                    x=age_groups['Age'],
+                    y=age_groups['pass_KP'],
+                    mode='lines+markers',
+                    name='Key Passes per Game',
+                    line=dict(color='#45B7D1', width=3),
+                    marker=dict(size=8)
+                ))
             
-            st.plotly_chart(fig_age_trend, use_container_width=True, key="age_trend_offensive")
+                fig_age_trend.update_layout(
+                    title="Offensive Performance Trends by Age",
+                    xaxis_title="Age",
+                    yaxis_title="Average per Game",
+                    template='plotly_dark',
+                    height=500,
+                    hovermode='x unified'
+                )
             
-            # Defensive trends by age
-            fig_age_def = go.Figure()
+                st.plotly_chart(fig_age_trend, use_container_width=True, key="age_trend_offensive")
             
-            fig_age_def.add_trace(go.Scatter(
-                x=age_groups['Age'],
-                y=age_groups['def_Tkl'],
-                mode='lines+markers',
-                name='Tackles per Game',
-                line=dict(color='#96CEB4', width=3),
-                marker=dict(size=8)
-            ))
+                # Defensive trends by age
+                fig_age_def = go.Figure()
             
-            fig_age_def.add_trace(go.Scatter(
-                x=age_groups['Age'],
-                y=age_groups['def_Int'],
-                mode='lines+markers',
-                name='Interceptions per Game',
-                line=dict(color='#FFEAA7', width=3),
-                marker=dict(size=8)
-            ))
+                fig_age_def.add_trace(go.Scatter(
+                    x=age_groups['Age'],
+                    y=age_groups['def_Tkl'],
+                    mode='lines+markers',
+                    name='Tackles per Game',
+                    line=dict(color='#96CEB4', width=3),
+                    marker=dict(size=8)
+                ))
             
-            fig_age_def.update_layout(
-                title="Defensive Performance Trends by Age",
-                xaxis_title="Age",
-                yaxis_title="Average per Game",
-                template='plotly_dark',
-                height=500,
-                hovermode='x unified'
-            )
+                fig_age_def.add_trace(go.Scatter(
+                    x=age_groups['Age'],
+                    y=age_groups['def_Int'],
+                    mode='lines+markers',
+                    name='Interceptions per Game',
+                    line=dict(color='#FFEAA7', width=3),
+                    marker=dict(size=8)
+                ))
             
-            st.plotly_chart(fig_age_def, use_container_width=True, key="age_trend_defensive")
+                fig_age_def.update_layout(
+                    title="Defensive Performance Trends by Age",
+                    xaxis_title="Age",
+                    yaxis_title="Average per Game",
+                    template='plotly_dark',
+                    height=500,
+                    hovermode='x unified'
+                )
             
-            # Age insights
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                peak_goal_age = age_groups.loc[age_groups['std_Gls'].idxmax(), 'Age']
-                st.metric("Peak Goal Scoring Age", f"{peak_goal_age:.0f}")
-            with col2:
-                peak_assist_age = age_groups.loc[age_groups['std_Ast'].idxmax(), 'Age']
-                st.metric("Peak Assist Age", f"{peak_assist_age:.0f}")
-            with col3:
-                peak_defense_age = age_groups.loc[(age_groups['def_Tkl'] + age_groups['def_Int']).idxmax(), 'Age']
-                st.metric("Peak Defensive Age", f"{peak_defense_age:.0f}")
-        else:
-            st.info("Not enough data for age trend analysis")
-
-    with trend_tab2:
-        st.markdown("### Performance vs Playing Time")
-        st.markdown("Examine how performance metrics correlate with minutes played.")
-        
-        # Create minutes bins for trend analysis
-        df['Minutes_Bin'] = pd.cut(df['std_Min'], bins=5, labels=['Very Low', 'Low', 'Medium', 'High', 'Very High'])
-        minutes_trend = df.groupby('Minutes_Bin', observed=False).agg({
-            'std_Gls': 'mean',
-            'std_Ast': 'mean',
-            'std_xG': 'mean',
-            'std_xAG': 'mean',
-            'pass_KP': 'mean',
-            'def_Tkl': 'mean',
-            'Player': 'count'
-        }).reset_index()
-        minutes_trend.rename(columns={'Player': 'Player_Count'}, inplace=True)
-        
-        if not minutes_trend.empty:
-            # Minutes vs Performance chart
-            fig_minutes_trend = go.Figure()
+                st.plotly_chart(fig_age_def, use_container_width=True, key="age_trend_defensive")
             
-            fig_minutes_trend.add_trace(go.Scatter(
-                x=minutes_trend['Minutes_Bin'],
-                y=minutes_trend['std_Gls'],
-                mode='lines+markers',
-                name='Goals per Game',
-                line=dict(color='#FF6B6B', width=3),
-                marker=dict(size=8)
-            ))
-# Trend analysis moved to Tab6
-
-    
-    # Filter out ages with very few players (less than 2)
-    age_groups = age_groups[age_groups['Player_Count'] >= 2]
-    
-    if not age_groups.empty:
-        # Create line chart for offensive metrics
-        fig_age_trend = go.Figure()
-        
-        fig_age_trend.add_trace(go.Scatter(
-            x=age_groups['Age'],
-            y=age_groups['std_Gls'],
-            mode='lines+markers',
-            name='Goals per Game',
-            line=dict(color='#FF6B6B', width=3),
-            marker=dict(size=8)
-        ))
-        
-        fig_age_trend.add_trace(go.Scatter(
-            x=age_groups['Age'],
-            y=age_groups['std_Ast'],
-            mode='lines+markers',
-            name='Assists per Game',
-            line=dict(color='#4ECDC4', width=3),
-            marker=dict(size=8)
-        ))
-        
-        fig_age_trend.add_trace(go.Scatter(
-            x=age_groups['Age'],
-            y=age_groups['pass_KP'],
-            mode='lines+markers',
-            name='Key Passes per Game',
-            line=dict(color='#45B7D1', width=3),
-            marker=dict(size=8)
-        ))
-        
-        fig_age_trend.update_layout(
-            title="Offensive Performance Trends by Age",
-            xaxis_title="Age",
-            yaxis_title="Average per Game",
-            template='plotly_dark',
-            height=500,
-            hovermode='x unified'
-        )
-        
-        st.plotly_chart(fig_age_trend, use_container_width=True)
-        
-        # Defensive trends by age
-        fig_age_def = go.Figure()
-        
-        fig_age_def.add_trace(go.Scatter(
-            x=age_groups['Age'],
-            y=age_groups['def_Tkl'],
-            mode='lines+markers',
-            name='Tackles per Game',
-            line=dict(color='#96CEB4', width=3),
-            marker=dict(size=8)
-        ))
-        
-        fig_age_def.add_trace(go.Scatter(
-            x=age_groups['Age'],
-            y=age_groups['def_Int'],
-            mode='lines+markers',
-            name='Interceptions per Game',
-            line=dict(color='#FFEAA7', width=3),
-            marker=dict(size=8)
-        ))
-        
-        fig_age_def.update_layout(
-            title="Defensive Performance Trends by Age",
-            xaxis_title="Age",
-            yaxis_title="Average per Game",
-            template='plotly_dark',
-            height=500,
-            hovermode='x unified'
-        )
-        
-        st.plotly_chart(fig_age_def, use_container_width=True)
-        
-        # Age insights
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            peak_goal_age = age_groups.loc[age_groups['std_Gls'].idxmax(), 'Age']
-            st.metric("Peak Goal Scoring Age", f"{peak_goal_age:.0f}")
-        with col2:
-            peak_assist_age = age_groups.loc[age_groups['std_Ast'].idxmax(), 'Age']
-            st.metric("Peak Assist Age", f"{peak_assist_age:.0f}")
-        with col3:
-            peak_defense_age = age_groups.loc[(age_groups['def_Tkl'] + age_groups['def_Int']).idxmax(), 'Age']
-            st.metric("Peak Defensive Age", f"{peak_defense_age:.0f}")
-    else:
-        st.info("Not enough data for age trend analysis")
+                # Age insights
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    peak_goal_age = age_groups.loc[age_groups['std_Gls'].idxmax(), 'Age']
+                    st.metric("Peak Goal Scoring Age", f"{peak_goal_age:.0f}")
+                with col2:
+                    peak_assist_age = age_groups.loc[age_groups['std_Ast'].idxmax(), 'Age']
+                    st.metric("Peak Assist Age", f"{peak_assist_age:.0f}")
+                with col3:
+                    peak_defense_age = age_groups.loc[(age_groups['def_Tkl'] + age_groups['def_Int']).idxmax(), 'Age']
+                    st.metric("Peak Defensive Age", f"{peak_defense_age:.0f}")
+            else:
+                st.info("Not enough data for age trend analysis")
 
-with trend_tab2:
-    st.markdown("### Performance vs Playing Time")
-    st.markdown("Examine how performance metrics correlate with minutes played.")
-    
-    # Create minutes bins for trend analysis
-    df_minutes = df.copy()
-    df_minutes['Minutes_Bin'] = pd.cut(df_minutes['std_Min'], 
-                                      bins=5, 
-                                      labels=['0-500', '500-1000', '1000-1500', '1500-2000', '2000+'])
+        with trend_tab2:
+            st.markdown("### Performance vs Playing Time")
+            st.markdown("Examine how performance metrics correlate with minutes played.")
     
-    minutes_trends = df_minutes.groupby('Minutes_Bin', observed=False).agg({
-        'std_Gls': 'mean',
-        'std_Ast': 'mean',
-        'std_xG': 'mean',
-        'std_xAG': 'mean',
-        'pass_Cmp%': 'mean',
-        'def_Tkl': 'mean',
-        'Player': 'count'
-    }).reset_index()
-    minutes_trends.rename(columns={'Player': 'Player_Count'}, inplace=True)
+            # Minutes bins come from the derived metrics; empty bins stay on the axis
+            minutes_trends = trend_cube.summary('Minutes_Bin', ['std_Gls', 'std_Ast', 'std_xG', 'std_xAG', 'pass_Cmp%', 'def_Tkl'],
+                                                observed=False)
     
-    if not minutes_trends.empty:
-        # Performance vs Minutes line chart
-        fig_minutes_trend = go.Figure()
-        
-        fig_minutes_trend.add_trace(go.Scatter(
-            x=minutes_trends['Minutes_Bin'],
-            y=minutes_trends['std_Gls'],
-            mode='lines+markers',
-            name='Goals per Game',
-            line=dict(color='#FF6B6B', width=3),
-            marker=dict(size=10)
-        ))
+            if not minutes_trends.empty:
+                # Performance vs Minutes line chart
+                fig_minutes_trend = go.Figure()
+        
+                fig_minutes_trend.add_trace(go.Scatter(
+                    x=minutes_trends['Minutes_Bin'],
+                    y=minutes_trends['std_Gls'],
+                    mode='lines+markers',
+                    name='Goals per Game',
+                    line=dict(color='#FF6B6B', width=3),
+                    marker=dict(size=10)
+                ))
         
-        fig_minutes_trend.add_trace(go.Scatter(
-            x=minutes_trends['Minutes_Bin'],
-            y=minutes_trends['std_Ast'],
-            mode='lines+markers',
-            name='Assists per Game',
-            line=dict(color='#4ECDC4', width=3),
-            marker=dict(size=10)
-        ))
+                fig_minutes_trend.add_trace(go.Scatter(
+                    x=minutes_trends['Minutes_Bin'],
+                    y=minutes_trends['std_Ast'],
+                    mode='lines+markers',
+                    name='Assists per Game',
+                    line=dict(color='#4ECDC4', width=3),
+                    marker=dict(size=10)
+                ))
         
-        fig_minutes_trend.add_trace(go.Scatter(
-            x=minutes_trends['Minutes_Bin'],
-            y=minutes_trends['pass_Cmp%'],
-            mode='lines+markers',
-            name='Pass Success Rate',
-            line=dict(color='#45B7D1', width=3),
-            marker=dict(size=10),
-            yaxis='y2'
-        ))
+                fig_minutes_trend.add_trace(go.Scatter(
+                    x=minutes_trends['Minutes_Bin'],
+                    y=minutes_trends['pass_Cmp%'],
+                    mode='lines+markers',
+                    name='Pass Success Rate',
+                    line=dict(color='#45B7D1', width=3),
+                    marker=dict(size=10),
+                    yaxis='y2'
+                ))
         
-        fig_minutes_trend.update_layout(
-            title="Performance Trends by Playing Time",
-            xaxis_title="Minutes Played (Bins)",
-            yaxis_title="Goals/Assists per Game",
-            yaxis2=dict(
-                title="Pass Success Rate",
-                overlaying='y',
-                side='right'
-            ),
-            template='plotly_dark',
-            height=500,
-            hovermode='x unified'
-        )
+                fig_minutes_trend.update_layout(
+                    title="Performance Trends by Playing Time",
+                    xaxis_title="Minutes Played (Bins)",
+                    yaxis_title="Goals/Assists per Game",
+                    yaxis2=dict(
+                        title="Pass Success Rate",
+                        overlaying='y',
+                        side='right'
+                    ),
+                    template='plotly_dark',
+                    height=500,
+                    hovermode='x unified'
+                )
         
-        st.plotly_chart(fig_minutes_trend, use_container_width=True, key="minutes_trend")
+                st.plotly_chart(fig_minutes_trend, use_container_width=True, key="minutes_trend")
         
-        # Minutes insights
-        col1, col2 = st.columns(2)
-        with col1:
-            highest_minutes_group = minutes_trends.loc[minutes_trends['std_Gls'].idxmax(), 'Minutes_Bin']
-            st.metric("Most Productive Minutes Range", highest_minutes_group)
-        with col2:
-            most_accurate_group = minutes_trends.loc[minutes_trends['pass_Cmp%'].idxmax(), 'Minutes_Bin']
-            st.metric("Most Accurate Passing Range", most_accurate_group)
-    else:
-        st.info("Not enough data for minutes trend analysis")
+                # Minutes insights
+                col1, col2 = st.columns(2)
+                with col1:
+                    highest_minutes_group = minutes_trends.loc[minutes_trends['std_Gls'].idxmax(), 'Minutes_Bin']
+                    st.metric("Most Productive Minutes Range", highest_minutes_group)
+                with col2:
+                    most_accurate_group = minutes_trends.loc[minutes_trends['pass_Cmp%'].idxmax(), 'Minutes_Bin']
+                    st.metric("Most Accurate Passing Range", most_accurate_group)
+            else:
+                st.info("Not enough data for minutes trend analysis")
 
-with trend_tab3:
-    st.markdown("### Team Performance Comparison")
-    st.markdown("Compare average performance metrics across different teams.")
+        with trend_tab3:
+            st.markdown("### Team Performance Comparison")
+            st.markdown("Compare average performance metrics across different teams.")
     
-    # Team performance analysis
-    team_performance = df.groupby('Squad').agg({
-        'std_Gls': 'mean',
-        'std_Ast': 'mean',
-        'std_xG': 'mean',
-        'std_xAG': 'mean',
-        'pass_Cmp%': 'mean',
-        'def_Tkl': 'mean',
-        'def_Int': 'mean',
-        'Age': 'mean',
-        'Player': 'count'
-    }).reset_index()
-    team_performance.rename(columns={'Player': 'Player_Count'}, inplace=True)
+            # Team performance analysis
+            team_performance = trend_cube.summary('Squad', ['std_Gls', 'std_Ast', 'std_xG', 'std_xAG', 'pass_Cmp%', 'def_Tkl', 'def_Int', 'Age'])
     
-    # Filter teams with at least 2 players
-    team_performance = team_performance[team_performance['Player_Count'] >= 2]
-    team_performance = team_performance.sort_values('std_Gls', ascending=False)
+            # Filter teams with at least 2 players
+            team_performance = team_performance[team_performance['Player_Count'] >= 2]
+            team_performance = team_performance.sort_values('std_Gls', ascending=False)
     
-    if not team_performance.empty:
-        # Team offensive performance
-        fig_team_off = go.Figure()
-        
-        fig_team_off.add_trace(go.Scatter(
-            x=team_performance['Squad'],
-            y=team_performance['std_Gls'],
-            mode='lines+markers',
-            name='Average Goals',
-            line=dict(color='#FF6B6B', width=3),
-            marker=dict(size=10)
-        ))
-        
-        fig_team_off.add_trace(go.Scatter(
-            x=team_performance['Squad'],
-            y=team_performance['std_Ast'],
-            mode='lines+markers',
-            name='Average Assists',
-            line=dict(color='#4ECDC4', width=3),
-            marker=dict(size=10)
-        ))
+            if not team_performance.empty:
+                # Team offensive performance
+                fig_team_off = go.Figure()
+        
+                fig_team_off.add_trace(go.Scatter(
+                    x=team_performance['Squad'],
+                    y=team_performance['std_Gls'],
+                    mode='lines+markers',
+                    name='Average Goals',
+                    line=dict(color='#FF6B6B', width=3),
+                    marker=dict(size=10)
+                ))
         
-        fig_team_off.update_layout(
-            title="Team Offensive Performance Comparison",
-            xaxis_title="Team",
-            yaxis_title="Average per Game",
-            template='plotly_dark',
-            height=500,
-            xaxis_tickangle=-45,
-            hovermode='x unified'
-        )
+                fig_team_off.add_trace(go.Scatter(
+                    x=team_performance['Squad'],
+                    y=team_performance['std_Ast'],
+                    mode='lines+markers',
+                    name='Average Assists',
+                    line=dict(color='#4ECDC4', width=3),
+                    marker=dict(size=10)
+                ))
         
-        st.plotly_chart(fig_team_off, use_container_width=True, key="team_offensive_trend")
+                fig_team_off.update_layout(
+                    title="Team Offensive Performance Comparison",
+                    xaxis_title="Team",
+                    yaxis_title="Average per Game",
+                    template='plotly_dark',
+                    height=500,
+                    xaxis_tickangle=-45,
+                    hovermode='x unified'
+                )
         
-        # Team defensive performance
-        fig_team_def = go.Figure()
+                st.plotly_chart(fig_team_off, use_container_width=True, key="team_offensive_trend")
         
-        fig_team_def.add_trace(go.Scatter(
-            x=team_performance['Squad'],
-            y=team_performance['def_Tkl'],
-            mode='lines+markers',
-            name='Average Tackles',
-            line=dict(color='#96CEB4', width=3),
-            marker=dict(size=10)
-        ))
+                # Team defensive performance
+                fig_team_def = go.Figure()
         
-        fig_team_def.add_trace(go.Scatter(
-            x=team_performance['Squad'],
-            y=team_performance['def_Int'],
-            mode='lines+markers',
-            name='Average Interceptions',
-            line=dict(color='#FFEAA7', width=3),
-            marker=dict(size=10)
-        ))
+                fig_team_def.add_trace(go.Scatter(
+                    x=team_performance['Squad'],
+                    y=team_performance['def_Tkl'],
+                    mode='lines+markers',
+                    name='Average Tackles',
+                    line=dict(color='#96CEB4', width=3),
+                    marker=dict(size=10)
+                ))
         
-        fig_team_def.update_layout(
-            title="Team Defensive Performance Comparison",
-            xaxis_title="Team",
-            yaxis_title="Average per Game",
-            template='plotly_dark',
-            height=500,
-            xaxis_tickangle=-45,
-            hovermode='x unified'
-        )
+                fig_team_def.add_trace(go.Scatter(
+                    x=team_performance['Squad'],
+                    y=team_performance['def_Int'],
+                    mode='lines+markers',
+                    name='Average Interceptions',
+                    line=dict(color='#FFEAA7', width=3),
+                    marker=dict(size=10)
+                ))
         
-        st.plotly_chart(fig_team_def, use_container_width=True, key="team_defensive_trend")
+                fig_team_def.update_layout(
+                    title="Team Defensive Performance Comparison",
+                    xaxis_title="Team",
+                    yaxis_title="Average per Game",
+                    template='plotly_dark',
+                    height=500,
+                    xaxis_tickangle=-45,
+                    hovermode='x unified'
+                )
         
-        # Team insights
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            best_attacking_team = team_performance.loc[team_performance['std_Gls'].idxmax(), 'Squad']
-            st.metric("Best Attacking Team", best_attacking_team)
-        with col2:
-            best_creative_team = team_performance.loc[team_performance['std_Ast'].idxmax(), 'Squad']
-            st.metric("Most Creative Team", best_creative_team)
-        with col3:
-            best_defensive_team = team_performance.loc[(team_performance['def_Tkl'] + team_performance['def_Int']).idxmax(), 'Squad']
-            st.metric("Best Defensive Team", best_defensive_team)
-    else:
-        st.info("Not enough data for team comparison")
-
+                st.plotly_chart(fig_team_def, use_container_width=True, key="team_defensive_trend")
+        
+                # Team insights
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    best_attacking_team = team_performance.loc[team_performance['std_Gls'].idxmax(), 'Squad']
+                    st.metric("Best Attacking Team", best_attacking_team)
+                with col2:
+                    best_creative_team = team_performance.loc[team_performance['std_Ast'].idxmax(), 'Squad']
+                    st.metric("Most Creative Team", best_creative_team)
+                with col3:
+                    best_defensive_team = team_performance.loc[(team_performance['def_Tkl'] + team_performance['def_Int']).idxmax(), 'Squad']
+                    st.metric("Best Defensive Team", best_defensive_team)
+            else:
+                st.info("Not enough data for team comparison")
 
 
-# Key Trend Insights moved to Tab6
 
 with tab7:
-    st.markdown("""
+    if tab7.open:
+        st.markdown("""
     <div style='text-align: center; margin: 2rem 0 1.5rem 0;'>
         <h1 style='font-size: 1.8rem; font-weight: 600; margin: 0; color: #2563eb;'>
             Distribution Analysis (Histograms)
@@ -4341,8 +4743,8 @@ with tab7:
     </div>
     """, unsafe_allow_html=True)
 
-    with st.expander("Reading histograms (Click to expand)", expanded=False):
-        st.markdown("""
+        with st.expander("Reading histograms (Click to expand)", expanded=False):
+            st.markdown("""
         **What are histograms?**
         - Show the distribution of values for a specific metric
         - Height indicates how many players fall into each range
@@ -4354,337 +4756,336 @@ with tab7:
         - Bimodal: Two distinct peaks
         """)
 
-    st.markdown("---")
+        st.markdown("---")
 
-    # Create tabs for different histogram analyses
-    hist_tab1, hist_tab2, hist_tab3, hist_tab4 = st.tabs([
-        "Performance Metrics", 
-        "Playing Time & Participation",
-        "Passing & Creativity", 
-        "Defensive & Discipline"
-    ])
-
-    with hist_tab1:
-        st.markdown("### Performance Metrics Distribution")
-        st.markdown("Analyze the distribution of goals, assists, and expected performance metrics.")
-        
-        # Goals distribution
-        fig_goals_hist = go.Figure()
-        fig_goals_hist.add_trace(go.Histogram(
-            x=df['std_Gls'],
-            nbinsx=20,
-            name='Goals per Game',
-            marker_color='#FF6B6B',
-            opacity=0.7
-        ))
+        # Create tabs for different histogram analyses
+        hist_tab1, hist_tab2, hist_tab3, hist_tab4 = st.tabs([
+            "Performance Metrics", 
+            "Playing Time & Participation",
+            "Passing & Creativity", 
+            "Defensive & Discipline"
+        ])
+
+        with hist_tab1:
+            st.markdown("### Performance Metrics Distribution")
+            st.markdown("Analyze the distribution of goals, assists, and expected performance metrics.")
+        
+            # Goals distribution
+            fig_goals_hist = go.Figure()
+            fig_goals_hist.add_trace(histogram_trace(
+                'std_Gls',
+                bins=20,
+                name='Goals per Game',
+                marker_color='#FF6B6B',
+                opacity=0.7
+            ))
         
-        fig_goals_hist.update_layout(
-            title="Distribution of Goals per Game",
-            xaxis_title="Goals per Game",
-            yaxis_title="Number of Players",
-            template='plotly_dark',
-            height=400
-        )
+            fig_goals_hist.update_layout(
+                title="Distribution of Goals per Game",
+                xaxis_title="Goals per Game",
+                yaxis_title="Number of Players",
+                template='plotly_dark',
+                height=400
+            )
         
-        st.plotly_chart(fig_goals_hist, use_container_width=True, key="goals_histogram")
+            st.plotly_chart(fig_goals_hist, use_container_width=True, key="goals_histogram")
         
-        # Assists distribution
-        fig_assists_hist = go.Figure()
-        fig_assists_hist.add_trace(go.Histogram(
-            x=df['std_Ast'],
-            nbinsx=20,
-            name='Assists per Game',
-            marker_color='#4ECDC4',
-            opacity=0.7
-        ))
+            # Assists distribution
+            fig_assists_hist = go.Figure()
+            fig_assists_hist.add_trace(histogram_trace(
+                'std_Ast',
+                bins=20,
+                name='Assists per Game',
+                marker_color='#4ECDC4',
+                opacity=0.7
+            ))
         
-        fig_assists_hist.update_layout(
-            title="Distribution of Assists per Game",
-            xaxis_title="Assists per Game",
-            yaxis_title="Number of Players",
-            template='plotly_dark',
-            height=400
-        )
+            fig_assists_hist.update_layout(
+                title="Distribution of Assists per Game",
+                xaxis_title="Assists per Game",
+                yaxis_title="Number of Players",
+                template='plotly_dark',
+                height=400
+            )
         
-        st.plotly_chart(fig_assists_hist, use_container_width=True, key="assists_histogram")
+            st.plotly_chart(fig_assists_hist, use_container_width=True, key="assists_histogram")
         
-        # Combined Goals + Assists
-        df['Goals_Assists'] = df['std_Gls'] + df['std_Ast']
-        fig_ga_hist = go.Figure()
-        fig_ga_hist.add_trace(go.Histogram(
-            x=df['Goals_Assists'],
-            nbinsx=20,
-            name='Goals + Assists',
-            marker_color='#45B7D1',
-            opacity=0.7
-        ))
+            # Combined Goals + Assists
+            fig_ga_hist = go.Figure()
+            fig_ga_hist.add_trace(histogram_trace(
+                'Goals_Assists',
+                bins=20,
+                name='Goals + Assists',
+                marker_color='#45B7D1',
+                opacity=0.7
+            ))
         
-        fig_ga_hist.update_layout(
-            title="Distribution of Goals + Assists per Game",
-            xaxis_title="Goals + Assists per Game",
-            yaxis_title="Number of Players",
-            template='plotly_dark',
-            height=400
-        )
+            fig_ga_hist.update_layout(
+                title="Distribution of Goals + Assists per Game",
+                xaxis_title="Goals + Assists per Game",
+                yaxis_title="Number of Players",
+                template='plotly_dark',
+                height=400
+            )
         
-        st.plotly_chart(fig_ga_hist, use_container_width=True, key="goals_assists_histogram")
+            st.plotly_chart(fig_ga_hist, use_container_width=True, key="goals_assists_histogram")
 
-    with hist_tab2:
-        st.markdown("### Playing Time & Participation Distribution")
-        st.markdown("Examine how playing time and match participation are distributed.")
+        with hist_tab2:
+            st.markdown("### Playing Time & Participation Distribution")
+            st.markdown("Examine how playing time and match participation are distributed.")
         
-        # Minutes distribution
-        fig_minutes_hist = go.Figure()
-        fig_minutes_hist.add_trace(go.Histogram(
-            x=df['std_Min'],
-            nbinsx=20,
-            name='Minutes Played',
-            marker_color='#96CEB4',
-            opacity=0.7
-        ))
+            # Minutes distribution
+            fig_minutes_hist = go.Figure()
+            fig_minutes_hist.add_trace(histogram_trace(
+                'std_Min',
+                bins=20,
+                name='Minutes Played',
+                marker_color='#96CEB4',
+                opacity=0.7
+            ))
         
-        fig_minutes_hist.update_layout(
-            title="Distribution of Minutes Played",
-            xaxis_title="Minutes Played",
-            yaxis_title="Number of Players",
-            template='plotly_dark',
-            height=400
-        )
+            fig_minutes_hist.update_layout(
+                title="Distribution of Minutes Played",
+                xaxis_title="Minutes Played",
+                yaxis_title="Number of Players",
+                template='plotly_dark',
+                height=400
+            )
         
-        st.plotly_chart(fig_minutes_hist, use_container_width=True, key="minutes_histogram")
+            st.plotly_chart(fig_minutes_hist, use_container_width=True, key="minutes_histogram")
         
-        # Matches distribution
-        fig_matches_hist = go.Figure()
-        fig_matches_hist.add_trace(go.Histogram(
-            x=df['std_MP'],
-            nbinsx=20,
-            name='Matches Played',
-            marker_color='#FFEAA7',
-            opacity=0.7
-        ))
+            # Matches distribution
+            fig_matches_hist = go.Figure()
+            fig_matches_hist.add_trace(histogram_trace(
+                'std_MP',
+                bins=20,
+                name='Matches Played',
+                marker_color='#FFEAA7',
+                opacity=0.7
+            ))
         
-        fig_matches_hist.update_layout(
-            title="Distribution of Matches Played",
-            xaxis_title="Matches Played",
-            yaxis_title="Number of Players",
-            template='plotly_dark',
-            height=400
-        )
+            fig_matches_hist.update_layout(
+                title="Distribution of Matches Played",
+                xaxis_title="Matches Played",
+                yaxis_title="Number of Players",
+                template='plotly_dark',
+                height=400
+            )
         
-        st.plotly_chart(fig_matches_hist, use_container_width=True, key="matches_histogram")
+            st.plotly_chart(fig_matches_hist, use_container_width=True, key="matches_histogram")
         
-        # Age distribution
-        fig_age_hist = go.Figure()
-        fig_age_hist.add_trace(go.Histogram(
-            x=df['Age'],
-            nbinsx=10,
-            name='Age',
-            marker_color='#DDA0DD',
-            opacity=0.7
-        ))
+            # Age distribution
+            fig_age_hist = go.Figure()
+            fig_age_hist.add_trace(histogram_trace(
+                'Age',
+                bins=10,
+                name='Age',
+                marker_color='#DDA0DD',
+                opacity=0.7
+            ))
         
-        fig_age_hist.update_layout(
-            title="Distribution of Player Ages",
-            xaxis_title="Age",
-            yaxis_title="Number of Players",
-            template='plotly_dark',
-            height=400
-        )
+            fig_age_hist.update_layout(
+                title="Distribution of Player Ages",
+                xaxis_title="Age",
+                yaxis_title="Number of Players",
+                template='plotly_dark',
+                height=400
+            )
         
-        st.plotly_chart(fig_age_hist, use_container_width=True, key="age_histogram")
+            st.plotly_chart(fig_age_hist, use_container_width=True, key="age_histogram")
 
-    with hist_tab3:
-        st.markdown("### Passing & Creativity Distribution")
-        st.markdown("Analyze the distribution of passing accuracy and creative metrics.")
+        with hist_tab3:
+            st.markdown("### Passing & Creativity Distribution")
+            st.markdown("Analyze the distribution of passing accuracy and creative metrics.")
         
-        # Passing accuracy distribution
-        fig_pass_hist = go.Figure()
-        fig_pass_hist.add_trace(go.Histogram(
-            x=df['pass_Cmp%'],
-            nbinsx=20,
-            name='Pass Completion %',
-            marker_color='#98D8C8',
-            opacity=0.7
-        ))
+            # Passing accuracy distribution
+            fig_pass_hist = go.Figure()
+            fig_pass_hist.add_trace(histogram_trace(
+                'pass_Cmp%',
+                bins=20,
+                name='Pass Completion %',
+                marker_color='#98D8C8',
+                opacity=0.7
+            ))
         
-        fig_pass_hist.update_layout(
-            title="Distribution of Pass Completion Rate",
-            xaxis_title="Pass Completion %",
-            yaxis_title="Number of Players",
-            template='plotly_dark',
-            height=400
-        )
+            fig_pass_hist.update_layout(
+                title="Distribution of Pass Completion Rate",
+                xaxis_title="Pass Completion %",
+                yaxis_title="Number of Players",
+                template='plotly_dark',
+                height=400
+            )
         
-        st.plotly_chart(fig_pass_hist, use_container_width=True, key="pass_completion_histogram")
+            st.plotly_chart(fig_pass_hist, use_container_width=True, key="pass_completion_histogram")
         
-        # Key passes distribution
-        fig_kp_hist = go.Figure()
-        fig_kp_hist.add_trace(go.Histogram(
-            x=df['pass_KP'],
-            nbinsx=20,
-            name='Key Passes per Game',
-            marker_color='#F7DC6F',
-            opacity=0.7
-        ))
+            # Key passes distribution
+            fig_kp_hist = go.Figure()
+            fig_kp_hist.add_trace(histogram_trace(
+                'pass_KP',
+                bins=20,
+                name='Key Passes per Game',
+                marker_color='#F7DC6F',
+                opacity=0.7
+            ))
         
-        fig_kp_hist.update_layout(
-            title="Distribution of Key Passes per Game",
-            xaxis_title="Key Passes per Game",
-            yaxis_title="Number of Players",
-            template='plotly_dark',
-            height=400
-        )
+            fig_kp_hist.update_layout(
+                title="Distribution of Key Passes per Game",
+                xaxis_title="Key Passes per Game",
+                yaxis_title="Number of Players",
+                template='plotly_dark',
+                height=400
+            )
         
-        st.plotly_chart(fig_kp_hist, use_container_width=True, key="key_passes_histogram")
+            st.plotly_chart(fig_kp_hist, use_container_width=True, key="key_passes_histogram")
         
-        # Progressive passing distribution
-        fig_prog_pass = go.Figure()
-        fig_prog_pass.add_trace(go.Histogram(
-            x=df['pass_PrgDist'],
-            nbinsx=20,
-            name='Progressive Pass Distance',
-            marker_color='#BB8FCE',
-            opacity=0.7
-        ))
+            # Progressive passing distribution
+            fig_prog_pass = go.Figure()
+            fig_prog_pass.add_trace(histogram_trace(
+                'pass_PrgDist',
+                bins=20,
+                name='Progressive Pass Distance',
+                marker_color='#BB8FCE',
+                opacity=0.7
+            ))
         
-        fig_prog_pass.update_layout(
-            title="Distribution of Progressive Pass Distance",
-            xaxis_title="Progressive Pass Distance",
-            yaxis_title="Number of Players",
-            template='plotly_dark',
-            height=400
-        )
+            fig_prog_pass.update_layout(
+                title="Distribution of Progressive Pass Distance",
+                xaxis_title="Progressive Pass Distance",
+                yaxis_title="Number of Players",
+                template='plotly_dark',
+                height=400
+            )
         
-        st.plotly_chart(fig_prog_pass, use_container_width=True, key="progressive_passing_histogram")
+            st.plotly_chart(fig_prog_pass, use_container_width=True, key="progressive_passing_histogram")
         
-        # Progressive carrying distribution
-        fig_prog_carry = go.Figure()
-        fig_prog_carry.add_trace(go.Histogram(
-            x=df['poss_PrgDist'],
-            nbinsx=20,
-            name='Progressive Carry Distance',
-            marker_color='#85C1E9',
-            opacity=0.7
-        ))
+            # Progressive carrying distribution
+            fig_prog_carry = go.Figure()
+            fig_prog_carry.add_trace(histogram_trace(
+                'poss_PrgDist',
+                bins=20,
+                name='Progressive Carry Distance',
+                marker_color='#85C1E9',
+                opacity=0.7
+            ))
         
-        fig_prog_carry.update_layout(
-            title="Distribution of Progressive Carry Distance",
-            xaxis_title="Progressive Carry Distance",
-            yaxis_title="Number of Players",
-            template='plotly_dark',
-            height=400
-        )
+            fig_prog_carry.update_layout(
+                title="Distribution of Progressive Carry Distance",
+                xaxis_title="Progressive Carry Distance",
+                yaxis_title="Number of Players",
+                template='plotly_dark',
+                height=400
+            )
         
-        st.plotly_chart(fig_prog_carry, use_container_width=True, key="progressive_carrying_histogram")
+            st.plotly_chart(fig_prog_carry, use_container_width=True, key="progressive_carrying_histogram")
 
-    with hist_tab4:
-        st.markdown("### Defensive & Discipline Distribution")
-        st.markdown("Examine the distribution of defensive actions and disciplinary metrics.")
+        with hist_tab4:
+            st.markdown("### Defensive & Discipline Distribution")
+            st.markdown("Examine the distribution of defensive actions and disciplinary metrics.")
         
-        # Tackles distribution
-        fig_tackles_hist = go.Figure()
-        fig_tackles_hist.add_trace(go.Histogram(
-            x=df['def_Tkl'],
-            nbinsx=20,
-            name='Tackles per Game',
-            marker_color='#F8C471',
-            opacity=0.7
-        ))
+            # Tackles distribution
+            fig_tackles_hist = go.Figure()
+            fig_tackles_hist.add_trace(histogram_trace(
+                'def_Tkl',
+                bins=20,
+                name='Tackles per Game',
+                marker_color='#F8C471',
+                opacity=0.7
+            ))
         
-        fig_tackles_hist.update_layout(
-            title="Distribution of Tackles per Game",
-            xaxis_title="Tackles per Game",
-            yaxis_title="Number of Players",
-            template='plotly_dark',
-            height=400
-        )
+            fig_tackles_hist.update_layout(
+                title="Distribution of Tackles per Game",
+                xaxis_title="Tackles per Game",
+                yaxis_title="Number of Players",
+                template='plotly_dark',
+                height=400
+            )
         
-        st.plotly_chart(fig_tackles_hist, use_container_width=True, key="tackles_histogram")
+            st.plotly_chart(fig_tackles_hist, use_container_width=True, key="tackles_histogram")
         
-        # Interceptions distribution
-        fig_int_hist = go.Figure()
-        fig_int_hist.add_trace(go.Histogram(
-            x=df['def_Int'],
-            nbinsx=20,
-            name='Interceptions per Game',
-            marker_color='#82E0AA',
-            opacity=0.7
-        ))
+            # Interceptions distribution
+            fig_int_hist = go.Figure()
+            fig_int_hist.add_trace(histogram_trace(
+                'def_Int',
+                bins=20,
+                name='Interceptions per Game',
+                marker_color='#82E0AA',
+                opacity=0.7
+            ))
         
-        fig_int_hist.update_layout(
-            title="Distribution of Interceptions per Game",
-            xaxis_title="Interceptions per Game",
-            yaxis_title="Number of Players",
-            template='plotly_dark',
-            height=400
-        )
+            fig_int_hist.update_layout(
+                title="Distribution of Interceptions per Game",
+                xaxis_title="Interceptions per Game",
+                yaxis_title="Number of Players",
+                template='plotly_dark',
+                height=400
+            )
         
-        st.plotly_chart(fig_int_hist, use_container_width=True, key="interceptions_histogram")
+            st.plotly_chart(fig_int_hist, use_container_width=True, key="interceptions_histogram")
         
-        # Ball recoveries distribution
-        fig_recov_hist = go.Figure()
-        fig_recov_hist.add_trace(go.Histogram(
-            x=df['misc_Recov'],
-            nbinsx=20,
-            name='Ball Recoveries per Game',
-            marker_color='#F1948A',
-            opacity=0.7
-        ))
+            # Ball recoveries distribution
+            fig_recov_hist = go.Figure()
+            fig_recov_hist.add_trace(histogram_trace(
+                'misc_Recov',
+                bins=20,
+                name='Ball Recoveries per Game',
+                marker_color='#F1948A',
+                opacity=0.7
+            ))
         
-        fig_recov_hist.update_layout(
-            title="Distribution of Ball Recoveries per Game",
-            xaxis_title="Ball Recoveries per Game",
-            yaxis_title="Number of Players",
-            template='plotly_dark',
-            height=400
-        )
+            fig_recov_hist.update_layout(
+                title="Distribution of Ball Recoveries per Game",
+                xaxis_title="Ball Recoveries per Game",
+                yaxis_title="Number of Players",
+                template='plotly_dark',
+                height=400
+            )
         
-        st.plotly_chart(fig_recov_hist, use_container_width=True, key="recoveries_histogram")
+            st.plotly_chart(fig_recov_hist, use_container_width=True, key="recoveries_histogram")
         
-        # Yellow cards distribution
-        fig_yellow_hist = go.Figure()
-        fig_yellow_hist.add_trace(go.Histogram(
-            x=df['std_CrdY'],
-            nbinsx=20,
-            name='Yellow Cards per Game',
-            marker_color='#F7DC6F',
-            opacity=0.7
-        ))
+            # Yellow cards distribution
+            fig_yellow_hist = go.Figure()
+            fig_yellow_hist.add_trace(histogram_trace(
+                'std_CrdY',
+                bins=20,
+                name='Yellow Cards per Game',
+                marker_color='#F7DC6F',
+                opacity=0.7
+            ))
         
-        fig_yellow_hist.update_layout(
-            title="Distribution of Yellow Cards per Game",
-            xaxis_title="Yellow Cards per Game",
-            yaxis_title="Number of Players",
-            template='plotly_dark',
-            height=400
-        )
+            fig_yellow_hist.update_layout(
+                title="Distribution of Yellow Cards per Game",
+                xaxis_title="Yellow Cards per Game",
+                yaxis_title="Number of Players",
+                template='plotly_dark',
+                height=400
+            )
         
-        st.plotly_chart(fig_yellow_hist, use_container_width=True, key="yellow_cards_histogram")
+            st.plotly_chart(fig_yellow_hist, use_container_width=True, key="yellow_cards_histogram")
         
-        # Fouls distribution
-        fig_fouls_hist = go.Figure()
-        fig_fouls_hist.add_trace(go.Histogram(
-            x=df['misc_Fls'],
-            nbinsx=20,
-            name='Fouls per Game',
-            marker_color='#D7BDE2',
-            opacity=0.7
-        ))
+            # Fouls distribution
+            fig_fouls_hist = go.Figure()
+            fig_fouls_hist.add_trace(histogram_trace(
+                'misc_Fls',
+                bins=20,
+                name='Fouls per Game',
+                marker_color='#D7BDE2',
+                opacity=0.7
+            ))
         
-        fig_fouls_hist.update_layout(
-            title="Distribution of Fouls per Game",
-            xaxis_title="Fouls per Game",
-            yaxis_title="Number of Players",
-            template='plotly_dark',
-            height=400
-        )
+            fig_fouls_hist.update_layout(
+                title="Distribution of Fouls per Game",
+                xaxis_title="Fouls per Game",
+                yaxis_title="Number of Players",
+                template='plotly_dark',
+                height=400
+            )
         
-        st.plotly_chart(fig_fouls_hist, use_container_width=True, key="fouls_histogram")
+            st.plotly_chart(fig_fouls_hist, use_container_width=True, key="fouls_histogram")
 
-    st.divider()
+        st.divider()
 
-    # Summary insights
-    st.markdown("""
+        # Summary insights
+        st.markdown("""
         <div style='margin: 2rem 0 1.5rem 0;'>
             <h2 style='font-size: 1.5rem; font-weight: 600; text-align: center; color: #2563eb;'>
                 💡 Key Insights from Distribution Analysis
@@ -4695,53 +5096,53 @@ with tab7:
         </div>
     """, unsafe_allow_html=True)
 
-    insights_col1, insights_col2 = st.columns(2)
+        insights_col1, insights_col2 = st.columns(2)
 
-    with insights_col1:
-        st.markdown("### Performance Distribution Patterns")
+        with insights_col1:
+            st.markdown("### Performance Distribution Patterns")
         
-        # Goals distribution insights
-        goals_mean = df['std_Gls'].mean()
-        goals_std = df['std_Gls'].std()
-        st.write(f"• **Goals per Game**: Mean = {goals_mean:.2f}, Std = {goals_std:.2f}")
+            # Goals distribution insights
+            goals_stats = histograms.get('std_Gls')
+            goals_mean, goals_std = goals_stats['mean'], goals_stats['std']
+            st.write(f"• **Goals per Game**: Mean = {goals_mean:.2f}, Std = {goals_std:.2f}")
         
-        if goals_std > goals_mean:
-            st.info("High variability in goal scoring")
-        else:
-            st.success("Consistent goal scoring patterns")
+            if goals_std > goals_mean:
+                st.info("High variability in goal scoring")
+            else:
+                st.success("Consistent goal scoring patterns")
         
-        # Assists distribution insights
-        assists_mean = df['std_Ast'].mean()
-        assists_std = df['std_Ast'].std()
-        st.write(f"• **Assists per Game**: Mean = {assists_mean:.2f}, Std = {assists_std:.2f}")
+            # Assists distribution insights
+            assists_stats = histograms.get('std_Ast')
+            assists_mean, assists_std = assists_stats['mean'], assists_stats['std']
+            st.write(f"• **Assists per Game**: Mean = {assists_mean:.2f}, Std = {assists_std:.2f}")
         
-        if assists_std > assists_mean:
-            st.info("High variability in assist creation")
-        else:
-            st.success("Consistent assist patterns")
+            if assists_std > assists_mean:
+                st.info("High variability in assist creation")
+            else:
+                st.success("Consistent assist patterns")
 
-    with insights_col2:
-        st.markdown("### Playing Time Distribution")
+        with insights_col2:
+            st.markdown("### Playing Time Distribution")
         
-        # Minutes distribution insights
-        minutes_mean = df['std_Min'].mean()
-        minutes_std = df['std_Min'].std()
-        st.write(f"• **Minutes Played**: Mean = {minutes_mean:.0f}, Std = {minutes_std:.0f}")
+            # Minutes distribution insights
+            minutes_stats = histograms.get('std_Min')
+            minutes_mean, minutes_std = minutes_stats['mean'], minutes_stats['std']
+            st.write(f"• **Minutes Played**: Mean = {minutes_mean:.0f}, Std = {minutes_std:.0f}")
         
-        if minutes_std > minutes_mean * 0.5:
-            st.info("High variability in playing time")
-        else:
-            st.success("Consistent playing time allocation")
+            if minutes_std > minutes_mean * 0.5:
+                st.info("High variability in playing time")
+            else:
+                st.success("Consistent playing time allocation")
         
-        # Age distribution insights
-        age_mean = df['Age'].mean()
-        age_std = df['Age'].std()
-        st.write(f"• **Player Age**: Mean = {age_mean:.1f}, Std = {age_std:.1f}")
+            # Age distribution insights
+            age_stats = histograms.get('Age', 10)
+            age_mean, age_std = age_stats['mean'], age_stats['std']
+            st.write(f"• **Player Age**: Mean = {age_mean:.1f}, Std = {age_std:.1f}")
         
-        if age_std > 2:
-            st.info("Wide age range in the dataset")
-        else:
-            st.success("Focused age group")
+            if age_std > 2:
+                st.info("Wide age range in the dataset")
+            else:
+                st.success("Focused age group")
 
 # ---------------------------
 # COMMON FOOTER FOR ALL TABS
@@ -0,0 +1,290 @@
+"""Tests for pipeline.py against the tables shipped in data/.
+
+Run with: python -m pytest -q
+"""
+import itertools
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+import pipeline
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+CLUSTERED_CSV = os.path.join(DATA_DIR, 'eredivisie_midfielders_clustered.csv')
+SCORED_CSV = os.path.join(DATA_DIR, 'eredivisie_midfielders_scored.csv')
+ARCHETYPES_CSV = os.path.join(DATA_DIR, 'eredivisie_midfielders_archetypes.csv')
+METHODOLOGY_TXT = os.path.join(DATA_DIR, 'archetype_methodology.txt')
+
+# Section number of each app archetype in data/archetype_methodology.txt
+# (Mezzala is the CAM formula, ShadowStriker the Box Crasher one)
+METHODOLOGY_SECTIONS = {
+    'Anchor': 1, 'DLP': 2, 'BallWinner': 3, 'BoxToBox': 4,
+    'APM': 6, 'Mezzala': 7, 'ShadowStriker': 8,
+}
+# Column prefix of each archetype in the shipped archetypes table
+SHIPPED_ARCHETYPE_NAMES = {'Mezzala': 'CAM', 'ShadowStriker': 'BoxCrasher'}
+
+
+@pytest.fixture(scope='module')
+def raw():
+    return pd.read_csv(CLUSTERED_CSV)
+
+
+@pytest.fixture(scope='module')
+def scored():
+    return pd.read_csv(SCORED_CSV)
+
+
+@pytest.fixture(scope='module')
+def shipped_archetypes():
+    return pd.read_csv(ARCHETYPES_CSV)
+
+
+def _as_int64(frame: pd.DataFrame) -> pd.DataFrame:
+    """Int64 metric columns -> int64, the dtype read_csv gives the shipped table."""
+    return frame.astype({c: 'int64' for c in frame.columns if frame[c].dtype == 'Int64'})
+
+
+def parse_methodology_weights(path: str = METHODOLOGY_TXT) -> dict:
+    """{section number: {metric: weight}} from the HESAPLAMA FORMÜLÜ blocks.
+
+    "(100 - m) × w" becomes a negative weight and "(a + b + c)/3 × w" splits
+    w evenly, matching how ARCHETYPE_WEIGHTS encodes them.
+    """
+    weights, section, in_formula = {}, None, False
+    with open(path, encoding='utf-8') as fh:
+        for line in fh:
+            header = re.match(r'ARCHETYPE (\d+):', line)
+            if header:
+                section, in_formula = int(header.group(1)), False
+                continue
+            if line.startswith('HESAPLAMA FORMÜLÜ:'):
+                in_formula = True
+                weights[section] = {}
+                continue
+            if not in_formula:
+                continue
+            term = re.match(r'\s*(?:Score =|\+)\s*(.+?)\s*×\s*([\d.]+)', line)
+            if term is None:
+                in_formula = False
+                continue
+            expr, weight = term.group(1), float(term.group(2))
+            inverted = re.fullmatch(r'\(100 - (.+)\)', expr)
+            averaged = re.fullmatch(r'\((.+)\)/(\d+)', expr)
+            if inverted:
+                weights[section][inverted.group(1)] = -weight
+            elif averaged:
+                parts = [p.strip() for p in averaged.group(1).split('+')]
+                for part in parts:
+                    weights[section][part] = weight / int(averaged.group(2))
+            else:
+                weights[section][expr] = weight
+    return weights
+
+
+# ---------------------------
+# TRANSFORM
+# ---------------------------
+@pytest.mark.parametrize('chunksize', [7, 49, pipeline.TRANSFORM_CHUNK_ROWS])
+def test_run_transform_reproduces_scored_table(tmp_path, scored, chunksize):
+    out_path = tmp_path / 'scored.csv'
+    pipeline.run_transform(CLUSTERED_CSV, str(out_path), chunksize=chunksize)
+    result = pd.read_csv(out_path)
+    pd.testing.assert_frame_equal(result, scored[result.columns])
+
+
+def test_column_stats_match_single_pass(raw):
+    stats = pipeline.collect_column_stats([CLUSTERED_CSV], chunksize=5)
+    values = raw[stats.columns]
+    np.testing.assert_allclose(stats.mean, values.mean().to_numpy(), atol=1e-12)
+    np.testing.assert_allclose(stats.std, values.std().to_numpy(), atol=1e-12)
+    np.testing.assert_array_equal(stats.min, values.min().to_numpy())
+    np.testing.assert_array_equal(stats.max, values.max().to_numpy())
+
+
+# ---------------------------
+# INCREMENTAL
+# ---------------------------
+@pytest.mark.parametrize('batches', [[30], [10, 25, 40]])
+def test_incremental_scorer_reproduces_scored_table(raw, scored, batches):
+    bounds = [0] + batches + [len(raw)]
+    scorer = pipeline.IncrementalScorer(raw.iloc[:bounds[1]])
+    for start, stop in zip(bounds[1:], bounds[2:]):
+        scorer.add_rows(raw.iloc[start:stop])
+    result = _as_int64(scorer.scored_frame())
+    pd.testing.assert_frame_equal(result, scored[result.columns])
+
+
+def test_incremental_scorer_only_rescores_moved_columns(raw):
+    scorer = pipeline.IncrementalScorer(raw)
+    before = scorer.scored_frame()
+    # A copy of an existing player stays inside every column's range
+    assert scorer.add_rows(raw.iloc[[0]]) == []
+    pd.testing.assert_frame_equal(scorer.scored_frame().iloc[:len(raw)], before)
+
+    new_row = raw.iloc[[0]].copy()
+    new_row['pass_KP'] = raw['pass_KP'].max() + 1
+    assert scorer.add_rows(new_row) == ['pass_KP']
+    assert scorer.scored_frame()['pass_KP'].iloc[-1] == 100
+
+
+# ---------------------------
+# ARCHETYPE SCORING
+# ---------------------------
+def test_archetype_weights_match_methodology():
+    documented = parse_methodology_weights()
+    for archetype, section in METHODOLOGY_SECTIONS.items():
+        expected = documented[section]
+        actual = pipeline.ARCHETYPE_WEIGHTS[archetype]
+        assert actual.keys() == expected.keys(), archetype
+        for metric, weight in expected.items():
+            assert actual[metric] == pytest.approx(weight), (archetype, metric)
+
+
+@pytest.mark.parametrize('archetype', pipeline.ARCHETYPES)
+def test_archetype_weights_total_one(archetype):
+    weights = pipeline.ARCHETYPE_WEIGHTS[archetype].values()
+    assert sum(abs(w) for w in weights) == pytest.approx(1.0)
+
+
+def test_archetype_formulas_are_distinct():
+    _, coef, intercept = pipeline.build_archetype_coefficients()
+    for i, j in itertools.combinations(range(len(pipeline.ARCHETYPES)), 2):
+        same = np.allclose(coef[:, i], coef[:, j]) and intercept[i] == intercept[j]
+        assert not same, (pipeline.ARCHETYPES[i], pipeline.ARCHETYPES[j])
+
+
+def test_archetype_scores_are_distinct(scored):
+    result = pipeline.score_archetypes(scored)
+    score_cols = [f"{a}_Score" for a in pipeline.ARCHETYPES]
+    assert result[score_cols].min().min() >= 0
+    assert result[score_cols].max().max() <= 100
+    for a, b in itertools.combinations(score_cols, 2):
+        assert not result[a].equals(result[b]), (a, b)
+
+
+@pytest.mark.parametrize('source', [CLUSTERED_CSV, SCORED_CSV])
+def test_archetype_engine_reproduces_shipped_table(shipped_archetypes, source):
+    result = pipeline.score_archetypes(pd.read_csv(source))
+    shipped_primary = shipped_archetypes['Primary_Archetype'].replace(
+        {v: k for k, v in SHIPPED_ARCHETYPE_NAMES.items()})
+    # One borderline player (Mezzala 55 vs APM 54) flips on rounding
+    assert (result['Primary_Archetype'] != shipped_primary).sum() <= 1
+    for archetype in pipeline.ARCHETYPES:
+        shipped = shipped_archetypes[f"{SHIPPED_ARCHETYPE_NAMES.get(archetype, archetype)}_Score"]
+        error = (result[f"{archetype}_Score"] - shipped).abs()
+        assert error.mean() < 1.5, archetype
+
+
+def test_secondary_archetype_within_gap():
+    scores = np.array([[80, 77, 10, 10, 10, 10, 10],
+                       [80, 70, 10, 10, 10, 10, 10]], dtype=np.float64)
+    result = pipeline.assign_archetypes(scores)
+    assert result['Archetype'].tolist() == ['Anchor/DLP', 'Anchor']
+    assert result['Secondary_Archetype'].iloc[0] == 'DLP'
+    assert pd.isna(result['Secondary_Archetype'].iloc[1])
+    assert result['Secondary_Archetype_Score'].tolist() == [77, 0]
+
+
+# ---------------------------
+# CLUSTERING
+# ---------------------------
+@pytest.fixture(scope='module')
+def cluster_features(scored):
+    columns = pipeline.cluster_feature_columns(scored)
+    return pipeline._feature_block(scored, columns), scored['Cluster'].to_numpy()
+
+
+def test_from_labels_uses_cluster_means(cluster_features):
+    X, labels = cluster_features
+    engine = pipeline.ClusteringEngine.from_labels(X, labels)
+    assert engine.labels == [0, 1, 2]
+    assert engine.counts.tolist() == [(labels == c).sum() for c in (0, 1, 2)]
+    for row, cid in enumerate(engine.labels):
+        np.testing.assert_allclose(engine.centroids[row], X[labels == cid].mean(axis=0))
+    assert engine.baseline == pytest.approx(engine.assign(X)[1].mean())
+    assert engine.drift(X) == pytest.approx(0.0)
+
+
+def test_unlabelled_players_join_nearest_centroid(scored, cluster_features):
+    X, labels = cluster_features
+    partial = scored.copy()
+    missing = [3, 17, 30]
+    partial.loc[missing, 'Cluster'] = np.nan
+    result = pipeline.ensure_cluster_column(partial)
+    kept = ~partial.index.isin(missing)
+    assert result['Cluster'].dtype == np.int64
+    np.testing.assert_array_equal(result['Cluster'].to_numpy()[kept], labels[kept])
+    expected = pipeline.ClusteringEngine.from_labels(X[kept], labels[kept]).assign(X[missing])[0]
+    np.testing.assert_array_equal(result.loc[missing, 'Cluster'].to_numpy(), expected)
+
+
+def test_observe_refits_only_on_drift(cluster_features):
+    X, labels = cluster_features
+    engine = pipeline.ClusteringEngine.from_labels(X, labels)
+    assigned, refit = engine.observe(X[:10])
+    assert not refit and engine.refits == 0
+    np.testing.assert_array_equal(assigned, engine.assign(X[:10])[0])
+
+    shifted = np.clip(X[:10] + 40.0, 0.0, 140.0)
+    assert engine.drift(shifted) > pipeline.CLUSTER_DRIFT_THRESHOLD
+    before = engine.centroids.copy()
+    _, refit = engine.observe(shifted)
+    assert refit and engine.refits == 1
+    assert engine.counts.sum() == len(X) + len(shifted)
+    assert not np.allclose(engine.centroids, before)
+
+
+def test_partial_fit_keeps_running_mean(cluster_features):
+    X, _ = cluster_features
+    engine = pipeline.ClusteringEngine.from_labels(X[:20], np.zeros(20, dtype=int))
+    engine.partial_fit(X[20:], batch_size=8)
+    np.testing.assert_allclose(engine.centroids[0], X.mean(axis=0))
+    assert engine.counts[0] == len(X)
+
+
+def test_fresh_clusters_take_reference_ids(scored):
+    unlabelled = scored.drop(columns='Cluster')
+    result = pipeline.ensure_cluster_column(unlabelled, reference=pipeline.CLUSTER_REFERENCE_PATH)
+    np.testing.assert_array_equal(result['Cluster'].to_numpy(), scored['Cluster'].to_numpy())
+
+
+def test_match_labels_undoes_permutation(cluster_features):
+    X, labels = cluster_features
+    reference = pipeline.ClusteringEngine.from_labels(X, labels)
+    shuffled = pipeline.ClusteringEngine(reference.centroids[[2, 0, 1]], [0, 1, 2], reference.counts, 1.0)
+    shuffled.match_labels(reference)
+    assert shuffled.labels == [2, 0, 1]
+
+
+def test_unlabelled_table_without_reference_is_rejected(scored):
+    with pytest.raises(ValueError):
+        pipeline.ensure_cluster_column(scored.drop(columns='Cluster'))
+
+
+# ---------------------------
+# COLUMNAR COPIES
+# ---------------------------
+PROFILES_CSV = os.path.join(DATA_DIR, 'eredivisie_midfielders_final_profiles.csv')
+
+
+def test_columnar_copy_matches_csv_load(tmp_path):
+    frame = pd.read_csv(PROFILES_CSV).dropna(how='all').reset_index(drop=True)
+    path = str(tmp_path / 'profiles.parquet')
+    pipeline.write_columnar(frame, path, 'v1')
+    stored = pq.read_table(path).schema
+    assert str(stored.field('Squad').type).startswith('dictionary')
+    assert stored.field('pass_KP').type == 'int16'
+
+    result = pipeline.read_columnar(path, 'v1')
+    pd.testing.assert_frame_equal(result, frame)
+    # What the app does with them: filtered groupbys and score arithmetic
+    subset = lambda f: f[f['Squad'] != f['Squad'].iloc[0]]
+    pd.testing.assert_series_equal(subset(result).groupby('Squad').size(), subset(frame).groupby('Squad').size())
+    pd.testing.assert_series_equal(result['Pos'].value_counts(), frame['Pos'].value_counts())
+    pd.testing.assert_series_equal(result['pass_KP'] * 1000, frame['pass_KP'] * 1000)
+    assert pipeline.read_columnar(path, 'v2') is None